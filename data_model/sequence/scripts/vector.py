@@ -1,27 +1,307 @@
+import os
+import struct
+import sys
 from array import array
 from collections.abc import Generator, Iterable, Iterator, Sequence, Sized
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from fractions import Fraction
 from functools import reduce
-from itertools import zip_longest
-from math import hypot
-from operator import floordiv, ge, gt, index, le, lt, truediv, xor
+from itertools import cycle, repeat, zip_longest
+from math import fsum, hypot, inf
+from mmap import ACCESS_READ, mmap
+from multiprocessing.shared_memory import SharedMemory
+from operator import (
+    add,
+    floordiv,
+    ge,
+    gt,
+    iadd,
+    ifloordiv,
+    imul,
+    index,
+    isub,
+    itruediv,
+    le,
+    lt,
+    mul,
+    neg,
+    pos,
+    sub,
+    truediv,
+    xor,
+)
+from pathlib import Path
 from reprlib import repr
-from typing import Any, Self, Union
+from tempfile import TemporaryDirectory
+from typing import Any, Callable, List, Optional, Self, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional, every operator falls back to the pure-Python path without it
+    np = None  # type: ignore[assignment]
+
+
+# Supported typecodes: 4-byte and 8-byte floats, 4-byte and 8-byte signed integers
+TYPECODES = ("f", "d", "i", "q")
+_FLOAT_TYPECODES = ("f", "d")
+
+# Number of components passed to a single `hypot` call when streaming the norm
+_NORM_CHUNK_SIZE = 4096
+# Number of components evaluated at once by a lazy expression graph, small enough for the
+# intermediate chunks to stay in cache
+_LAZY_CHUNK_SIZE = 65536
+# Number of components in each slice of a chunked reduction, the boundaries do not depend on
+# the number of workers so that the partial results, and hence the result, are always the same
+_REDUCTION_CHUNK_SIZE = 1 << 20
+
+
+def promote_typecodes(*typecodes: str) -> str:
+    """
+    Compute the typecode of the result of an operation between vectors with the given typecodes.
+
+    1. Operands of the same kind promote to the widest typecode, i.e. `f` and `d` give `d`, `i` and `q` give `q`
+    2. Mixing integers and floats gives `d`, since a 4-byte float cannot represent every 4-byte integer exactly
+
+    Parameters
+    ----------
+    *typecodes : str
+        The typecodes of the operands, each one of `TYPECODES`
+
+    Returns
+    -------
+    str
+        The typecode of the result
+
+    Raises
+    ------
+    ValueError
+        If any typecode is not supported
+
+    Example
+    -------
+    >>> promote_typecodes("f", "f")
+    'f'
+    >>> promote_typecodes("i", "q")
+    'q'
+    >>> promote_typecodes("q", "f")
+    'd'
+    """
+    for typecode in typecodes:
+        if typecode not in TYPECODES:
+            raise ValueError(f"typecode must be one of {TYPECODES}, got {typecode!r}")
+    floats = [typecode for typecode in typecodes if typecode in _FLOAT_TYPECODES]
+    if len(floats) == len(typecodes):
+        return "d" if "d" in floats else "f"
+    if not floats:
+        return "q" if "q" in typecodes else "i"
+    return "d"
+
+
+def _scalar_typecode(typecode: str, scalar: Any) -> str:
+    """
+    Compute the typecode of the result of an operation between a vector and a Python scalar.
+    Scalars do not widen the vector: an integer scalar keeps the typecode of the vector, while
+    any other scalar (float, Fraction) keeps float vectors as they are and turns integer vectors
+    into `d`.
+
+    Parameters
+    ----------
+    typecode : str
+        The typecode of the vector
+    scalar : Any
+        The scalar operand
+
+    Returns
+    -------
+    str
+        The typecode of the result
+    """
+    if isinstance(scalar, int):
+        return typecode
+    return promote_typecodes(typecode, "f")
+
+
+def _scalar_value(scalar: Any) -> Union[int, float]:
+    """
+    Convert a scalar operand to a Python number, keeping integers (and bools) exact so that
+    integer vectors stay integer.
+
+    Raises
+    ------
+    TypeError
+        If `scalar` is not an integer and cannot be converted to float
+    """
+    if isinstance(scalar, int):
+        return scalar
+    return float(scalar)
+
+
+def _pad(values: Any, size: int, fillvalue: int) -> Any:
+    """
+    Pad a one-dimensional NumPy array on the right with `fillvalue` up to `size` elements,
+    which mirrors the `fillvalue` semantics of `itertools.zip_longest`.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The array to pad
+    size : int
+        The target length
+    fillvalue : int
+        The value used for the padded positions
+
+    Returns
+    -------
+    np.ndarray
+        The original array if it is already `size` long, otherwise a padded copy with the same dtype
+    """
+    if len(values) == size:
+        return values
+    padding = np.full(size - len(values), fillvalue, dtype=values.dtype)
+    return np.concatenate((values, padding))
+
+
+def _widen(values: Any) -> Any:
+    """
+    Cast a one-dimensional NumPy array of 4-byte floats to 8-byte floats. NumPy computes in
+    float32 when one operand is float32, even if the other is a Python float (NEP 50), while the
+    pure-Python path computes in doubles and only rounds the result to the typecode, so `f`
+    components are widened before any operation to round the same way.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The operand
+
+    Returns
+    -------
+    np.ndarray
+        A float64 copy of `values` if its dtype is float32, otherwise `values` itself
+    """
+    if values.dtype == np.float32:
+        return values.astype(np.float64)
+    return values
+
+
+def _map_chunks(
+    function: Callable[[int, int], Any], length: int, workers: int
+) -> List[Any]:
+    """
+    Apply `function(start, stop)` to consecutive `_REDUCTION_CHUNK_SIZE` slices of `range(length)`
+    on a pool of threads, which only pays off when `function` releases the GIL (e.g., NumPy
+    kernels). The partial results are returned in slice order, so that combining them gives the
+    same result whatever the number of workers.
+
+    Parameters
+    ----------
+    function : Callable[[int, int], Any]
+        The reduction applied to the slice `[start, stop)`
+    length : int
+        The number of components to reduce
+    workers : int
+        The number of threads, the slices are reduced in the calling thread when it is 1
+
+    Returns
+    -------
+    List[Any]
+        The partial result of every slice, in order
+    """
+    bounds = [
+        (start, min(start + _REDUCTION_CHUNK_SIZE, length))
+        for start in range(0, length, _REDUCTION_CHUNK_SIZE)
+    ]
+    if workers <= 1 or len(bounds) <= 1:
+        return [function(start, stop) for start, stop in bounds]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, *zip(*bounds)))
+
+
+def _chunk_norm(values: Any) -> float:
+    """
+    Compute the euclidean norm of a one-dimensional NumPy array, scaling by the largest magnitude
+    (as `hypot` does) so that the squares neither overflow nor underflow.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The components to reduce
+
+    Returns
+    -------
+    float
+        The euclidean norm, `inf` if any component is infinite and `nan` if any is `nan` otherwise
+    """
+    magnitudes = np.abs(values, dtype=np.float64)
+    scale = float(magnitudes.max(initial=0.0))
+    if scale == 0.0 or scale == inf:
+        return scale
+    if scale != scale:
+        # `hypot` returns inf over nan, whichever comes first
+        return inf if np.isinf(magnitudes).any() else scale
+    magnitudes /= scale
+    # `einsum` sums in a fixed order, unlike a BLAS `dot` whose blocking may vary between builds
+    return scale * float(np.sqrt(np.einsum("i,i->", magnitudes, magnitudes)))
+
+
+def _hash_chunk(name: str, typecode: str, start: int, stop: int) -> int:
+    """
+    Reduce the hash values of the slice `[start, stop)` of the components held in the shared
+    memory block `name`. This runs in a worker process, since hashing each element holds the GIL.
+
+    Parameters
+    ----------
+    name : str
+        The name of the `SharedMemory` block
+    typecode : str
+        The typecode of the components
+    start : int
+        The index of the first component of the slice
+    stop : int
+        The index one past the last component of the slice
+
+    Returns
+    -------
+    int
+        The xor of the hash values of the slice
+    """
+    shared = SharedMemory(name=name)
+    # Typed as optional because `close` resets it to None
+    shared_buffer: Any = shared.buf
+    try:
+        with shared_buffer.cast(typecode) as components:
+            with components[start:stop] as values:
+                return reduce(xor, map(hash, values), 0)
+    finally:
+        shared.close()
 
 
 class Vector(object):
     """
     An n-dimensional vector class.
+
+    The components are stored in an `array` with one of the `TYPECODES`. Operators between
+    vectors with different typecodes follow `promote_typecodes`. Integer overflow raises an
+    `OverflowError` on the pure-Python path, but wraps around on the NumPy path, as in NumPy.
     """
 
-    # Default each element is an 8-byte double precision float
+    # By default each element is an 8-byte double precision float, instances can override it
     typecode = "d"
+    # Run the operators as vectorized NumPy kernels when NumPy is installed
+    use_numpy = np is not None
+    # Vectors with at least this many components are reduced (`@`, `abs`, `==`, `hash`) in
+    # `_REDUCTION_CHUNK_SIZE` slices spread over `workers` threads or processes. The float
+    # results of `@` and `abs` are summed in a different order than on the serial path, so
+    # they may differ from it in the last places, but they never depend on `workers`
+    parallel_threshold = 1 << 22
+    workers = os.cpu_count() or 1
 
     def __init__(
         self,
         components: Union[
             Sequence[Union[int, float]], Generator[Union[int, float], None, None]
         ],
+        typecode: Optional[str] = None,
     ):
         """
         Initialize an instance of the Vector class.
@@ -30,24 +310,89 @@ class Vector(object):
         ----------
         components : Union[Sequence[Union[int, float]], Generator[Union[int, float], None, None]]
             A collection of integers or floats, either as a sequence or a generator
+        typecode : Optional[str], optional
+            One of `TYPECODES`, i.e. `f` (4-byte float), `d` (8-byte float), `i` (4-byte signed
+            integer) or `q` (8-byte signed integer), by default the class-level `typecode`
+
+        Raises
+        ------
+        ValueError
+            If `typecode` is not supported
         """
+        if typecode is not None:
+            if typecode not in TYPECODES:
+                raise ValueError(
+                    f"typecode must be one of {TYPECODES}, got {typecode!r}"
+                )
+            self.typecode = typecode
         self._components = array(self.typecode, components)
 
+    def freeze(self) -> "FrozenVector":
+        """
+        Return an immutable copy of the instance that caches its hash and norm.
+
+        Returns
+        -------
+        FrozenVector
+            A frozen copy of the vector
+        """
+        return FrozenVector(self._components, self.typecode)
+
+    def lazy(self) -> "LazyVector":
+        """
+        Start a lazy expression graph from the instance, see `LazyVector`.
+
+        Returns
+        -------
+        LazyVector
+            A lazy vector wrapping the instance
+        """
+        return LazyVector(self)
+
+    @classmethod
+    def _view(cls, buffer: memoryview) -> Self:
+        """
+        Create a new instance that wraps `buffer` without copying. Reads and in-place updates go
+        straight to the underlying memory, but the view cannot be resized.
+
+        Parameters
+        ----------
+        buffer : memoryview
+            A one-dimensional memoryview whose format is one of `TYPECODES`
+
+        Returns
+        -------
+        Self
+            A new instance of the class backed by `buffer`
+        """
+        vector = cls.__new__(cls)
+        vector.typecode = buffer.format
+        vector._components = buffer  # type: ignore[assignment]
+        return vector
+
     @classmethod
-    def frombytes(cls, octets: bytes) -> Self:
+    def frombytes(
+        cls, octets: Union[bytes, bytearray, memoryview, mmap], copy: bool = True
+    ) -> Self:
         """
         Create a new instance of the class from a sequence of bytes.
 
         1. Extract the first byte from the `octets` byte sequence, which represent the type code that specifies the data type of the vector elements
         2. Convert this byte to a character, which is expected to correspond to a valid type code understood by `array`, e.g., 'd' for double precision float
-        3. Create a memory view from the rest of the bytes (`octets[1:]`), which are the actual data representing the vector components
-        4. Create a new instance of the class with the memory view as the `components` argument in the constructor
+        3. Create a memory view over the rest of the bytes, which are the actual data representing the vector components. Slicing the memory view
+           (rather than `octets[1:]`) does not copy the payload
+        4. Either copy the payload into a new `array` in a single `frombytes` call, or, with `copy=False`, wrap the memory view directly.
+           The new instance keeps the typecode from the first byte if it is one of `TYPECODES`, other typecodes are converted to `cls.typecode`
 
         Parameters
         ----------
-        octets : bytes
+        octets : Union[bytes, bytearray, memoryview, mmap]
             A byte sequence where the first byte is the type code and the
             subsequent bytes are the data to be converted based on that type code
+        copy : bool, optional
+            Whether to copy the payload, by default True. With `copy=False`, the vector is a view
+            that shares memory with `octets` (e.g., a region of a memory-mapped file), so it
+            cannot be resized and is read-only if `octets` is
 
         Returns
         -------
@@ -64,9 +409,17 @@ class Vector(object):
         Vector([1.0, 2.0, 3.0])
         """
         typecode = chr(octets[0])
-        memv = memoryview(octets[1:]).cast(typecode)  # type: ignore[call-overload]
-        # Passed to __init__ as components
-        return cls(memv)
+        memv = memoryview(octets)[1:]
+        if typecode not in TYPECODES:
+            # Passed to __init__ as components, converting each element to `cls.typecode`
+            return cls(memv.cast(typecode))  # type: ignore[call-overload]
+        if not copy:
+            return cls._view(memv.cast(typecode))  # type: ignore[call-overload]
+        vector = cls.__new__(cls)
+        vector.typecode = typecode
+        vector._components = array(typecode)
+        vector._components.frombytes(memv)
+        return vector
 
     def __iter__(self) -> Iterator:
         """
@@ -92,7 +445,11 @@ class Vector(object):
             A limited-length representation of `self._components`
         """
         # By default, maxtuple = 6, maxlist = 6, maxset = 6, which means after 6 elements, the rest are replaced with '...'
-        components = repr(self._components)
+        buffer: Any = self._components
+        if not isinstance(buffer, array):
+            # A view over a memoryview, copy just enough elements for reprlib to truncate (maxarray = 5)
+            buffer = array(self.typecode, buffer[:6])
+        components = repr(buffer)
         components = components[components.find("[") : -1]
         return f"Vector({components})"
 
@@ -109,59 +466,259 @@ class Vector(object):
 
     def __bytes__(self) -> bytes:
         """
-        Convert `self.typecode` to `bytes` and concatenate it with another `bytes` object converted from
-        an `array`. A bytes object is an immutable sequence of single byte values. One byte can represent
-        a decimal number between 0 and 255.
+        Join `self.typecode` as a single byte with the raw buffer of the components. A bytes object is
+        an immutable sequence of single byte values. One byte can represent a decimal number between 0
+        and 255. `bytes.join` reads the components through the buffer protocol, so the payload is copied
+        exactly once into the result instead of being materialized and then concatenated.
 
         Returns
         -------
         bytes
             A bytes object.
         """
-        return bytes([ord(self.typecode)]) + bytes(self._components)
+        return b"".join((self.typecode.encode(), self._components))
 
     def __bool__(self) -> bool:
         """
-        The truth value of the instance, which delegates to the `__abs__` dunder method.
+        The truth value of the instance. The norm is non-zero exactly when any component is non-zero,
+        so `any` gives the same answer as `bool(abs(self))` and stops at the first non-zero component.
 
         Returns
         -------
         bool
-            _description_
+            True if any component is non-zero, False otherwise
         """
-        return bool(abs(self))
+        return any(self._components)
+
+    # ------------------------------- NumPy kernels ------------------------------ #
+
+    def _chunked(self, other: Optional["Vector"] = None) -> bool:
+        """
+        Whether a reduction over this vector, and `other` if given, runs on the chunked NumPy
+        engine. Smaller vectors, or operands with different lengths, keep the serial path.
+
+        Parameters
+        ----------
+        other : Vector, optional
+            The other operand of a binary reduction
+
+        Returns
+        -------
+        bool
+            True if the reduction should be split into `_REDUCTION_CHUNK_SIZE` slices
+        """
+        return (
+            self.use_numpy
+            and len(self) >= self.parallel_threshold
+            and (other is None or len(other) == len(self))
+        )
+
+    def _as_ndarray(self) -> Any:
+        """
+        View `self._components` as a NumPy array through the buffer protocol. No data is
+        copied, so the view must not outlive any resizing of `self._components`.
+
+        Returns
+        -------
+        np.ndarray
+            A read-write view over the components
+        """
+        return np.frombuffer(self._components, dtype=self.typecode)
+
+    @classmethod
+    def _from_ndarray(cls, values: Any, typecode: Optional[str] = None) -> Self:
+        """
+        Create a new instance from a NumPy array with a single bulk copy, bypassing the
+        element-by-element construction in `__init__`.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            The result of a vectorized kernel
+        typecode : Optional[str], optional
+            The typecode of the new instance, by default `cls.typecode`
+
+        Returns
+        -------
+        Self
+            A new instance of the class
+        """
+        typecode = typecode or cls.typecode
+        vector = cls.__new__(cls)
+        vector.typecode = typecode
+        vector._components = array(typecode)
+        values = np.ascontiguousarray(values, dtype=typecode)
+        # `array.frombytes` only accepts unsigned byte buffers
+        vector._components.frombytes(values.view(np.uint8))
+        return vector
+
+    def _operand(self, other: Any) -> Tuple[Any, str]:
+        """
+        Get the buffer and typecode of the other operand of an element-wise operator. Vectors
+        are used as they are, while other iterables are converted to an `array` with the
+        typecode of `self`, or to `d` if they contain floats and `self` holds integers. Invalid
+        elements raise the same `TypeError` as the pure-Python path.
+
+        Parameters
+        ----------
+        other : Any
+            The other vector or iterable
+
+        Returns
+        -------
+        Tuple[Any, str]
+            The components of the operand and their typecode
+
+        Raises
+        ------
+        TypeError
+            If `other` is not an iterable of numbers
+        """
+        if isinstance(other, Vector):
+            return other._components, other.typecode
+        if isinstance(other, LazyVector):
+            # Let the reflected operator of the lazy vector extend its graph instead
+            raise TypeError("lazy vectors are combined by their reflected operators")
+        try:
+            return array(self.typecode, other), self.typecode
+        except TypeError:
+            if self.typecode in _FLOAT_TYPECODES:
+                raise
+            # Floats cannot be stored in an integer array, `other` may be a one-shot iterator
+            # so only retry sequences
+            if not isinstance(other, Sequence):
+                raise
+            return array("d", other), "d"
+
+    def _numpy_elementwise(
+        self, other: Any, operator_func: Callable, fillvalue: int
+    ) -> Self:
+        """
+        Apply a binary operator to two vectors in a single vectorized kernel, padding the
+        shorter operand with `fillvalue` like `zip_longest` does in the pure-Python path.
+
+        Parameters
+        ----------
+        other : Any
+            The other vector or iterable
+        operator_func : Callable
+            A function from the `operator` module, e.g. `operator.add`
+        fillvalue : int
+            The value used to pad the shorter operand
+
+        Returns
+        -------
+        Self
+            A new instance of the class, or `NotImplemented` if `other` is not supported
+        """
+        try:
+            buffer, typecode = self._operand(other)
+        except TypeError:
+            return NotImplemented
+        lhs = self._as_ndarray()
+        rhs = np.frombuffer(buffer, dtype=typecode)
+        size = max(len(lhs), len(rhs))
+        result = operator_func(_pad(lhs, size, fillvalue), _pad(rhs, size, fillvalue))
+        return self._from_ndarray(result, promote_typecodes(self.typecode, typecode))
+
+    def _numpy_division(self, other: Any, operator_func: Callable) -> Optional[Self]:
+        """
+        Vectorized true or floor division by a scalar or another vector (padded with ones).
+        NumPy silently returns `inf` for a zero divisor, so `None` is returned instead to let
+        the pure-Python path raise the usual `ZeroDivisionError`.
+
+        Parameters
+        ----------
+        other : Any
+            A scalar or another vector to divide by
+        operator_func : Callable
+            Either `operator.truediv` or `operator.floordiv`
+
+        Returns
+        -------
+        Optional[Self]
+            A new instance of the class, `NotImplemented` if `other` is not supported, or
+            `None` if any divisor is zero
+        """
+        lhs = self._as_ndarray()
+        if isinstance(other, Vector):
+            rhs = _widen(other._as_ndarray())
+            size = max(len(lhs), len(rhs))
+            lhs, rhs = _pad(lhs, size, 1), _pad(rhs, size, 1)
+            typecode = promote_typecodes(self.typecode, other.typecode)
+        else:
+            try:
+                rhs = _scalar_value(other)
+            except TypeError:
+                return NotImplemented
+            typecode = _scalar_typecode(self.typecode, other)
+        if len(lhs) and not np.all(rhs):
+            return None
+        if operator_func is truediv:
+            typecode = promote_typecodes(typecode, "f")
+        # `inf / inf` gives `nan` silently in Python, NumPy would also warn
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = operator_func(_widen(lhs), rhs)
+        return self._from_ndarray(result, typecode)
 
     # ------------------------------ Unary operators ----------------------------- #
 
     def __abs__(self) -> float:
         """
-        Compute the euclidean norm `sqrt(sum(x**2 for x in coordinates))`.
+        Compute the euclidean norm `sqrt(sum(x**2 for x in coordinates))`. Rather than unpacking every
+        component into the arguments of a single `hypot` call, the norm is streamed over fixed-size
+        chunks, folding each partial norm into the running one with `hypot(norm, chunk_norm)`. This
+        keeps the overflow-safe scaling of `hypot` and gives the same result for vectors that fit in
+        a single chunk.
+
+        Vectors with at least `parallel_threshold` components are reduced with NumPy instead, one
+        `_REDUCTION_CHUNK_SIZE` slice per task on `workers` threads, and the partial norms are
+        combined in slice order by a single `hypot` call. The result does not depend on `workers`,
+        but it may differ from the serial path in the last places (a relative difference of the
+        order of `1e-15`), since the squares are summed in a different order.
 
         Returns
         -------
         float
             The euclidean norm of the vector
         """
-        return hypot(*self)
+        if self._chunked():
+            values = self._as_ndarray()
+            partials = _map_chunks(
+                lambda start, stop: _chunk_norm(values[start:stop]),
+                len(values),
+                self.workers,
+            )
+            return hypot(*partials)
+        norm = 0.0
+        with memoryview(self._components) as buffer:
+            for start in range(0, len(buffer), _NORM_CHUNK_SIZE):
+                norm = hypot(norm, hypot(*buffer[start : start + _NORM_CHUNK_SIZE]))
+        return norm
 
     def __neg__(self):
         """
         Implement the unary negation operator `-`.
         """
-        return Vector(-vector_element for vector_element in self)
+        if self.use_numpy:
+            return Vector._from_ndarray(-self._as_ndarray(), self.typecode)
+        return Vector((-vector_element for vector_element in self), self.typecode)
 
     def __pos__(self):
         """
         Implement the unary positive operator `+`.
         """
-        return Vector(vector_element for vector_element in self)
+        if self.use_numpy:
+            return Vector._from_ndarray(self._as_ndarray(), self.typecode)
+        return Vector((vector_element for vector_element in self), self.typecode)
 
     # ------------------------------ Infix operators ----------------------------- #
 
     def __add__(self, other: Any) -> Self:
         """
         Add two vectors element-wise. If the two vectors have different lengths, the `zip_longest`
-        function will fill the shorter vector with 0.0 values to match the length of the longer vector.
+        function will fill the shorter vector with 0 values to match the length of the longer vector.
+        The typecode of the result follows `promote_typecodes`.
 
         Parameters
         ----------
@@ -173,17 +730,24 @@ class Vector(object):
         Vector
             A new instance of the class
         """
+        if self.use_numpy:
+            return self._numpy_elementwise(other, add, fillvalue=0)
         cls = self.__class__
         try:
-            pairs = zip_longest(self, other, fillvalue=0.0)
-            return cls(vec_el_a + vec_el_b for vec_el_a, vec_el_b in pairs)
+            buffer, typecode = self._operand(other)
+            pairs = zip_longest(self, buffer, fillvalue=0)
+            return cls(
+                (vec_el_a + vec_el_b for vec_el_a, vec_el_b in pairs),
+                promote_typecodes(self.typecode, typecode),
+            )
         except TypeError:
             return NotImplemented
 
     def __sub__(self, other: Any) -> Self:
         """
         Subtract two vectors element-wise. If the two vectors have different lengths, the `zip_longest`
-        function will fill the shorter vector with 0.0 values to match the length of the longer vector.
+        function will fill the shorter vector with 0 values to match the length of the longer vector.
+        The typecode of the result follows `promote_typecodes`.
 
         Parameters
         ----------
@@ -195,16 +759,24 @@ class Vector(object):
         Vector
             A new instance of the class
         """
+        if self.use_numpy:
+            return self._numpy_elementwise(other, sub, fillvalue=0)
         cls = self.__class__
         try:
-            pairs = zip_longest(self, other, fillvalue=0.0)
-            return cls(vec_el_a - vec_el_b for vec_el_a, vec_el_b in pairs)
+            buffer, typecode = self._operand(other)
+            pairs = zip_longest(self, buffer, fillvalue=0)
+            return cls(
+                (vec_el_a - vec_el_b for vec_el_a, vec_el_b in pairs),
+                promote_typecodes(self.typecode, typecode),
+            )
         except TypeError:
             return NotImplemented
 
     def __pow__(self, exponent: Union[int, float]) -> Self:
         """
-        Compute the power of a vector element-wise.
+        Compute the power of a vector element-wise. Integer vectors stay integer for non-negative
+        integer exponents, and become `d` otherwise. Powers always take the pure-Python path,
+        since `np.power` may differ from `pow` in the last place.
 
         Parameters
         ----------
@@ -218,12 +790,19 @@ class Vector(object):
         """
         cls = self.__class__
         if isinstance(exponent, (int, float)):
-            return cls(pow(vector_element, exponent) for vector_element in self)
+            typecode = _scalar_typecode(self.typecode, exponent)
+            if exponent < 0:
+                # Integers to negative powers are fractions
+                typecode = promote_typecodes(typecode, "f")
+            return cls(
+                (pow(vector_element, exponent) for vector_element in self), typecode
+            )
         return NotImplemented  # type: ignore[unreachable]
 
     def __mul__(self, scalar: Union[float, int, bool, Fraction]) -> Self:
         """
-        Element-wise multiplication of a vector by a scalar.
+        Element-wise multiplication of a vector by a scalar. An integer scalar keeps the typecode of
+        the vector, any other scalar turns integer vectors into `d`.
 
         Parameters
         ----------
@@ -238,11 +817,14 @@ class Vector(object):
         cls = self.__class__
         # If scalar cannot be converted to float, not implemented
         try:
-            factor = float(scalar)
+            factor = _scalar_value(scalar)
         except TypeError:
             # Python will try other.__mul__(Vector), which returns TypeError
             return NotImplemented
-        return cls(vector_element * factor for vector_element in self)
+        typecode = _scalar_typecode(self.typecode, scalar)
+        if self.use_numpy:
+            return self._from_ndarray(mul(_widen(self._as_ndarray()), factor), typecode)
+        return cls((vector_element * factor for vector_element in self), typecode)
 
     def __truediv__(
         self,
@@ -251,6 +833,7 @@ class Vector(object):
         """
         Element-wise division of a vector by a scalar or another vector.
         If `other` is a vector and vectors have different lengths, the shorter one is padded with ones.
+        The result of dividing integer vectors has typecode `d`.
 
         Parameters
         ----------
@@ -262,23 +845,34 @@ class Vector(object):
         Vector
             A new instance of the class with each element divided by the corresponding element of `other` or by `other` if it is a scalar
         """
+        if self.use_numpy:
+            result = self._numpy_division(other, truediv)
+            if result is not None:
+                return result
         cls = self.__class__
         if isinstance(other, Vector):
+            typecode = promote_typecodes(self.typecode, other.typecode, "f")
             pairs = zip_longest(
-                self, other, fillvalue=1.0
-            )  # Fill with 1.0 to avoid division by zero
-            return cls(truediv(vec_el_a, vec_el_b) for vec_el_a, vec_el_b in pairs)
+                self, other, fillvalue=1
+            )  # Fill with 1 to avoid division by zero
+            return cls(
+                (truediv(vec_el_a, vec_el_b) for vec_el_a, vec_el_b in pairs), typecode
+            )
         else:
             try:
-                factor = float(other)
+                factor = _scalar_value(other)
             except TypeError:
                 return NotImplemented
-            return cls(truediv(vector_element, factor) for vector_element in self)
+            typecode = promote_typecodes(_scalar_typecode(self.typecode, other), "f")
+            return cls(
+                (truediv(vector_element, factor) for vector_element in self), typecode
+            )
 
     def __floordiv__(self, other: Union[float, int, bool, Fraction, Self]) -> Self:
         """
         Element-wise floor division of a vector by a scalar or another vector.
         If `other` is a vector and vectors have different lengths, the shorter one is padded with ones.
+        The typecode of the result follows `promote_typecodes`.
 
         Parameters
         ----------
@@ -290,18 +884,28 @@ class Vector(object):
         Vector
             A new instance of the class with each element floor-divided by the corresponding element of `other` or by `other` if it is a scalar
         """
+        if self.use_numpy:
+            result = self._numpy_division(other, floordiv)
+            if result is not None:
+                return result
         cls = self.__class__
         if isinstance(other, Vector):
+            typecode = promote_typecodes(self.typecode, other.typecode)
             pairs = zip_longest(
-                self, other, fillvalue=1.0
-            )  # Fill with 1.0 to avoid division by zero
-            return cls(floordiv(vec_el_a, vec_el_b) for vec_el_a, vec_el_b in pairs)
+                self, other, fillvalue=1
+            )  # Fill with 1 to avoid division by zero
+            return cls(
+                (floordiv(vec_el_a, vec_el_b) for vec_el_a, vec_el_b in pairs), typecode
+            )
         else:
             try:
-                factor = float(other)
+                factor = _scalar_value(other)
             except TypeError:
                 return NotImplemented
-            return cls(floordiv(vector_element, factor) for vector_element in self)
+            typecode = _scalar_typecode(self.typecode, other)
+            return cls(
+                (floordiv(vector_element, factor) for vector_element in self), typecode
+            )
 
     def __matmul__(self, other: Any) -> float:
         """
@@ -309,6 +913,12 @@ class Vector(object):
         corresponding elements of the two sequences of numbers. This is a goose typing example,
         where we allow the `other` operand to be any object that implements the `__len__` and `__iter__`.
 
+        Float vectors with at least `parallel_threshold` components are reduced in slices, as in
+        `__abs__`. The result does not depend on `workers`, but it may differ from the serial path
+        in the last places: `sum` adds the products one at a time, so its rounding error grows
+        with the length, while the slices are summed by NumPy and their partial sums are added
+        exactly, which is usually closer to the exact dot product.
+
         Parameters
         ----------
         other : Any
@@ -324,6 +934,28 @@ class Vector(object):
         ValueError
             If the two vectors have different lengths
         """
+        # A batch is also sized and iterable, but its rows must be dotted with `self` one by
+        # one, so let Python call `VectorBatch.__rmatmul__`
+        if isinstance(other, VectorBatch):
+            return NotImplemented
+        # Large float vectors are reduced in slices, whose partial sums are added exactly with
+        # `fsum`; integer vectors keep the serial path, which cannot overflow
+        if (
+            isinstance(other, Vector)
+            and self._chunked(other)
+            and {self.typecode, other.typecode} <= set(_FLOAT_TYPECODES)
+        ):
+            lhs, rhs = self._as_ndarray(), other._as_ndarray()
+            partials = _map_chunks(
+                lambda start, stop: float(
+                    np.einsum(
+                        "i,i->", lhs[start:stop], rhs[start:stop], dtype=np.float64
+                    )
+                ),
+                len(lhs),
+                self.workers,
+            )
+            return fsum(partials)
         # Check that both operands implement __len__ and __iter__
         if isinstance(other, Sized) and isinstance(other, Iterable):
             try:
@@ -346,114 +978,365 @@ class Vector(object):
     __rfloordiv__ = __floordiv__
     __rmatmul__ = __matmul__
 
-    # --------------------------- Comparison operators --------------------------- #
+    # ----------------------------- In-place operators ---------------------------- #
 
-    def _cmp(
-        self,
-        other: Union[float, int, bool, Fraction, Self],
-        comparison_operator: str,
+    def _inplace_elementwise(
+        self, other: Any, operator_func: Callable, fillvalue: int
     ) -> Self:
         """
-        Element-wise comparison of a vector with a scalar or another vector. If the other operand is a vector
-        the two vectors must have the same length. If the other operand is a scalar, the comparison is done
-        element-wise. The supported comparison operators are: `gt`, `lt`, `ge`, and `le`.
+        Apply an in-place binary operator element-wise, mutating `self._components` directly.
+        The components are only resized when `other` is longer, in which case the new tail is
+        first filled with `fillvalue` (the same padding as the out-of-place operators). Positions
+        beyond the end of `other` are left untouched, since adding zero or dividing by one is a
+        no-op, except for floor division where `other` is padded instead.
+
+        Note that mutating a vector changes its hash, so vectors used as dictionary keys or set
+        members must not be updated in place.
 
         Parameters
         ----------
-        other : Union[float, int, bool, Fraction, Vector]
-            A scalar or another vector to compare with
-        comparison_operator : str
-            The comparison operator to use
+        other : Any
+            The other vector or iterable
+        operator_func : Callable
+            An in-place function from the `operator` module, e.g. `operator.iadd`, which mutates
+            NumPy views and falls back to the binary operator for Python floats
+        fillvalue : int
+            The value used to pad `self` when `other` is longer
 
         Returns
         -------
-        Vector
-            A new instance of the class with the result of the comparison, with values 1.0 for True and 0.0 for False
-        """
-        cls = self.__class__
-        match comparison_operator:
-            case "gt":
-                cmp = gt
-            case "lt":
-                cmp = lt
-            case "ge":
-                cmp = ge
-            case "le":
-                cmp = le
-            case _:
-                raise ValueError(
-                    f"Unsupported comparison operator: {comparison_operator}"
-                )
+        Self
+            The same instance, or `NotImplemented` if `other` is not supported or if the result
+            cannot be stored with the typecode of `self` (e.g., dividing an integer vector)
 
-        if isinstance(other, Vector):
-            try:
-                comparisons = (
-                    cmp(vec_el_a, vec_el_b)
-                    for vec_el_a, vec_el_b in zip(self, other, strict=True)
-                )
-            except ValueError:
-                raise ValueError(
-                    f"operands could not be broadcast with lengths {len(self)} and {len(other)}"
-                )
+        Raises
+        ------
+        ZeroDivisionError
+            If dividing and any divisor is zero, raised before any component is modified
+        """
+        try:
+            rhs, typecode = self._operand(other)
+        except TypeError:
+            return NotImplemented
+        result_typecode = promote_typecodes(self.typecode, typecode)
+        if operator_func is itruediv:
+            result_typecode = promote_typecodes(result_typecode, "f")
+        if result_typecode != self.typecode:
+            # The result cannot be stored in the components, so let Python fall back to the
+            # out-of-place operator, which returns a new vector with the promoted typecode
+            return NotImplemented
+        if operator_func in (itruediv, ifloordiv) and not all(rhs):
+            raise ZeroDivisionError("division by zero")
+
+        components = self._components
+        if operator_func is ifloordiv and len(rhs) < len(components):
+            # Floor division by the padding value is not a no-op, since it still floors
+            rhs = array(typecode, rhs)
+            rhs.extend(repeat(fillvalue, len(components) - len(rhs)))
+        size = len(rhs)
+        if size > len(components):
+            if not isinstance(components, array):
+                raise ValueError("cannot resize a Vector view")
+            # Must happen before any NumPy view is taken, since arrays cannot be resized while exported
+            components.extend(repeat(fillvalue, size - len(components)))
+        if self.use_numpy:
+            lhs = self._as_ndarray()[:size]
+            rhs = np.frombuffer(rhs, dtype=typecode)
+            # Silent like the out-of-place division, see `_numpy_division`
+            with np.errstate(divide="ignore", invalid="ignore"):
+                if lhs.dtype == np.float32:
+                    # Compute in doubles like the pure-Python path, see `_widen`
+                    lhs[:] = operator_func(_widen(lhs), rhs)
+                else:
+                    operator_func(lhs, rhs)
         else:
-            try:
-                other = float(other)
-            except TypeError:
-                return NotImplemented
-            comparisons = (cmp(vector_element, other) for vector_element in self)
-        return cls(comparisons)
-
-    def __gt__(self, other: Union[float, int, bool, Fraction, Self]) -> Self:
-        return self._cmp(other, "gt")
-
-    def __lt__(self, other: Union[float, int, bool, Fraction, Self]) -> Self:
-        return self._cmp(other, "lt")
+            for i, (vec_el_a, vec_el_b) in enumerate(zip(components, rhs)):
+                components[i] = operator_func(vec_el_a, vec_el_b)
+        return self
 
-    def __ge__(self, other: Union[float, int, bool, Fraction, Self]) -> Self:
-        return self._cmp(other, "ge")
+    def _inplace_scalar(self, scalar: Any, operator_func: Callable) -> Self:
+        """
+        Apply an in-place binary operator between every component and a scalar.
 
-    def __le__(self, other: Union[float, int, bool, Fraction, Self]) -> Self:
-        return self._cmp(other, "le")
+        Parameters
+        ----------
+        scalar : Any
+            An integer or a scalar value that can be converted to float
+        operator_func : Callable
+            An in-place function from the `operator` module, e.g. `operator.imul`
 
-    # ----------------------------- Sequence protocol ---------------------------- #
+        Returns
+        -------
+        Self
+            The same instance, or `NotImplemented` if `scalar` cannot be converted to float or
+            if the result cannot be stored with the typecode of `self`
+        """
+        try:
+            factor = _scalar_value(scalar)
+        except TypeError:
+            return NotImplemented
+        typecode = _scalar_typecode(self.typecode, scalar)
+        if operator_func is itruediv:
+            typecode = promote_typecodes(typecode, "f")
+        if typecode != self.typecode:
+            return NotImplemented
+        if operator_func in (itruediv, ifloordiv) and factor == 0 and len(self):
+            raise ZeroDivisionError("division by zero")
+
+        components = self._components
+        if self.use_numpy:
+            lhs = self._as_ndarray()
+            # Silent like the out-of-place division, see `_numpy_division`
+            with np.errstate(divide="ignore", invalid="ignore"):
+                if lhs.dtype == np.float32:
+                    # Compute in doubles like the pure-Python path, see `_widen`
+                    lhs[:] = operator_func(_widen(lhs), factor)
+                else:
+                    operator_func(lhs, factor)
+        else:
+            for i, vector_element in enumerate(components):
+                components[i] = operator_func(vector_element, factor)
+        return self
 
-    def __len__(self) -> int:
+    def __iadd__(self, other: Any) -> Self:
         """
-        To support the sequence protocol.
+        In-place element-wise addition, i.e. `self += other`. If `other` is longer, `self` is
+        extended with zeros first.
+
+        Parameters
+        ----------
+        other : Any
+            The other vector or sequence to add
 
         Returns
         -------
-        int
-            Length of the vector
+        Vector
+            The same instance
         """
-        return len(self._components)
+        return self._inplace_elementwise(other, iadd, fillvalue=0)
 
-    def __getitem__(self, key: Union[slice, int]) -> Union[Self, float]:
+    def __isub__(self, other: Any) -> Self:
         """
-        To support sequence protocol and slicing operations. The `operator.index`
-        function calls `key.__index__()` and raises an error if `key` does not implement
-        the `__index__` special method (i.e., it should not be used as an index).
+        In-place element-wise subtraction, i.e. `self -= other`. If `other` is longer, `self` is
+        extended with zeros first.
 
         Parameters
         ----------
-        key : Union[slice, int]
-            An integer index or a slice object
+        other : Any
+            The other vector or sequence to subtract
 
         Returns
         -------
-        Union[Self, float]
-            A new instance of the vector that contains the sliced components or a single component
+        Vector
+            The same instance
         """
-        if isinstance(key, slice):
-            cls = type(self)
-            # Simply delegate handling of slicing to the _components array
-            return cls(self._components[key])
-        key_index = index(key)
-        return self._components[key_index]
-
-    # ---------------------------------- Hashing --------------------------------- #
+        return self._inplace_elementwise(other, isub, fillvalue=0)
 
-    def __hash__(self) -> int:
+    def __imul__(self, scalar: Union[float, int, bool, Fraction]) -> Self:
+        """
+        In-place multiplication by a scalar, i.e. `self *= scalar`.
+
+        Parameters
+        ----------
+        scalar : Union[float, int, bool, Fraction]
+            A scalar value to multiply by
+
+        Returns
+        -------
+        Vector
+            The same instance
+        """
+        return self._inplace_scalar(scalar, imul)
+
+    def __itruediv__(self, other: Union[float, int, bool, Fraction, Self]) -> Self:
+        """
+        In-place division by a scalar or another vector, i.e. `self /= other`. If `other` is a
+        longer vector, `self` is extended with ones first.
+
+        Parameters
+        ----------
+        other : Union[float, int, bool, Fraction, Vector]
+            A scalar or another vector to divide by
+
+        Returns
+        -------
+        Vector
+            The same instance
+        """
+        if isinstance(other, Vector):
+            return self._inplace_elementwise(other, itruediv, fillvalue=1)
+        return self._inplace_scalar(other, itruediv)
+
+    def __ifloordiv__(self, other: Union[float, int, bool, Fraction, Self]) -> Self:
+        """
+        In-place floor division by a scalar or another vector, i.e. `self //= other`. If `other`
+        is a longer vector, `self` is extended with ones first.
+
+        Parameters
+        ----------
+        other : Union[float, int, bool, Fraction, Vector]
+            A scalar or another vector to divide by
+
+        Returns
+        -------
+        Vector
+            The same instance
+        """
+        if isinstance(other, Vector):
+            return self._inplace_elementwise(other, ifloordiv, fillvalue=1)
+        return self._inplace_scalar(other, ifloordiv)
+
+    def __ipow__(self, exponent: Union[int, float]) -> Self:
+        """
+        In-place power, i.e. `self **= exponent`. Unlike the other in-place operators, a power
+        can fail part-way through (e.g., a negative base with a fractional exponent), so the
+        result is computed out-of-place and copied back, leaving `self` unchanged on error. If
+        the result has a different typecode, it is returned as is instead.
+
+        Parameters
+        ----------
+        exponent : Union[int, float]
+            The exponent to raise the vector components to
+
+        Returns
+        -------
+        Vector
+            The same instance
+        """
+        result = self.__pow__(exponent)
+        if result is NotImplemented or result.typecode != self.typecode:
+            return result
+        self._components[:] = result._components
+        return self
+
+    # --------------------------- Comparison operators --------------------------- #
+
+    def _cmp(
+        self,
+        other: Union[float, int, bool, Fraction, Self],
+        comparison_operator: str,
+    ) -> Self:
+        """
+        Element-wise comparison of a vector with a scalar or another vector. If the other operand is a vector
+        the two vectors must have the same length. If the other operand is a scalar, the comparison is done
+        element-wise. The supported comparison operators are: `gt`, `lt`, `ge`, and `le`.
+
+        Parameters
+        ----------
+        other : Union[float, int, bool, Fraction, Vector]
+            A scalar or another vector to compare with
+        comparison_operator : str
+            The comparison operator to use
+
+        Returns
+        -------
+        Vector
+            A new instance of the class with the result of the comparison, with values 1 for True and 0 for False,
+            and a typecode that follows the same promotion rules as the arithmetic operators
+        """
+        cls = self.__class__
+        match comparison_operator:
+            case "gt":
+                cmp = gt
+            case "lt":
+                cmp = lt
+            case "ge":
+                cmp = ge
+            case "le":
+                cmp = le
+            case _:
+                raise ValueError(
+                    f"Unsupported comparison operator: {comparison_operator}"
+                )
+
+        if isinstance(other, Vector):
+            typecode = promote_typecodes(self.typecode, other.typecode)
+        else:
+            typecode = _scalar_typecode(self.typecode, other)
+
+        if self.use_numpy:
+            if isinstance(other, Vector):
+                if len(self) != len(other):
+                    raise ValueError(
+                        f"operands could not be broadcast with lengths {len(self)} and {len(other)}"
+                    )
+                rhs = _widen(other._as_ndarray())
+            else:
+                try:
+                    rhs = _scalar_value(other)
+                except TypeError:
+                    return NotImplemented
+            return self._from_ndarray(cmp(_widen(self._as_ndarray()), rhs), typecode)
+
+        if isinstance(other, Vector):
+            try:
+                comparisons = (
+                    cmp(vec_el_a, vec_el_b)
+                    for vec_el_a, vec_el_b in zip(self, other, strict=True)
+                )
+            except ValueError:
+                raise ValueError(
+                    f"operands could not be broadcast with lengths {len(self)} and {len(other)}"
+                )
+        else:
+            try:
+                other = _scalar_value(other)
+            except TypeError:
+                return NotImplemented
+            comparisons = (cmp(vector_element, other) for vector_element in self)
+        return cls(comparisons, typecode)
+
+    def __gt__(self, other: Union[float, int, bool, Fraction, Self]) -> Self:
+        return self._cmp(other, "gt")
+
+    def __lt__(self, other: Union[float, int, bool, Fraction, Self]) -> Self:
+        return self._cmp(other, "lt")
+
+    def __ge__(self, other: Union[float, int, bool, Fraction, Self]) -> Self:
+        return self._cmp(other, "ge")
+
+    def __le__(self, other: Union[float, int, bool, Fraction, Self]) -> Self:
+        return self._cmp(other, "le")
+
+    # ----------------------------- Sequence protocol ---------------------------- #
+
+    def __len__(self) -> int:
+        """
+        To support the sequence protocol.
+
+        Returns
+        -------
+        int
+            Length of the vector
+        """
+        return len(self._components)
+
+    def __getitem__(self, key: Union[slice, int]) -> Union[Self, float]:
+        """
+        To support sequence protocol and slicing operations. The `operator.index`
+        function calls `key.__index__()` and raises an error if `key` does not implement
+        the `__index__` special method (i.e., it should not be used as an index).
+
+        Parameters
+        ----------
+        key : Union[slice, int]
+            An integer index or a slice object
+
+        Returns
+        -------
+        Union[Self, float]
+            A new instance of the vector that contains the sliced components or a single component
+        """
+        if isinstance(key, slice):
+            cls = type(self)
+            # Simply delegate handling of slicing to the _components array
+            return cls(self._components[key], self.typecode)
+        key_index = index(key)
+        return self._components[key_index]
+
+    # ---------------------------------- Hashing --------------------------------- #
+
+    def __hash__(self) -> int:
         """
         Compute the hash value of the instance. This is an application of map-reduce. At the map stage,
         we apply the `hash` function to each element in the vector. At the reduce stage, we apply the
@@ -462,39 +1345,1082 @@ class Vector(object):
 
         Returns
         -------
-        int
-            The hash value of the instance
+        int
+            The hash value of the instance
+        """
+        # Hashing holds the GIL, so large vectors are hashed by a pool of processes instead
+        if len(self) >= self.parallel_threshold and self.workers > 1:
+            return self._parallel_hash()
+        # This is a lazy iterator, `map` avoids the per-element frame of a generator expression
+        hash_values = map(hash, self._components)
+        return reduce(xor, hash_values, 0)
+
+    def _parallel_hash(self) -> int:
+        """
+        Compute the hash value on `workers` processes. The components are copied once into a
+        `SharedMemory` block, each process reduces `_REDUCTION_CHUNK_SIZE` slices of it with
+        `_hash_chunk`, and the partial hash values are combined with `xor`, which does not depend
+        on their order.
+
+        Returns
+        -------
+        int
+            The hash value of the instance, the same as the serial path
+        """
+        starts = range(0, len(self), _REDUCTION_CHUNK_SIZE)
+        stops = [min(start + _REDUCTION_CHUNK_SIZE, len(self)) for start in starts]
+        with memoryview(self._components) as buffer:
+            shared = SharedMemory(create=True, size=buffer.nbytes)
+            shared_buffer: Any = shared.buf
+            try:
+                shared_buffer[: buffer.nbytes] = buffer.cast("B")
+                with ProcessPoolExecutor(
+                    max_workers=min(self.workers, len(starts))
+                ) as executor:
+                    partials = executor.map(
+                        _hash_chunk,
+                        repeat(shared.name),
+                        repeat(self.typecode),
+                        starts,
+                        stops,
+                    )
+                    return reduce(xor, partials, 0)
+            finally:
+                shared.close()
+                shared.unlink()
+
+    def __eq__(self, other: Any) -> bool:
+        """
+        For the two operands to compare equal:
+
+        1. They must have the same length
+        2. The corresponding elements must be equal
+
+        This is also important to have this method in the event of a hash collision.
+
+        Parameters
+        ----------
+        other : Any
+            The other object to compare with
+
+        Returns
+        -------
+        bool
+            True if the two operands are equal, False otherwise
+        """
+        # Ensure that both operands are instances of Vector
+        if isinstance(other, Vector):
+            if self._chunked(other) and self.typecode == other.typecode:
+                lhs, rhs = self._as_ndarray(), other._as_ndarray()
+                partials = _map_chunks(
+                    lambda start, stop: bool(
+                        np.array_equal(lhs[start:stop], rhs[start:stop])
+                    ),
+                    len(lhs),
+                    self.workers,
+                )
+                return all(partials)
+            return len(self) == len(other) and all(
+                vec_el_a == vec_el_b for vec_el_a, vec_el_b in zip(self, other)
+            )
+        else:
+            return NotImplemented
+
+
+class FrozenVector(Vector):
+    """
+    An immutable vector, whose hash and norm are computed on first use and then cached. This
+    suits large vectors used as set members or dictionary keys, or whose norm is queried again
+    and again. In-place operators are not supported, so `v += w` rebinds `v` to a new frozen
+    vector, like it does for tuples.
+    """
+
+    # Class-level defaults, so that instances created without `__init__` (e.g., by the NumPy
+    # kernels or `frombytes`) start with an empty cache
+    _hash: Optional[int] = None
+    _norm: Optional[float] = None
+
+    def __hash__(self) -> int:
+        """
+        Compute the hash value once and cache it for later calls.
+
+        Returns
+        -------
+        int
+            The hash value of the instance
+        """
+        if self._hash is None:
+            self._hash = super().__hash__()
+        return self._hash
+
+    def __abs__(self) -> float:
+        """
+        Compute the euclidean norm once and cache it for later calls.
+
+        Returns
+        -------
+        float
+            The euclidean norm of the vector
+        """
+        if self._norm is None:
+            self._norm = super().__abs__()
+        return self._norm
+
+    def __bool__(self) -> bool:
+        return bool(abs(self))
+
+    def _immutable(self, other: Any) -> Any:
+        """
+        Decline every in-place operator, so Python falls back to the out-of-place operator and
+        binds the name to a new instance instead of mutating (and invalidating the caches of)
+        this one.
+        """
+        return NotImplemented
+
+    __iadd__ = __isub__ = __imul__ = _immutable
+    __itruediv__ = __ifloordiv__ = __ipow__ = _immutable
+
+
+class LazyVector(object):
+    """
+    A node of a lazy expression graph over vectors, created with `Vector.lazy()`. Operators on a
+    lazy vector record the operation instead of computing it, so an expression such as
+    `(v1.lazy() + v2) * 3 - v3.lazy() / 2` allocates no intermediate vectors (note that `v3 / 2`
+    alone would be evaluated eagerly, since neither operand is lazy). The graph is evaluated
+    when the result is needed (`evaluate`, iteration, indexing, `bytes`, `==`, ...) in a single
+    pass over fixed-size chunks of the inputs, so intermediate results never exceed one chunk.
+
+    The result is the same as evaluating the expression eagerly, including the padding rules
+    and `promote_typecodes`. The graph reads its input vectors when it is evaluated, so in-place
+    updates to them after the graph is built are visible in the result.
+    """
+
+    def __init__(self, vector: Vector) -> None:
+        """
+        Wrap a vector as a leaf of an expression graph.
+
+        Parameters
+        ----------
+        vector : Vector
+            The input vector
+        """
+        self._vector: Optional[Vector] = vector
+        self._operator_func: Optional[Callable] = None
+        self._operands: Tuple[Any, ...] = ()
+        self._fillvalue = 0
+        self.typecode: str = vector.typecode
+        self._length = len(vector)
+
+    @classmethod
+    def _node(
+        cls,
+        operator_func: Callable,
+        operands: Tuple[Any, ...],
+        typecode: str,
+        fillvalue: int = 0,
+    ) -> Self:
+        """
+        Create an inner node of the expression graph.
+
+        Parameters
+        ----------
+        operator_func : Callable
+            A function from the `operator` module, applied element-wise to the operands
+        operands : Tuple[Any, ...]
+            Lazy vectors or Python scalars
+        typecode : str
+            The typecode of the result
+        fillvalue : int, optional
+            The value used to pad operands shorter than the result, by default 0
+
+        Returns
+        -------
+        Self
+            A new node
+        """
+        node = cls.__new__(cls)
+        node._vector = None
+        node._operator_func = operator_func
+        node._operands = operands
+        node._fillvalue = fillvalue
+        node.typecode = typecode
+        node._length = max(
+            len(operand) for operand in operands if isinstance(operand, LazyVector)
+        )
+        return node
+
+    # ------------------------------ Graph building ------------------------------ #
+
+    def _elementwise(
+        self,
+        other: Any,
+        operator_func: Callable,
+        fillvalue: int,
+        reflected: bool = False,
+    ) -> Self:
+        """
+        Record an element-wise operator between two vectors.
+
+        Parameters
+        ----------
+        other : Any
+            A vector or a lazy vector
+        operator_func : Callable
+            A function from the `operator` module, e.g. `operator.add`
+        fillvalue : int
+            The value used to pad the shorter operand
+        reflected : bool, optional
+            Whether `other` is the left operand, by default False
+
+        Returns
+        -------
+        Self
+            A new node, or `NotImplemented` if `other` is not supported
+        """
+        if isinstance(other, Vector):
+            other = LazyVector(other)
+        if not isinstance(other, LazyVector):
+            return NotImplemented
+        typecode = promote_typecodes(self.typecode, other.typecode)
+        if operator_func is truediv:
+            typecode = promote_typecodes(typecode, "f")
+        operands = (other, self) if reflected else (self, other)
+        return self._node(operator_func, operands, typecode, fillvalue)
+
+    def _scalar(self, scalar: Any, operator_func: Callable) -> Self:
+        """
+        Record an operator between every component and a Python scalar.
+
+        Parameters
+        ----------
+        scalar : Any
+            An integer or a scalar value that can be converted to float
+        operator_func : Callable
+            A function from the `operator` module, e.g. `operator.mul`
+
+        Returns
+        -------
+        Self
+            A new node, or `NotImplemented` if `scalar` is not supported
+        """
+        try:
+            value = _scalar_value(scalar)
+        except TypeError:
+            return NotImplemented
+        typecode = _scalar_typecode(self.typecode, scalar)
+        if operator_func is truediv or (operator_func is pow and value < 0):
+            typecode = promote_typecodes(typecode, "f")
+        return self._node(operator_func, (self, value), typecode)
+
+    def __add__(self, other: Any) -> Self:
+        return self._elementwise(other, add, fillvalue=0)
+
+    def __radd__(self, other: Any) -> Self:
+        return self._elementwise(other, add, fillvalue=0, reflected=True)
+
+    def __sub__(self, other: Any) -> Self:
+        return self._elementwise(other, sub, fillvalue=0)
+
+    def __rsub__(self, other: Any) -> Self:
+        return self._elementwise(other, sub, fillvalue=0, reflected=True)
+
+    def __mul__(self, scalar: Union[float, int, bool, Fraction]) -> Self:
+        return self._scalar(scalar, mul)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: Any) -> Self:
+        if isinstance(other, (Vector, LazyVector)):
+            return self._elementwise(other, truediv, fillvalue=1)
+        return self._scalar(other, truediv)
+
+    def __rtruediv__(self, other: Any) -> Self:
+        return self._elementwise(other, truediv, fillvalue=1, reflected=True)
+
+    def __floordiv__(self, other: Any) -> Self:
+        if isinstance(other, (Vector, LazyVector)):
+            return self._elementwise(other, floordiv, fillvalue=1)
+        return self._scalar(other, floordiv)
+
+    def __rfloordiv__(self, other: Any) -> Self:
+        return self._elementwise(other, floordiv, fillvalue=1, reflected=True)
+
+    def __pow__(self, exponent: Union[int, float]) -> Self:
+        if not isinstance(exponent, (int, float)):
+            return NotImplemented
+        return self._scalar(exponent, pow)
+
+    def __neg__(self) -> Self:
+        return self._node(neg, (self,), self.typecode)
+
+    def __pos__(self) -> Self:
+        return self._node(pos, (self,), self.typecode)
+
+    def _cmp(self, other: Any, comparison_operator: Callable) -> Self:
+        """
+        Record an element-wise comparison with a scalar or a vector of the same length.
+        """
+        if isinstance(other, (Vector, LazyVector)):
+            if len(self) != len(other):
+                raise ValueError(
+                    f"operands could not be broadcast with lengths {len(self)} and {len(other)}"
+                )
+            return self._elementwise(other, comparison_operator, fillvalue=0)
+        return self._scalar(other, comparison_operator)
+
+    def __gt__(self, other: Any) -> Self:
+        return self._cmp(other, gt)
+
+    def __lt__(self, other: Any) -> Self:
+        return self._cmp(other, lt)
+
+    def __ge__(self, other: Any) -> Self:
+        return self._cmp(other, ge)
+
+    def __le__(self, other: Any) -> Self:
+        return self._cmp(other, le)
+
+    # -------------------------------- Evaluation -------------------------------- #
+
+    def _evaluate(self, start: int, stop: int, use_numpy: bool) -> Any:
+        """
+        Evaluate the components in `[start, stop)` of this node, where `stop <= len(self)`.
+        Operands shorter than `stop` are padded with the fill value of this node, exactly like
+        `zip_longest` pads the intermediate results of the eager operators.
+
+        Parameters
+        ----------
+        start : int
+            The first index of the chunk
+        stop : int
+            One past the last index of the chunk
+        use_numpy : bool
+            Whether to evaluate with NumPy kernels or with `map` over arrays
+
+        Returns
+        -------
+        Union[np.ndarray, array]
+            The components of the chunk with the typecode of this node
+        """
+        if self._vector is not None:
+            components: Any = self._vector._components
+            if use_numpy:
+                return self._vector._as_ndarray()[start:stop]
+            if isinstance(components, array):
+                return components[start:stop]
+            return array(self.typecode, components[start:stop])
+
+        size = stop - start
+        arguments = []
+        for operand in self._operands:
+            if not isinstance(operand, LazyVector):
+                arguments.append(operand)
+                continue
+            operand_stop = min(stop, len(operand))
+            if use_numpy:
+                if start < operand_stop:
+                    values = operand._evaluate(start, operand_stop, use_numpy)
+                else:
+                    values = np.empty(0, dtype=operand.typecode)
+                # Cast to the typecode of this node, which is how the eager kernels promote,
+                # then widen `f` to round like them
+                arguments.append(
+                    _widen(
+                        _pad(values, size, self._fillvalue).astype(
+                            self.typecode, copy=False
+                        )
+                    )
+                )
+            else:
+                values = array(operand.typecode)
+                if start < operand_stop:
+                    values = operand._evaluate(start, operand_stop, use_numpy)
+                values.extend(repeat(self._fillvalue, size - len(values)))
+                arguments.append(values)
+
+        if use_numpy:
+            # Powers are mapped with `pow` like the eager operator, see `Vector.__pow__`
+            if self._operator_func is not pow:
+                with np.errstate(all="ignore"):
+                    result = self._operator_func(*arguments)  # type: ignore[misc]
+                if not self._needs_python(arguments, result):
+                    return np.asarray(result).astype(self.typecode, copy=False)
+            # Let the pure-Python path raise the same error as the eager operators
+            arguments = [
+                argument.tolist() if isinstance(argument, np.ndarray) else argument
+                for argument in arguments
+            ]
+            values = array(self.typecode, self._map(arguments))
+            return np.frombuffer(values, dtype=self.typecode)
+        return array(self.typecode, self._map(arguments))
+
+    def _map(self, arguments: List[Any]) -> Iterator:
+        """
+        Apply the operator of this node element-wise with `map`, repeating scalar arguments.
+        """
+        return map(
+            self._operator_func,  # type: ignore[arg-type]
+            *(
+                argument if isinstance(argument, (array, list)) else repeat(argument)
+                for argument in arguments
+            ),
+        )
+
+    def _needs_python(self, arguments: List[Any], result: Any) -> bool:
+        """
+        Check whether a NumPy chunk hit a case where the pure-Python operators raise instead,
+        i.e. a zero divisor.
+        """
+        if self._operator_func in (truediv, floordiv):
+            return bool(len(result)) and not np.all(arguments[1])
+        return False
+
+    def evaluate(self) -> Vector:
+        """
+        Evaluate the whole expression graph in a single pass over chunks of the inputs.
+
+        Returns
+        -------
+        Vector
+            A new vector with the result
+        """
+        use_numpy = Vector.use_numpy
+        # Allocate the result once, since growing it chunk by chunk would reallocate and copy
+        components: array[Any] = array(self.typecode, [0]) * len(self)
+        if use_numpy:
+            output = np.frombuffer(components, dtype=self.typecode)
+        for start in range(0, len(self), _LAZY_CHUNK_SIZE):
+            stop = min(start + _LAZY_CHUNK_SIZE, len(self))
+            chunk = self._evaluate(start, stop, use_numpy)
+            if use_numpy:
+                output[start:stop] = chunk
+            else:
+                components[start:stop] = chunk
+        if use_numpy:
+            # Release the export of the buffer, so the result can be resized in place later
+            del output
+        vector = Vector.__new__(Vector)
+        vector.typecode = self.typecode
+        vector._components = components
+        return vector
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator:
+        return iter(self.evaluate())
+
+    def __getitem__(self, key: Union[slice, int]) -> Union[Vector, float]:
+        """
+        Evaluate a single component, which only touches one element of every input, or a slice
+        of the result.
+
+        Parameters
+        ----------
+        key : Union[slice, int]
+            An integer index or a slice object
+
+        Returns
+        -------
+        Union[Vector, float]
+            A single component or a new vector with the sliced components
         """
-        # This is a generator
-        hash_values = (hash(vector_element) for vector_element in self._components)
-        return reduce(xor, hash_values, 0)
+        if isinstance(key, slice):
+            return self.evaluate()[key]
+        key_index = range(len(self))[index(key)]
+        chunk = self._evaluate(key_index, key_index + 1, use_numpy=False)
+        return chunk[0]
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.evaluate())
 
     def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyVector):
+            other = other.evaluate()
+        return self.evaluate() == other
+
+    def __hash__(self) -> int:
+        return hash(self.evaluate())
+
+    def __abs__(self) -> float:
+        return abs(self.evaluate())
+
+    def __bool__(self) -> bool:
+        return bool(self.evaluate())
+
+    def __matmul__(self, other: Any) -> float:
+        if isinstance(other, LazyVector):
+            other = other.evaluate()
+        return self.evaluate() @ other
+
+    __rmatmul__ = __matmul__
+
+    def __repr__(self) -> str:
+        if self._vector is not None:
+            return f"LazyVector({self._vector!r})"
+        operator_name = getattr(self._operator_func, "__name__", "?")
+        operands = ", ".join(f"{operand!r}" for operand in self._operands)
+        return f"LazyVector.{operator_name}({operands})"
+
+
+class VectorBatch(object):
+    """
+    A batch of vectors of equal dimension, stored row by row in one contiguous `array`. Compared
+    to a list of `Vector` instances, this avoids an object header and a separate `array` for
+    every vector, and lets the batched operators run in a single pass over the whole buffer.
+    """
+
+    typecode = Vector.typecode
+
+    def __init__(
+        self,
+        vectors: Iterable[Iterable[Union[int, float]]],
+        dimension: Optional[int] = None,
+    ):
         """
-        For the two operands to compare equal:
+        Initialize an instance of the VectorBatch class.
 
-        1. They must have the same length
-        2. The corresponding elements must be equal
+        Parameters
+        ----------
+        vectors : Iterable[Iterable[Union[int, float]]]
+            An iterable of vectors or sequences of numbers, all with the same length
+        dimension : Optional[int], optional
+            The dimension of each vector, inferred from the first vector if not provided
 
-        This is also important to have this method in the event of a hash collision.
+        Raises
+        ------
+        ValueError
+            If the vectors do not all have the same dimension
+        """
+        self._components: array[float] = array(self.typecode)
+        count = 0
+        for vector in vectors:
+            start = len(self._components)
+            if isinstance(vector, Vector) and vector.typecode == self.typecode:
+                self._components.extend(vector._components)
+            else:
+                self._components.extend(vector)
+            size = len(self._components) - start
+            if dimension is None:
+                dimension = size
+            elif size != dimension:
+                raise ValueError(
+                    f"expected vectors of dimension {dimension}, got dimension {size}"
+                )
+            count += 1
+        self.dimension: int = dimension or 0
+        self._count = count
+
+    @classmethod
+    def _from_flat(cls, components: array, count: int, dimension: int) -> Self:
+        """
+        Create a new instance that takes ownership of an already flattened `array`.
+
+        Parameters
+        ----------
+        components : array
+            The row-major components of all vectors
+        count : int
+            The number of vectors
+        dimension : int
+            The dimension of each vector
+
+        Returns
+        -------
+        Self
+            A new instance of the class
+        """
+        batch = cls.__new__(cls)
+        batch._components = components
+        batch.dimension = dimension
+        batch._count = count
+        return batch
+
+    @classmethod
+    def _from_ndarray(cls, values: Any) -> Self:
+        """
+        Create a new instance from a two-dimensional NumPy array with a single bulk copy.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            An array of shape `(count, dimension)`
+
+        Returns
+        -------
+        Self
+            A new instance of the class
+        """
+        count, dimension = values.shape
+        values = np.ascontiguousarray(values, dtype=cls.typecode)
+        components = array(cls.typecode)
+        components.frombytes(values.view(np.uint8))
+        return cls._from_flat(components, count, dimension)
+
+    def _as_ndarray(self) -> Any:
+        """
+        View the components as a NumPy array of shape `(count, dimension)` without copying.
+
+        Returns
+        -------
+        np.ndarray
+            A two-dimensional view over the components
+        """
+        values = np.frombuffer(self._components, dtype=self.typecode)
+        return values.reshape(self._count, self.dimension)
+
+    def _rows(self) -> Iterator[memoryview]:
+        """
+        Slice the components into one memoryview per vector, without copying.
+
+        Returns
+        -------
+        Iterator[memoryview]
+            An iterator over the rows
+        """
+        buffer = memoryview(self._components)
+        for row in range(self._count):
+            yield buffer[row * self.dimension : (row + 1) * self.dimension]
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        The number of vectors and their dimension.
+        """
+        return (self._count, self.dimension)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Vector]:
+        """
+        Iterate over lightweight `Vector` views of each row.
+
+        Returns
+        -------
+        Iterator[Vector]
+            An iterator of vectors sharing memory with the batch
+        """
+        return (Vector._view(row) for row in self._rows())
+
+    def __getitem__(self, key: int) -> Vector:
+        """
+        Return a `Vector` view of a single row. No data is copied, so in-place updates to the
+        view are visible in the batch and vice versa.
+
+        Parameters
+        ----------
+        key : int
+            The row index, negative indices count from the end
+
+        Returns
+        -------
+        Vector
+            A view of the row
+        """
+        row = range(self._count)[index(key)]
+        start = row * self.dimension
+        buffer = memoryview(self._components)[start : start + self.dimension]
+        return Vector._view(buffer)
+
+    def __repr__(self) -> str:
+        return f"VectorBatch(count={self._count}, dimension={self.dimension})"
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, VectorBatch):
+            return self.shape == other.shape and self._components == other._components
+        return NotImplemented
+
+    # ----------------------------- Batched operators ---------------------------- #
+
+    def _check_operand(self, other: Union[Vector, "VectorBatch"]) -> None:
+        """
+        Check that `other` can be combined with every vector in the batch, i.e. it is either a
+        batch of the same shape or a single vector of the same dimension (broadcast to each row).
+
+        Raises
+        ------
+        ValueError
+            If the shapes are incompatible
+        """
+        if isinstance(other, VectorBatch):
+            if other.shape != self.shape:
+                raise ValueError(
+                    f"operands could not be broadcast with shapes {self.shape} and {other.shape}"
+                )
+        elif len(other) != self.dimension:
+            raise ValueError(
+                f"operands could not be broadcast with shape {self.shape} and dimension {len(other)}"
+            )
+
+    def _elementwise(self, other: Any, operator_func: Callable) -> Self:
+        """
+        Apply a binary operator between every vector and either a batch of the same shape or a
+        single vector broadcast to each row, in one pass over the components.
 
         Parameters
         ----------
         other : Any
-            The other object to compare with
+            A batch or a single vector
+        operator_func : Callable
+            A function from the `operator` module, e.g. `operator.add`
 
         Returns
         -------
-        bool
-            True if the two operands are equal, False otherwise
+        Self
+            A new batch, or `NotImplemented` if `other` is not supported
         """
-        # Ensure that both operands are instances of Vector
-        if isinstance(other, Vector):
-            return len(self) == len(other) and all(
-                vec_el_a == vec_el_b for vec_el_a, vec_el_b in zip(self, other)
+        if not isinstance(other, (Vector, VectorBatch)):
+            return NotImplemented
+        self._check_operand(other)
+        if Vector.use_numpy:
+            return self._from_ndarray(
+                operator_func(self._as_ndarray(), other._as_ndarray())
             )
+        if isinstance(other, VectorBatch):
+            rhs: Iterable = other._components
         else:
+            rhs = cycle(other._components)
+        components = array(self.typecode, map(operator_func, self._components, rhs))
+        return self._from_flat(components, self._count, self.dimension)
+
+    def _scalar(self, scalar: Any, operator_func: Callable) -> Self:
+        """
+        Apply a binary operator between every component and a scalar, in one pass.
+
+        Parameters
+        ----------
+        scalar : Any
+            A scalar value that can be converted to float
+        operator_func : Callable
+            A function from the `operator` module, e.g. `operator.mul`
+
+        Returns
+        -------
+        Self
+            A new batch, or `NotImplemented` if `scalar` cannot be converted to float
+        """
+        try:
+            factor = float(scalar)
+        except TypeError:
+            return NotImplemented
+        if Vector.use_numpy:
+            return self._from_ndarray(operator_func(self._as_ndarray(), factor))
+        components = array(
+            self.typecode, map(operator_func, self._components, repeat(factor))
+        )
+        return self._from_flat(components, self._count, self.dimension)
+
+    def __add__(self, other: Union[Vector, Self]) -> Self:
+        return self._elementwise(other, add)
+
+    def __sub__(self, other: Union[Vector, Self]) -> Self:
+        return self._elementwise(other, sub)
+
+    def __mul__(self, scalar: Union[float, int, bool, Fraction]) -> Self:
+        return self._scalar(scalar, mul)
+
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+    def __matmul__(self, other: Union[Vector, Self]) -> Vector:
+        """
+        Compute dot products in one pass. With a single vector, return the dot product of every
+        row with it. With another batch of the same shape, return the pairwise dot products of
+        corresponding rows. See `gram` for all pairs of rows.
+
+        Parameters
+        ----------
+        other : Union[Vector, VectorBatch]
+            A vector of the same dimension or a batch of the same shape
+
+        Returns
+        -------
+        Vector
+            A vector with one dot product per row
+        """
+        if not isinstance(other, (Vector, VectorBatch)):
             return NotImplemented
+        self._check_operand(other)
+        if Vector.use_numpy:
+            lhs = self._as_ndarray()
+            if isinstance(other, VectorBatch):
+                return Vector._from_ndarray(
+                    np.einsum("ij,ij->i", lhs, other._as_ndarray())
+                )
+            return Vector._from_ndarray(lhs @ other._as_ndarray())
+        if isinstance(other, VectorBatch):
+            pairs: Iterable = zip(self._rows(), other._rows())
+        else:
+            pairs = zip(self._rows(), repeat(other._components))
+        return Vector(sum(map(mul, row_a, row_b)) for row_a, row_b in pairs)
+
+    __rmatmul__ = __matmul__
+
+    def gram(self, other: Optional[Self] = None) -> Self:
+        """
+        Compute the matrix of dot products between every row of `self` and every row of `other`
+        (the Gram matrix when `other` is omitted).
+
+        Parameters
+        ----------
+        other : Optional[VectorBatch], optional
+            A batch with the same dimension, defaults to `self`
+
+        Returns
+        -------
+        VectorBatch
+            A batch of shape `(len(self), len(other))` where row `i` holds the dot products of
+            the `i`-th vector of `self` with every vector of `other`
+        """
+        other = self if other is None else other
+        if other.dimension != self.dimension:
+            raise ValueError(
+                f"gram requires equal dimensions, got {self.dimension} and {other.dimension}"
+            )
+        if Vector.use_numpy:
+            return self._from_ndarray(self._as_ndarray() @ other._as_ndarray().T)
+        other_rows = list(other._rows())
+        components = array(
+            self.typecode,
+            (
+                sum(map(mul, row_a, row_b))
+                for row_a in self._rows()
+                for row_b in other_rows
+            ),
+        )
+        return self._from_flat(components, self._count, other._count)
+
+    def __abs__(self) -> Vector:
+        """
+        Compute the euclidean norm of every vector.
+
+        Returns
+        -------
+        Vector
+            A vector with one norm per row
+        """
+        if Vector.use_numpy:
+            return Vector._from_ndarray(np.linalg.norm(self._as_ndarray(), axis=1))
+        return Vector(hypot(*row) for row in self._rows())
+
+    def _cmp(self, other: Any, comparison_operator: Callable) -> Self:
+        """
+        Element-wise comparison with a scalar, a single vector broadcast to each row or a batch
+        of the same shape. The result holds 1.0 for True and 0.0 for False.
+
+        Parameters
+        ----------
+        other : Any
+            A scalar, a vector or a batch to compare with
+        comparison_operator : Callable
+            One of `operator.gt`, `operator.lt`, `operator.ge` or `operator.le`
+
+        Returns
+        -------
+        VectorBatch
+            A new batch with the result of the comparison
+        """
+        if isinstance(other, (Vector, VectorBatch)):
+            return self._elementwise(other, comparison_operator)
+        return self._scalar(other, comparison_operator)
+
+    def __gt__(self, other: Any) -> Self:
+        return self._cmp(other, gt)
+
+    def __lt__(self, other: Any) -> Self:
+        return self._cmp(other, lt)
+
+    def __ge__(self, other: Any) -> Self:
+        return self._cmp(other, ge)
+
+    def __le__(self, other: Any) -> Self:
+        return self._cmp(other, le)
+
+
+# ---------------------------- Binary vector files ---------------------------- #
+
+# Magic, format version, typecode, byte order, 1 padding byte, dimension, count (24 bytes keeps
+# the data 8-byte aligned)
+_FILE_HEADER = struct.Struct("<4sBcc1xQQ")
+_FILE_MAGIC = b"VECS"
+_FILE_VERSION = 2
+# The components are written as they are in memory, so their byte order is recorded in the header
+_FILE_BYTE_ORDER = b"<" if sys.byteorder == "little" else b">"
+
+
+def write_vectors(path: Union[str, Path], vectors: Iterable[Vector]) -> int:
+    """
+    Stream vectors of equal dimension to a binary file. The file starts with a fixed-size header
+    (magic, version, typecode, byte order, dimension, count) followed by the raw components of
+    each vector, row after row, in native byte order. Each vector's buffer is written directly, without an
+    intermediate `bytes` copy, and the count is patched into the header at the end so that the
+    vectors can come from a generator.
+
+    Parameters
+    ----------
+    path : Union[str, Path]
+        The file to write
+    vectors : Iterable[Vector]
+        The vectors to write, all with the same dimension and typecode
+
+    Returns
+    -------
+    int
+        The number of vectors written
+
+    Raises
+    ------
+    ValueError
+        If the vectors do not all have the same dimension and typecode
+    """
+    dimension: Optional[int] = None
+    typecode = Vector.typecode
+    count = 0
+    with open(path, "wb") as file:
+        # Placeholder header, rewritten once the dimension and count are known
+        file.write(bytes(_FILE_HEADER.size))
+        for vector in vectors:
+            if dimension is None:
+                dimension, typecode = len(vector), vector.typecode
+            elif len(vector) != dimension or vector.typecode != typecode:
+                raise ValueError(
+                    f"expected vectors of dimension {dimension} and typecode {typecode!r}, "
+                    f"got dimension {len(vector)} and typecode {vector.typecode!r}"
+                )
+            file.write(vector._components)
+            count += 1
+        file.seek(0)
+        file.write(
+            _FILE_HEADER.pack(
+                _FILE_MAGIC,
+                _FILE_VERSION,
+                typecode.encode(),
+                _FILE_BYTE_ORDER,
+                dimension or 0,
+                count,
+            )
+        )
+    return count
+
+
+class VectorStore(object):
+    """
+    A read-only, memory-mapped view of a file written by `write_vectors`. Opening a store only
+    parses the header, vectors are paged in by the operating system as they are accessed and
+    handed out as zero-copy `Vector` views.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Open and memory-map a vector file.
+
+        Parameters
+        ----------
+        path : Union[str, Path]
+            The file to open
+
+        Raises
+        ------
+        ValueError
+            If the file is not a vector file, was written on a machine with the other byte order
+            or is truncated
+        """
+        with open(path, "rb") as file:
+            self._mmap = mmap(file.fileno(), 0, access=ACCESS_READ)
+        if len(self._mmap) < _FILE_HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"{path} is too small to be a vector file")
+        magic, version, typecode, byte_order, dimension, count = (
+            _FILE_HEADER.unpack_from(self._mmap)
+        )
+        if magic != _FILE_MAGIC or version != _FILE_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a version {_FILE_VERSION} vector file")
+        # Latin-1 decodes any byte, so a corrupt typecode fails the check below instead
+        if typecode.decode("latin-1") not in TYPECODES:
+            self._mmap.close()
+            raise ValueError(f"{path} has an unsupported typecode {typecode!r}")
+        if byte_order != _FILE_BYTE_ORDER:
+            self._mmap.close()
+            raise ValueError(f"{path} was written with the other byte order")
+        self.typecode: str = typecode.decode()
+        self.dimension: int = dimension
+        self._count: int = count
+        self._data = memoryview(self._mmap)[_FILE_HEADER.size :].cast(self.typecode)
+        if len(self._data) < count * dimension:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, key: int) -> Vector:
+        """
+        Return a read-only `Vector` view of a single stored vector, without copying.
+
+        Parameters
+        ----------
+        key : int
+            The vector index, negative indices count from the end
+
+        Returns
+        -------
+        Vector
+            A view backed by the memory-mapped file
+        """
+        row = range(self._count)[index(key)]
+        start = row * self.dimension
+        return Vector._view(self._data[start : start + self.dimension])
+
+    def __iter__(self) -> Iterator[Vector]:
+        """
+        Lazily iterate over the stored vectors as zero-copy views.
+
+        Returns
+        -------
+        Iterator[Vector]
+            An iterator of read-only vectors
+        """
+        return (self[row] for row in range(self._count))
+
+    def batch(self) -> VectorBatch:
+        """
+        View the whole store as a `VectorBatch` without copying.
+
+        Returns
+        -------
+        VectorBatch
+            A read-only batch backed by the memory-mapped file
+
+        Raises
+        ------
+        ValueError
+            If the store does not hold vectors with the typecode of `VectorBatch`
+        """
+        if self.typecode != VectorBatch.typecode:
+            raise ValueError(
+                f"only stores with typecode {VectorBatch.typecode!r} can be viewed as a batch"
+            )
+        data = self._data[: self._count * self.dimension]
+        return VectorBatch._from_flat(data, self._count, self.dimension)  # type: ignore[arg-type]
+
+    def close(self) -> None:
+        """
+        Release the memory map. If vector views handed out by the store are still alive, the map
+        cannot be closed yet and is instead released once the last view is garbage collected.
+        """
+        self._data.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
 
 def main() -> int:
@@ -534,6 +2460,11 @@ def main() -> int:
     # Equality check
     print("v1 == v1_from_bytes:", v1 == v1_from_bytes)
 
+    # Frozen vectors cache their hash and norm
+    frozen_v1 = v1.freeze()
+    print("abs(frozen_v1):", abs(frozen_v1))
+    print("frozen_v1 in {v1}:", frozen_v1 in {v1})
+
     # Boolean context
     print("bool(v1):", bool(v1))
     print("bool(Vector([0, 0, 0])):", bool(Vector([0, 0, 0])))
@@ -550,6 +2481,29 @@ def main() -> int:
     print("+v1:", +v1)
     print("-v1:", -v1)
 
+    # Lazy expression evaluated in a single pass
+    expression = (v1.lazy() + v2) * 3 - v1.lazy() / 2
+    print("(v1 + v2) * 3 - v1 / 2:", expression.evaluate())
+    print("lazy == eager:", expression == (v1 + v2) * 3 - v1 / 2)
+
+    # Batch of vectors stored in one contiguous array
+    batch = VectorBatch([v1, v2, v1 + v2])
+    print("batch:", batch)
+    print("batch[2]:", batch[2])
+    print("batch + v1:", list(batch + v1))
+    print("batch @ v1:", batch @ v1)
+    print("abs(batch):", abs(batch))
+    print("batch.gram():", list(batch.gram()))
+
+    # Stream vectors to a binary file and memory-map them back without copying
+    with TemporaryDirectory() as temp_dir:
+        vector_file = Path(temp_dir) / "vectors.bin"
+        write_vectors(vector_file, (v1 * scale for scale in range(5)))
+        with VectorStore(vector_file) as store:
+            print("Vectors in store:", len(store))
+            print("store[-1]:", store[-1])
+            print("abs(store.batch()):", abs(store.batch()))
+
     return 0
 
 
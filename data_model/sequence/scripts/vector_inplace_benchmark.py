@@ -0,0 +1,94 @@
+import inspect
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+from vector import Vector
+
+dimension = 1_000_000
+iterations = 10
+# Only count the blocks allocated by the operators, not by the snapshots or by caches
+# filled by the standard library on first use
+snapshot_filters = [tracemalloc.Filter(True, inspect.getfile(Vector))]
+
+
+def out_of_place(accumulator: Vector, increment: Vector, repeats: int) -> Vector:
+    """
+    Accumulate with the binary operator, which allocates a new `array` on every iteration.
+    """
+    for _ in range(repeats):
+        accumulator = accumulator + increment
+    return accumulator
+
+
+def in_place(accumulator: Vector, increment: Vector, repeats: int) -> Vector:
+    """
+    Accumulate with the augmented assignment operator, which mutates the components directly.
+    """
+    for _ in range(repeats):
+        accumulator += increment
+    return accumulator
+
+
+def measure(
+    accumulate: Callable[[Vector, Vector, int], Vector],
+) -> Tuple[float, int, int]:
+    """
+    Time an accumulation loop, then run two iterations of it under `tracemalloc`. The timing
+    run is kept separate because tracing every float allocation distorts the elapsed time.
+    Snapshots only see the memory blocks still alive, so the allocations are counted while
+    the result of the loop is still referenced, and temporary objects freed within an
+    iteration only show up in the peak.
+
+    Parameters
+    ----------
+    accumulate : Callable[[Vector, Vector, int], Vector]
+        The accumulation loop to measure.
+
+    Returns
+    -------
+    Tuple[float, int, int]
+        The elapsed time in seconds, the number of memory blocks allocated by the loop that are
+        still alive at its end, and the peak memory allocated by the loop in bytes, on top of
+        the two input vectors.
+    """
+    accumulator = Vector(range(dimension))
+    increment = Vector(range(dimension))
+    start = time.perf_counter()
+    accumulate(accumulator, increment, iterations)
+    elapsed = time.perf_counter() - start
+
+    accumulator = Vector(range(dimension))
+    increment = Vector(range(dimension))
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot().filter_traces(snapshot_filters)
+    result = accumulate(accumulator, increment, 2)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot().filter_traces(snapshot_filters)
+    tracemalloc.stop()
+    allocations = sum(
+        stat.count_diff
+        for stat in after.compare_to(before, "lineno")
+        if stat.count_diff > 0
+    )
+    del result
+    return elapsed, allocations, peak
+
+
+def main() -> int:
+    print(f"Accumulating {iterations} times into a vector of {dimension:,} elements")
+    for use_numpy in (False, True) if Vector.use_numpy else (False,):
+        Vector.use_numpy = use_numpy
+        engine = "numpy" if use_numpy else "python"
+        for accumulate in (out_of_place, in_place):
+            elapsed, allocations, peak = measure(accumulate)
+            print(
+                f"{engine:>6} | {accumulate.__name__:<12} | {elapsed:.3f} seconds | "
+                f"{allocations:>3} allocations | peak allocated {peak / 1024**2:,.1f} MiB"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+from vector import Vector
+
+dimension = 5_000_000
+
+
+def eager(v1: Vector, v2: Vector, v3: Vector) -> Vector:
+    """
+    Evaluate the expression one operator at a time, materializing every intermediate vector.
+    """
+    return (v1 + v2) * 3 - v3 / 2
+
+
+def lazy(v1: Vector, v2: Vector, v3: Vector) -> Vector:
+    """
+    Build an expression graph and evaluate it in a single chunked pass.
+    """
+    return ((v1.lazy() + v2) * 3 - v3.lazy() / 2).evaluate()
+
+
+def measure(
+    evaluate: Callable[[Vector, Vector, Vector], Vector],
+    vectors: Tuple[Vector, Vector, Vector],
+) -> Tuple[float, int]:
+    """
+    Time an evaluation, then run it again under `tracemalloc`.
+
+    Parameters
+    ----------
+    evaluate : Callable[[Vector, Vector, Vector], Vector]
+        The evaluation strategy to measure.
+    vectors : Tuple[Vector, Vector, Vector]
+        The input vectors.
+
+    Returns
+    -------
+    Tuple[float, int]
+        The elapsed time in seconds and the peak memory allocated in bytes, including the result.
+    """
+    start = time.perf_counter()
+    evaluate(*vectors)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    evaluate(*vectors)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> int:
+    vectors = (
+        Vector(range(dimension)),
+        Vector(range(dimension)),
+        Vector(range(dimension)),
+    )
+    result_size = dimension * vectors[0]._components.itemsize
+    print(f"(v1 + v2) * 3 - v3 / 2 with vectors of {dimension:,} elements")
+    print(f"The result alone takes {result_size / 1024**2:,.1f} MiB")
+    for use_numpy in (False, True) if Vector.use_numpy else (False,):
+        Vector.use_numpy = use_numpy
+        engine = "numpy" if use_numpy else "python"
+        for evaluate in (eager, lazy):
+            elapsed, peak = measure(evaluate, vectors)
+            print(
+                f"{engine:>6} | {evaluate.__name__:<5} | {elapsed:.3f} seconds | "
+                f"peak allocated {peak / 1024**2:,.1f} MiB"
+            )
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
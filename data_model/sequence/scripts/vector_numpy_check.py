@@ -0,0 +1,89 @@
+import random
+from operator import ifloordiv, imul, itruediv
+from typing import Any, Callable, Dict
+
+from vector import Vector
+
+dimension = 10_000
+seed = 0
+
+
+def evaluate(operation: Callable[[], Any], use_numpy: bool) -> Any:
+    """
+    Evaluate an operation on the NumPy or on the pure-Python path.
+
+    Parameters
+    ----------
+    operation : Callable[[], Any]
+        The operation to evaluate.
+    use_numpy : bool
+        Whether the operators run as NumPy kernels.
+
+    Returns
+    -------
+    Any
+        The result of the operation, as bytes for vectors so that equal results are bit-identical.
+    """
+    previous = Vector.use_numpy
+    Vector.use_numpy = use_numpy
+    try:
+        result = operation()
+    finally:
+        Vector.use_numpy = previous
+    if isinstance(result, Vector):
+        return result.typecode, bytes(result)
+    return result
+
+
+def in_place(operator_func: Callable, vector: Vector, operand: Any) -> Vector:
+    """
+    Apply an in-place operator to a copy of a vector, leaving the vector itself untouched.
+    """
+    return operator_func(+vector, operand)
+
+
+def main() -> int:
+    if not Vector.use_numpy:
+        print("NumPy is not installed, only the pure-Python path is available")
+        return 0
+    rng = random.Random(seed)
+    bases = Vector([rng.uniform(0, 100) for _ in range(dimension)])
+    exponents = [rng.uniform(-3, 3) for _ in range(100)]
+    # NumPy would compute these in float32, the pure-Python path in doubles
+    singles = Vector([rng.uniform(0, 1) for _ in range(dimension)], "f")
+    other_singles = Vector([rng.uniform(0.5, 1) for _ in range(dimension)], "f")
+    # Rounded to float32, these differ from the Python floats they are compared with
+    edges = Vector([0.1, 0.2, 0.3], "f")
+    operations: Dict[str, Callable[[], Any]] = {
+        "v ** x": lambda: b"".join(bytes(bases**exponent) for exponent in exponents),
+        "v ** 2": lambda: bases**2,
+        "lazy v ** x": lambda: (bases.lazy() ** exponents[0]).evaluate(),
+        "f > x": lambda: edges > 0.1,
+        "f <= x": lambda: edges <= 0.2,
+        "f > f": lambda: singles > other_singles,
+        "f * x": lambda: singles * 0.1,
+        "f / x": lambda: singles / 0.3,
+        "f // x": lambda: singles // 0.03,
+        "f / f": lambda: singles / other_singles,
+        "f // f": lambda: singles // (other_singles * 0.01),
+        "f *= x": lambda: in_place(imul, singles, 0.1),
+        "f /= x": lambda: in_place(itruediv, singles, 0.3),
+        "f //= f": lambda: in_place(ifloordiv, singles, other_singles * 0.01),
+        "lazy f * x": lambda: (singles.lazy() * 0.1 - other_singles).evaluate(),
+        "lazy f > x": lambda: (edges.lazy() > 0.1).evaluate(),
+    }
+
+    print(
+        f"Comparing the NumPy and pure-Python paths on vectors of {dimension:,} elements"
+    )
+    mismatches = 0
+    for name, operation in operations.items():
+        same = evaluate(operation, True) == evaluate(operation, False)
+        mismatches += not same
+        print(f"{name:<12} | {'identical' if same else 'DIFFERENT'}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import math
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from vector import Vector
+
+dimension = 20_000_000
+# The chunked `@` and `abs` sum in a different order than the serial path, so their results
+# are only compared up to this relative tolerance, while `==` and `hash` must be equal
+rel_tol = 1e-12
+
+
+def measure(reduction: Callable[[], Any]) -> Tuple[float, Any]:
+    """
+    Time a single call of a reduction.
+
+    Parameters
+    ----------
+    reduction : Callable[[], Any]
+        The reduction to time.
+
+    Returns
+    -------
+    Tuple[float, Any]
+        The elapsed time in seconds and the result of the reduction.
+    """
+    start = time.perf_counter()
+    result = reduction()
+    return time.perf_counter() - start, result
+
+
+def main() -> int:
+    lhs = Vector(range(dimension))
+    rhs = Vector(range(dimension))
+    reductions: Dict[str, Callable[[], Any]] = {
+        "v @ w": lambda: lhs @ rhs,
+        "abs(v)": lambda: abs(lhs),
+        "v == w": lambda: lhs == rhs,
+        "hash(v)": lambda: hash(lhs),
+    }
+    workers = os.cpu_count() or 1
+    # The serial path, then the chunked engine on one worker and on every core
+    engines = {
+        "serial": (sys.maxsize, 1),
+        "chunked x1": (Vector.parallel_threshold, 1),
+        f"chunked x{workers}": (Vector.parallel_threshold, workers),
+    }
+
+    print(f"Reducing vectors of {dimension:,} elements")
+    mismatches = 0
+    for name, reduction in reductions.items():
+        expected = None
+        for engine, (threshold, count) in engines.items():
+            Vector.parallel_threshold = threshold
+            Vector.workers = count
+            elapsed, result = measure(reduction)
+            if expected is None:
+                expected = result
+            if isinstance(result, float):
+                same = math.isclose(result, expected, rel_tol=rel_tol)
+            else:
+                same = result == expected
+            mismatches += not same
+            print(
+                f"{name:<8} | {engine:<12} | {elapsed:.3f} seconds | "
+                f"{result!r}{'' if same else ' (DIFFERENT)'}"
+            )
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import sys
+import time
+
+from vector import TYPECODES, Vector
+
+dimension = 10_000_000
+
+
+def main() -> int:
+    print(f"Vectors of {dimension:,} elements")
+    baseline = None
+    for typecode in ("d", *(typecode for typecode in TYPECODES if typecode != "d")):
+        vector = Vector(range(dimension), typecode)
+        # Size of the underlying array, including its buffer
+        size = sys.getsizeof(vector._components)
+        baseline = baseline or size
+
+        start = time.perf_counter()
+        result = vector + vector
+        elapsed = time.perf_counter() - start
+
+        print(
+            f"typecode {typecode!r} | {vector._components.itemsize} bytes per element | "
+            f"{size / 1024**2:,.1f} MiB ({size / baseline:.0%} of 'd') | "
+            f"v + v in {elapsed:.3f} seconds -> typecode {result.typecode!r}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
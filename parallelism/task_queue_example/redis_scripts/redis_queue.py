@@ -1,6 +1,221 @@
-import pickle
+import json
+import os
+import socket
+import struct
+import time
 import uuid
-from typing import Any, Callable, Tuple
+import zlib
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from redis_queue_metrics import QueueMetrics
+
+# Wire format header: the 16 raw bytes of the task UUID, the 32-bit ID of the registered callable and the
+# time the task is ready at, followed by the JSON-encoded arguments
+TASK_HEADER = struct.Struct("<16sId")
+# Reused for every task and result, `json.dumps` and `json.loads` on bytes do extra work on every call
+json_encoder = json.JSONEncoder(separators=(",", ":"))
+json_decoder = json.JSONDecoder()
+
+
+# Requeue the tasks left in the processing list of a dead worker, or move those that were already
+# reclaimed `max_retries` times to the dead-letter list. The task ID is the first 16 bytes of a task.
+# Nothing is done if the heartbeat of the worker is alive, checked here so that it cannot come back
+# between the check and the drain. The newest tasks are at the head of the processing list, so popping
+# from the head and pushing to the tail of the queue leaves the oldest task to be dequeued first.
+# KEYS: processing list, queue, dead-letter list, retries hash, workers set, heartbeat key
+# ARGV: max_retries, worker ID
+RECLAIM_SCRIPT = """
+if redis.call('EXISTS', KEYS[6]) == 1 then
+    return {0, 0}
+end
+local requeued, dead = 0, 0
+local serialized_task = redis.call('LPOP', KEYS[1])
+while serialized_task do
+    local task_id = string.sub(serialized_task, 1, 16)
+    if redis.call('HINCRBY', KEYS[4], task_id, 1) > tonumber(ARGV[1]) then
+        redis.call('HDEL', KEYS[4], task_id)
+        redis.call('LPUSH', KEYS[3], serialized_task)
+        dead = dead + 1
+    else
+        redis.call('RPUSH', KEYS[2], serialized_task)
+        requeued = requeued + 1
+    end
+    serialized_task = redis.call('LPOP', KEYS[1])
+end
+redis.call('SREM', KEYS[5], ARGV[2])
+return {requeued, dead}
+"""
+
+
+# Move the delayed tasks whose ETA has passed from each scheduled set to the tail of its list, in
+# ETA order, at most ARGV[2] per set
+# KEYS: scheduled set and list of each priority level, interleaved
+# ARGV: current time, maximum number of tasks moved per set
+SCHEDULE_SCRIPT = """
+local moved = 0
+for i = 1, #KEYS, 2 do
+    local due = redis.call('ZRANGEBYSCORE', KEYS[i], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+    if #due > 0 then
+        redis.call('ZREM', KEYS[i], unpack(due))
+        redis.call('LPUSH', KEYS[i + 1], unpack(due))
+        moved = moved + #due
+    end
+end
+return moved
+"""
+
+# Pop up to ARGV[1] tasks from the lists in order, so the more urgent lists are drained first
+# KEYS: lists from the most to the least urgent
+# ARGV: maximum number of tasks popped
+POP_SCRIPT = """
+local popped = {}
+for _, key in ipairs(KEYS) do
+    local needed = tonumber(ARGV[1]) - #popped
+    if needed <= 0 then
+        break
+    end
+    local serialized_tasks = redis.call('RPOP', key, needed)
+    if serialized_tasks then
+        for _, serialized_task in ipairs(serialized_tasks) do
+            table.insert(popped, serialized_task)
+        end
+    end
+end
+return popped
+"""
+
+# Same as POP_SCRIPT, but each task is moved into a processing list instead of being removed
+# KEYS: processing list, then the lists from the most to the least urgent
+# ARGV: maximum number of tasks moved
+MOVE_SCRIPT = """
+local moved = {}
+for i = 2, #KEYS do
+    while #moved < tonumber(ARGV[1]) do
+        local serialized_task = redis.call('LMOVE', KEYS[i], KEYS[1], 'RIGHT', 'LEFT')
+        if not serialized_task then
+            break
+        end
+        table.insert(moved, serialized_task)
+    end
+end
+return moved
+"""
+
+
+class TaskFailedError(Exception):
+    """
+    Raised when getting the result of a task that raised an exception in the worker.
+    """
+
+
+class TaskRegistry(object):
+    """
+    Maps the callables that can be enqueued to compact 32-bit IDs, so that a task carries an integer
+    instead of a pickled reference that every worker resolves by import. The ID is the CRC-32 of the
+    qualified name of the callable, so it is the same in every process that registers it, as long as
+    the callable is imported from the same module (i.e., not defined in `__main__`).
+    """
+
+    def __init__(self) -> None:
+        self.callables: Dict[int, Callable] = {}
+        self.ids: Dict[Callable, int] = {}
+
+    @staticmethod
+    def callable_id(task_callable: Callable) -> int:
+        """
+        Compute the ID of a callable.
+
+        Parameters
+        ----------
+        task_callable : Callable
+            The function or callable object.
+
+        Returns
+        -------
+        int
+            The CRC-32 of `module.qualname`.
+        """
+        name = f"{task_callable.__module__}.{task_callable.__qualname__}"
+        return zlib.crc32(name.encode())
+
+    def register(self, task_callable: Callable) -> Callable:
+        """
+        Register a callable, which can also be used as a decorator.
+
+        Parameters
+        ----------
+        task_callable : Callable
+            The function or callable object to register.
+
+        Returns
+        -------
+        Callable
+            The callable, unchanged.
+
+        Raises
+        ------
+        ValueError
+            If another callable is already registered with the same ID.
+        """
+        callable_id = self.callable_id(task_callable)
+        registered = self.callables.setdefault(callable_id, task_callable)
+        if registered is not task_callable:
+            raise ValueError(
+                f"{task_callable!r} has the same callable ID as {registered!r}, rename one of them"
+            )
+        self.ids[task_callable] = callable_id
+        return task_callable
+
+    def id_of(self, task_callable: Callable) -> int:
+        """
+        Look up the ID of a callable, registering it on first use.
+
+        Parameters
+        ----------
+        task_callable : Callable
+            The function or callable object.
+
+        Returns
+        -------
+        int
+            The ID of the callable.
+        """
+        try:
+            return self.ids[task_callable]
+        except KeyError:
+            self.register(task_callable)
+            return self.ids[task_callable]
+
+    def resolve(self, callable_id: int) -> Callable:
+        """
+        Look up a registered callable by its ID.
+
+        Parameters
+        ----------
+        callable_id : int
+            The ID of the callable.
+
+        Returns
+        -------
+        Callable
+            The registered callable.
+
+        Raises
+        ------
+        LookupError
+            If no callable is registered with this ID in this process.
+        """
+        try:
+            return self.callables[callable_id]
+        except KeyError:
+            raise LookupError(
+                f"No task is registered with ID {callable_id}, register it in the worker"
+            )
+
+
+# The registry shared by the queues of this process
+task_registry = TaskRegistry()
 
 
 class SimpleTask(object):
@@ -8,7 +223,13 @@ class SimpleTask(object):
     Represents a task that can be enqueued and processed later.
     """
 
-    def __init__(self, task_callable: Callable, *args) -> None:
+    def __init__(
+        self,
+        task_callable: Callable,
+        *args,
+        task_id: Optional[str] = None,
+        ready_at: Optional[float] = None,
+    ) -> None:
         """
         Initializes a new instance of the SimpleTask class.
 
@@ -18,8 +239,13 @@ class SimpleTask(object):
             The function or callable object to execute when the task is processed.
         args : Tuple[Any]
             Positional arguments to pass to the callable when executed.
+        task_id : Optional[str]
+            The ID of the task as 32 hexadecimal digits, a new random UUID by default.
+        ready_at : Optional[float]
+            The UNIX time the task can start at, its ETA if it is delayed, the current time by default.
         """
-        self.id: str = str(uuid.uuid4())
+        self.id: str = task_id or uuid.uuid4().hex
+        self.ready_at: float = time.time() if ready_at is None else ready_at
         self.task_callable: Callable = task_callable
         self.args: Tuple[Any] = args
 
@@ -34,27 +260,441 @@ class SimpleTask(object):
         """
         return self.task_callable(*self.args)
 
+    def serialize(self, registry: TaskRegistry = task_registry) -> bytes:
+        """
+        Encode the task in the compact wire format, registering its callable if needed.
+
+        Parameters
+        ----------
+        registry : TaskRegistry
+            The registry the callable is registered in.
+
+        Returns
+        -------
+        bytes
+            The `TASK_HEADER` followed by the arguments as compact JSON.
+
+        Raises
+        ------
+        TypeError
+            If an argument cannot be encoded as JSON.
+        """
+        header = TASK_HEADER.pack(
+            bytes.fromhex(self.id), registry.id_of(self.task_callable), self.ready_at
+        )
+        return header + json_encoder.encode(self.args).encode()
+
+    @classmethod
+    def deserialize(
+        cls, serialized_task: bytes, registry: TaskRegistry = task_registry
+    ) -> "SimpleTask":
+        """
+        Decode a task from the compact wire format.
+
+        Parameters
+        ----------
+        serialized_task : bytes
+            The output of `serialize`.
+        registry : TaskRegistry
+            The registry the callable is resolved from.
+
+        Returns
+        -------
+        SimpleTask
+            The decoded task.
+        """
+        uuid_bytes, callable_id, ready_at = TASK_HEADER.unpack_from(serialized_task)
+        args = json_decoder.decode(serialized_task[TASK_HEADER.size :].decode())
+        return cls(
+            registry.resolve(callable_id),
+            *args,
+            task_id=uuid_bytes.hex(),
+            ready_at=ready_at,
+        )
+
 
-class SimpleQueue(object):
+class AsyncResult(object):
     """
-    Represents a simple queue system for enqueuing and dequeuing tasks using Redis.
+    A handle on the result of an enqueued task, which can be waited on without polling.
     """
 
-    def __init__(self, connection, name: str) -> None:
+    def __init__(self, queue: "SimpleQueue", task_id: str) -> None:
         """
-        Initialize the SimpleQueue instance.
+        Initialize the AsyncResult instance.
 
         Parameters
         ----------
-        connection : Redis
+        queue : SimpleQueue
+            The queue the task was enqueued to.
+        task_id : str
+            The ID of the task.
+        """
+        self.queue: "SimpleQueue" = queue
+        self.task_id: str = task_id
+
+    def ready(self) -> bool:
+        """
+        Check whether the task has finished, without blocking.
+
+        Returns
+        -------
+        bool
+            True if the result of the task is stored.
+        """
+        return bool(self.queue.connection.exists(self.queue.result_key(self.task_id)))
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        Wait for the task to finish and return its result.
+
+        Parameters
+        ----------
+        timeout : Optional[float]
+            The maximum number of seconds to wait for, None waits indefinitely.
+
+        Returns
+        -------
+        Any
+            The return value of the task.
+
+        Raises
+        ------
+        TimeoutError
+            If the task did not finish within `timeout` seconds.
+        TaskFailedError
+            If the task raised an exception.
+        """
+        return self.queue.get_many([self.task_id], timeout)[0]
+
+
+class BaseQueue(object):
+    """
+    The key naming and the pipeline building shared by SimpleQueue and AsyncSimpleQueue. The methods
+    below only buffer commands in a pipeline (or send them with a sync connection), and each subclass
+    executes the pipeline with its own client, so the sync and async clients and workers of a queue
+    always agree on its keys, wire format and result records.
+
+    Each of the `priority_levels` levels has its own list, and workers always drain the lists of the
+    more urgent levels first, so interactive tasks do not wait behind a backlog of batch tasks. Delayed
+    tasks wait in a sorted set keyed by their ETA, and are moved to the tail of their list by
+    `SCHEDULE_SCRIPT` in the same round trip as a dequeue, at most once every `schedule_interval`
+    seconds.
+    """
+
+    # Maximum number of due tasks moved from each scheduled set at once
+    schedule_batch_size = 1000
+    # Minimum number of seconds between two moves of the due tasks by the same instance
+    schedule_interval = 1.0
+
+    def __init__(
+        self,
+        connection,
+        name: str,
+        registry: TaskRegistry = task_registry,
+        result_ttl: int = 86400,
+        priority_levels: int = 1,
+        metrics: Optional[QueueMetrics] = None,
+    ) -> None:
+        """
+        Initialize the keys of the queue.
+
+        Parameters
+        ----------
+        connection : Redis or redis.asyncio.Redis
             The Redis connection interface.
         name : str
             The name of the queue.
+        registry : TaskRegistry
+            The registry used to encode and resolve the task callables.
+        result_ttl : int
+            The number of seconds the result of a task is kept for.
+        priority_levels : int
+            The number of priority levels, from 0 (the default, least urgent) to `priority_levels - 1`.
+        metrics : Optional[QueueMetrics]
+            The metrics the wait time, execution time and outcome of the processed tasks are recorded in.
         """
         self.connection = connection
         self.name: str = name
+        self.registry: TaskRegistry = registry
+        self.metrics: Optional[QueueMetrics] = metrics
+        self.result_ttl: int = result_ttl
+        self.result_channel: str = f"{name}:results"
+        self.priority_levels: int = priority_levels
+        # From the most to the least urgent, the lists are polled in this order
+        self.priority_lists: List[str] = [
+            self.list_of(priority) for priority in reversed(range(priority_levels))
+        ]
+        self.scheduled_sets: List[str] = [
+            f"{key}:scheduled" for key in self.priority_lists
+        ]
+        self.next_schedule: float = 0.0
+
+    def list_of(self, priority: int) -> str:
+        """
+        Get the list holding the tasks of a priority level.
+
+        Parameters
+        ----------
+        priority : int
+            The priority level.
+
+        Returns
+        -------
+        str
+            The key of the list, the name of the queue for priority 0.
+
+        Raises
+        ------
+        ValueError
+            If the priority is not one of the levels of the queue.
+        """
+        if not 0 <= priority < self.priority_levels:
+            raise ValueError(
+                f"priority must be in [0, {self.priority_levels}), got {priority}"
+            )
+        return self.name if priority == 0 else f"{self.name}:priority:{priority}"
+
+    def result_key(self, task_id: str) -> str:
+        """
+        Get the key the result of a task is stored under.
+
+        Parameters
+        ----------
+        task_id : str
+            The ID of the task.
+
+        Returns
+        -------
+        str
+            The result key of the task.
+        """
+        return f"{self.name}:result:{task_id}"
+
+    def _push_many(
+        self,
+        pipeline,
+        task_callable: Callable,
+        args_list: Iterable[Tuple[Any, ...]],
+        batch_size: int,
+        priority: int,
+        delay: float,
+    ) -> List[str]:
+        """
+        Buffer one multi-value push per batch of `batch_size` tasks in `pipeline`, see `enqueue_many`.
+
+        Parameters
+        ----------
+        pipeline : Pipeline
+            The pipeline the commands are buffered in.
+        task_callable : Callable
+            The task to enqueue.
+        args_list : Iterable[Tuple[Any, ...]]
+            The arguments of each task.
+        batch_size : int
+            The maximum number of tasks pushed by a single `LPUSH`.
+        priority : int
+            The priority level of the tasks.
+        delay : float
+            The number of seconds before the tasks can be dequeued.
+
+        Returns
+        -------
+        List[str]
+            The IDs of the tasks, in the order they were enqueued.
+        """
+        task_ids: List[str] = []
+        ready_at = time.time() + delay
+        tasks = (
+            SimpleTask(task_callable, *args, ready_at=ready_at) for args in args_list
+        )
+        while batch := list(islice(tasks, batch_size)):
+            self._push(
+                pipeline,
+                [task.serialize(self.registry) for task in batch],
+                priority,
+                delay,
+            )
+            task_ids.extend(task.id for task in batch)
+        return task_ids
+
+    def _push(
+        self, client, serialized_tasks: List[bytes], priority: int, delay: float
+    ) -> None:
+        """
+        Push tasks to the list of their priority level, or to its scheduled set if they are delayed.
+
+        Parameters
+        ----------
+        client : Redis or Pipeline
+            The connection or pipeline the command is sent with.
+        serialized_tasks : List[bytes]
+            The tasks to push.
+        priority : int
+            The priority level of the tasks.
+        delay : float
+            The number of seconds before the tasks can be dequeued.
+        """
+        key = self.list_of(priority)
+        if delay > 0:
+            # The ETA is the score, the clocks of the clients and workers are assumed to be in sync
+            eta = time.time() + delay
+            client.zadd(f"{key}:scheduled", dict.fromkeys(serialized_tasks, eta))
+        else:
+            # LPUSH inserts the values from left to right, so RPOP still returns them in FIFO order
+            client.lpush(key, *serialized_tasks)
+
+    def _schedule(self, pipeline) -> None:
+        """
+        Buffer the script that moves the due delayed tasks to their lists in `pipeline`, unless it was
+        already sent in the last `schedule_interval` seconds. It is sent with `EVAL` rather than `EVALSHA`,
+        since a pipeline checks that its registered scripts exist with an extra round trip on every
+        execution.
+
+        Parameters
+        ----------
+        pipeline : Pipeline
+            The pipeline the command is buffered in.
+        """
+        now = time.monotonic()
+        if now < self.next_schedule:
+            return
+        self.next_schedule = now + self.schedule_interval
+        keys = [
+            key
+            for pair in zip(self.scheduled_sets, self.priority_lists)
+            for key in pair
+        ]
+        pipeline.eval(
+            SCHEDULE_SCRIPT, len(keys), *keys, time.time(), self.schedule_batch_size
+        )
+
+    def _pop(self, pipeline, count: int) -> None:
+        """
+        Buffer the command that pops up to `count` tasks in priority, then FIFO order in `pipeline`. Its
+        reply is a list of tasks, or a nil when the queue is empty. See
+        `https://redis.io/docs/latest/commands/rpop/` for an example, the `count` argument requires Redis
+        6.2 or later.
+
+        Parameters
+        ----------
+        pipeline : Pipeline
+            The pipeline the command is buffered in.
+        count : int
+            The maximum number of tasks to pop.
+        """
+        if self.priority_levels == 1:
+            pipeline.rpop(self.name, count)
+        else:
+            pipeline.eval(
+                POP_SCRIPT, len(self.priority_lists), *self.priority_lists, count
+            )
+
+    def _store(self, pipeline, task_id: str, record: str) -> None:
+        """
+        Buffer the commands that store the result record of a task and publish its ID in `pipeline`.
+
+        Parameters
+        ----------
+        pipeline : Pipeline
+            The pipeline the commands are buffered in.
+        task_id : str
+            The ID of the task.
+        record : str
+            The result record, see `_record`.
+        """
+        pipeline.set(self.result_key(task_id), record, ex=self.result_ttl)
+        pipeline.publish(self.result_channel, task_id)
 
-    def enqueue(self, task_callable: Callable, *args) -> str:
+    @staticmethod
+    def _record(result: Any = None, error: Optional[Exception] = None) -> str:
+        """
+        Encode the result record of a task, read back by `SimpleQueue.get_many`.
+
+        Parameters
+        ----------
+        result : Any
+            The return value of the task.
+        error : Optional[Exception]
+            The exception raised by the task, if any, stored in place of the result.
+
+        Returns
+        -------
+        str
+            The record as compact JSON.
+        """
+        if error is not None:
+            return json_encoder.encode({"error": f"{type(error).__name__}: {error}"})
+        return json_encoder.encode({"result": result})
+
+    def _reject(self, serialized_task: bytes, error: Exception, pipeline) -> None:
+        """
+        Buffer the commands that fail a task that cannot be decoded in `pipeline`, e.g., because its
+        arguments are not valid JSON or its callable is not registered in this worker. As for a task
+        that raised, the error is stored in place of the result and the ID of the task is published, so
+        clients waiting for it fail instead of timing out. A task too short to hold a header has no ID,
+        so nothing can be stored for it.
+
+        Parameters
+        ----------
+        serialized_task : bytes
+            The task, as it was dequeued.
+        error : Exception
+            The exception raised while decoding the task.
+        pipeline : Pipeline
+            The pipeline the commands are buffered in.
+        """
+        try:
+            uuid_bytes, _, ready_at = TASK_HEADER.unpack_from(serialized_task)
+        except struct.error:
+            return
+        if self.metrics is not None:
+            self.metrics.observe_task(time.time() - ready_at, 0.0, True)
+        self._store(pipeline, uuid_bytes.hex(), self._record(error=error))
+
+    def _size(self, pipeline) -> None:
+        """
+        Buffer the commands that get the length of the list of each priority level in `pipeline`, the
+        size of the queue is the sum of their replies. See `https://redis.io/docs/latest/commands/llen/`
+        for an example.
+
+        Parameters
+        ----------
+        pipeline : Pipeline
+            The pipeline the commands are buffered in.
+        """
+        for key in self.priority_lists:
+            pipeline.llen(key)
+
+
+class SimpleQueue(BaseQueue):
+    """
+    Represents a simple queue system for enqueuing and dequeuing tasks using Redis.
+
+    The result of each task is stored by the worker under its own key for `result_ttl` seconds, and
+    the ID of the task is published on the `results` channel of the queue, so clients can wait for
+    results with `get_many` or `AsyncResult.get` instead of polling. See `BaseQueue` for the priority
+    levels and the delayed tasks.
+    """
+
+    def result(self, task_id: str) -> AsyncResult:
+        """
+        Get a handle on the result of a task.
+
+        Parameters
+        ----------
+        task_id : str
+            The ID of the task.
+
+        Returns
+        -------
+        AsyncResult
+            The handle on the result of the task.
+        """
+        return AsyncResult(self, task_id)
+
+    def enqueue(
+        self, task_callable: Callable, *args, priority: int = 0, delay: float = 0
+    ) -> str:
         """
         Enqueue a task to the queue. See `https://redis.io/docs/latest/commands/lpush/` for an example.
 
@@ -64,40 +704,573 @@ class SimpleQueue(object):
             The task to enqueue.
         args : Tuple[Any]
             The arguments to pass to the task.
+        priority : int
+            The priority level of the task.
+        delay : float
+            The number of seconds before the task can be dequeued.
 
         Returns
         -------
         str
             The ID of the task.
         """
-        task = SimpleTask(task_callable, *args)
-        serialized_task = pickle.dumps(task, protocol=pickle.HIGHEST_PROTOCOL)
+        task = SimpleTask(task_callable, *args, ready_at=time.time() + delay)
+        serialized_task = task.serialize(self.registry)
         # Enqueue the task to the queue
-        self.connection.lpush(self.name, serialized_task)
+        self._push(self.connection, [serialized_task], priority, delay)
         return task.id
 
-    def dequeue(self) -> SimpleTask:
+    def enqueue_many(
+        self,
+        task_callable: Callable,
+        args_list: Iterable[Tuple[Any, ...]],
+        batch_size: int = 1000,
+        priority: int = 0,
+        delay: float = 0,
+    ) -> List[str]:
         """
-        Dequeue a task from the queue. See `https://redis.io/docs/latest/commands/brpop/` for an example.
+        Enqueue one task per tuple of arguments. Each batch of `batch_size` tasks is pushed by a single
+        multi-value `LPUSH`, and all the batches are sent in one pipeline, so the whole call costs a single
+        round trip. See `https://redis.io/docs/latest/develop/use/pipelining/` for an example.
+
+        Parameters
+        ----------
+        task_callable : Callable
+            The task to enqueue.
+        args_list : Iterable[Tuple[Any, ...]]
+            The arguments of each task.
+        batch_size : int
+            The maximum number of tasks pushed by a single `LPUSH`.
+        priority : int
+            The priority level of the tasks.
+        delay : float
+            The number of seconds before the tasks can be dequeued.
 
         Returns
         -------
-        SimpleTask
-            The task that was dequeued and processed.
+        List[str]
+            The IDs of the tasks, in the order they were enqueued.
+        """
+        # A pipeline without MULTI/EXEC only buffers the commands, atomicity is not needed here
+        pipeline = self.connection.pipeline(transaction=False)
+        task_ids = self._push_many(
+            pipeline, task_callable, args_list, batch_size, priority, delay
+        )
+        pipeline.execute()
+        return task_ids
+
+    def dequeue(self, timeout: float = 0) -> Optional[SimpleTask]:
+        """
+        Dequeue a task from the queue. `BRPOP` pops from the first non-empty list in priority order. See
+        `https://redis.io/docs/latest/commands/brpop/` for an example.
+
+        Parameters
+        ----------
+        timeout : float
+            The maximum number of seconds to block for while the queue is empty, 0 blocks indefinitely.
+            Delayed tasks that become due in the meantime are only moved by a later dequeue.
+
+        Returns
+        -------
+        Optional[SimpleTask]
+            The task that was dequeued and processed, or None if the timeout expired first or the task
+            could not be decoded.
         """
         # Dequeue the task from the queue
-        _, serialized_task = self.connection.brpop(self.name)
-        task = pickle.loads(serialized_task)
-        task.process_task()
-        return task
+        pipeline = self.connection.pipeline(transaction=False)
+        self._schedule(pipeline)
+        pipeline.brpop(self.priority_lists, timeout=timeout)
+        reply = pipeline.execute()[-1]
+        if reply is None:
+            return None
+        _, serialized_task = reply
+        tasks = self._process_tasks([serialized_task])
+        return tasks[0] if tasks else None
+
+    def dequeue_many(self, count: int) -> List[SimpleTask]:
+        """
+        Dequeue up to `count` tasks in one round trip and process them in priority, then FIFO order. Unlike
+        `dequeue`, this does not block when the queue is empty.
+
+        Parameters
+        ----------
+        count : int
+            The maximum number of tasks to dequeue.
+
+        Returns
+        -------
+        List[SimpleTask]
+            The tasks that were dequeued and processed, empty if the queue was empty.
+        """
+        pipeline = self.connection.pipeline(transaction=False)
+        self._schedule(pipeline)
+        self._pop(pipeline, count)
+        serialized_tasks: Optional[List[bytes]] = pipeline.execute()[-1]
+        # RPOP with a count replies with a nil instead of an empty list when the queue is empty
+        return self._process_tasks(serialized_tasks or [])
+
+    def _process_tasks(self, serialized_tasks: List[bytes]) -> List[SimpleTask]:
+        """
+        Process dequeued tasks in order. The result of each task is stored and the task acknowledged in
+        one round trip as soon as it finishes, so if the worker dies in the middle of a batch, the results
+        of the finished tasks are kept and only the unfinished tasks are reclaimed. A task that cannot be
+        decoded is rejected on its own, so it neither drops the rest of the batch nor stops the worker.
+
+        Parameters
+        ----------
+        serialized_tasks : List[bytes]
+            The tasks, as they were dequeued.
+
+        Returns
+        -------
+        List[SimpleTask]
+            The tasks that were processed, without the rejected ones.
+        """
+        tasks = []
+        for serialized_task in serialized_tasks:
+            pipeline = self.connection.pipeline(transaction=False)
+            try:
+                task = SimpleTask.deserialize(serialized_task, self.registry)
+            except Exception as error:
+                self._reject(serialized_task, error, pipeline)
+            else:
+                self._process_task(task, pipeline)
+                self._acknowledge(serialized_task, pipeline)
+                tasks.append(task)
+            pipeline.execute()
+        return tasks
+
+    def _process_task(self, task: SimpleTask, pipeline) -> None:
+        """
+        Process a task and buffer the commands that store its result and publish its ID in `pipeline`.
+        An exception raised by the task is stored in place of the result, so it does not stop the worker.
+
+        Parameters
+        ----------
+        task : SimpleTask
+            The task to process.
+        pipeline : Pipeline
+            The pipeline the commands are buffered in.
+        """
+        wait = time.time() - task.ready_at
+        start = time.perf_counter()
+        try:
+            record = self._record(task.process_task())
+            failed = False
+        except Exception as error:
+            record = self._record(error=error)
+            failed = True
+        if self.metrics is not None:
+            self.metrics.observe_task(wait, time.perf_counter() - start, failed)
+        self._store(pipeline, task.id, record)
+
+    def _acknowledge(self, serialized_task: bytes, pipeline) -> None:
+        """
+        Buffer the commands that mark a processed task as done in `pipeline`. Nothing is needed here,
+        since `BRPOP` and `RPOP` already removed the task from Redis.
+
+        Parameters
+        ----------
+        serialized_task : bytes
+            The task, as it was dequeued.
+        pipeline : Pipeline
+            The pipeline the commands are buffered in.
+        """
+
+    def get_many(
+        self, task_ids: Sequence[str], timeout: Optional[float] = None
+    ) -> List[Any]:
+        """
+        Wait for many tasks to finish and return their results. The client subscribes to the `results`
+        channel before reading the results already stored, so no completion can be missed, then fetches
+        the results of each burst of notifications with a single `MGET`.
+
+        Parameters
+        ----------
+        task_ids : Sequence[str]
+            The IDs of the tasks.
+        timeout : Optional[float]
+            The maximum number of seconds to wait for all the tasks, None waits indefinitely.
+
+        Returns
+        -------
+        List[Any]
+            The return values of the tasks, in the order of `task_ids`.
+
+        Raises
+        ------
+        TimeoutError
+            If some tasks did not finish within `timeout` seconds.
+        TaskFailedError
+            If a task raised an exception.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        records: Dict[str, bytes] = {}
+        pubsub = self.connection.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(self.result_channel)
+        try:
+            finished = list(dict.fromkeys(task_ids))
+            while finished:
+                values = self.connection.mget(
+                    [self.result_key(task_id) for task_id in finished]
+                )
+                records.update(
+                    (task_id, value)
+                    for task_id, value in zip(finished, values)
+                    if value is not None
+                )
+                pending = set(task_ids) - records.keys()
+                finished = []
+                while pending and not finished:
+                    remaining = None
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise TimeoutError(
+                                f"{len(pending)} of {len(task_ids)} tasks did not finish within {timeout} seconds"
+                            )
+                    # Block for the first notification, then drain the ones already received
+                    message = pubsub.get_message(timeout=remaining)
+                    while message is not None:
+                        task_id = message["data"].decode()
+                        if task_id in pending:
+                            finished.append(task_id)
+                        message = pubsub.get_message(timeout=0)
+        finally:
+            pubsub.close()
+
+        results = []
+        for task_id in task_ids:
+            record = json_decoder.decode(records[task_id].decode())
+            if "error" in record:
+                raise TaskFailedError(f"Task {task_id} failed with {record['error']}")
+            results.append(record["result"])
+        return results
 
     def size(self) -> int:
         """
-        Get the size of the queue. See `https://redis.io/docs/latest/commands/llen/` for an example.
+        Get the size of the queue, i.e., the number of tasks ready to be dequeued at every priority level.
 
         Returns
         -------
         int
             The size of the queue.
         """
-        return self.connection.llen(self.name)
+        pipeline = self.connection.pipeline(transaction=False)
+        self._size(pipeline)
+        return sum(pipeline.execute())
+
+    def scheduled_size(self) -> int:
+        """
+        Get the number of delayed tasks that were not moved to their list yet.
+
+        Returns
+        -------
+        int
+            The number of delayed tasks.
+        """
+        pipeline = self.connection.pipeline(transaction=False)
+        for key in self.scheduled_sets:
+            pipeline.zcard(key)
+        return sum(pipeline.execute())
+
+
+class ReliableQueue(SimpleQueue):
+    """
+    An at-least-once variant of SimpleQueue. A worker atomically moves each task from the queue into
+    its own processing list with `BLMOVE`, and only removes it once the result is stored, so a task is
+    never lost if the worker dies while processing it.
+
+    Each worker keeps a heartbeat key alive while it dequeues. `reclaim` requeues the tasks in the
+    processing lists of the workers whose heartbeat expired, and moves a task to the dead-letter list
+    instead once it was reclaimed more than `max_retries` times, e.g., because it keeps crashing its
+    worker. Tasks should finish well within `heartbeat_ttl` seconds, or they may be processed twice.
+    Reclaimed tasks are requeued at the head of the priority 0 list. Tasks that cannot be decoded are
+    moved to the dead-letter list as soon as they are dequeued.
+    """
+
+    # Maximum number of seconds an idle worker blocks on the priority 0 list before polling the more
+    # urgent lists again, when the queue has several priority levels
+    poll_interval = 0.5
+
+    def __init__(
+        self,
+        connection,
+        name: str,
+        worker_id: Optional[str] = None,
+        registry: TaskRegistry = task_registry,
+        result_ttl: int = 86400,
+        heartbeat_ttl: int = 60,
+        max_retries: int = 3,
+        priority_levels: int = 1,
+        metrics: Optional[QueueMetrics] = None,
+    ) -> None:
+        """
+        Initialize the ReliableQueue instance.
+
+        Parameters
+        ----------
+        connection : Redis
+            The Redis connection interface.
+        name : str
+            The name of the queue.
+        worker_id : Optional[str]
+            The unique ID of the worker using this instance, `hostname:pid` by default.
+        registry : TaskRegistry
+            The registry used to encode and resolve the task callables.
+        result_ttl : int
+            The number of seconds the result of a task is kept for.
+        heartbeat_ttl : int
+            The number of seconds after the last dequeue or acknowledgement until the worker is considered
+            dead, which must be longer than the `timeout` of `dequeue`.
+        max_retries : int
+            The number of times a task is requeued before it is moved to the dead-letter list.
+        priority_levels : int
+            The number of priority levels, from 0 (the default, least urgent) to `priority_levels - 1`.
+        metrics : Optional[QueueMetrics]
+            The metrics the wait time, execution time and outcome of the processed tasks are recorded in.
+        """
+        super().__init__(
+            connection, name, registry, result_ttl, priority_levels, metrics
+        )
+        self.worker_id: str = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.heartbeat_ttl: int = heartbeat_ttl
+        self.max_retries: int = max_retries
+        self.processing_list: str = self.processing_list_of(self.worker_id)
+        self.heartbeat_key: str = self.heartbeat_key_of(self.worker_id)
+        self.workers_key: str = f"{name}:workers"
+        self.retries_key: str = f"{name}:retries"
+        self.dead_letter_list: str = f"{name}:dead"
+        self.reclaim_script = connection.register_script(RECLAIM_SCRIPT)
+
+    def processing_list_of(self, worker_id: str) -> str:
+        """
+        Get the processing list of a worker.
+
+        Parameters
+        ----------
+        worker_id : str
+            The ID of the worker.
+
+        Returns
+        -------
+        str
+            The key of the processing list.
+        """
+        return f"{self.name}:processing:{worker_id}"
+
+    def heartbeat_key_of(self, worker_id: str) -> str:
+        """
+        Get the heartbeat key of a worker.
+
+        Parameters
+        ----------
+        worker_id : str
+            The ID of the worker.
+
+        Returns
+        -------
+        str
+            The heartbeat key.
+        """
+        return f"{self.name}:heartbeat:{worker_id}"
+
+    def _heartbeat(self, pipeline) -> None:
+        """
+        Buffer the commands that register the worker and refresh its heartbeat in `pipeline`. They are
+        sent ahead of every dequeue and acknowledgement, so they cost no extra round trip.
+
+        Parameters
+        ----------
+        pipeline : Pipeline
+            The pipeline the commands are buffered in.
+        """
+        pipeline.set(self.heartbeat_key, 1, ex=self.heartbeat_ttl)
+        pipeline.sadd(self.workers_key, self.worker_id)
+
+    def dequeue(self, timeout: float = 0) -> Optional[SimpleTask]:
+        """
+        Move a task into the processing list of the worker, then process and acknowledge it. The heartbeat
+        and the `BLMOVE` share a single round trip. See `https://redis.io/docs/latest/commands/blmove/` for
+        an example.
+
+        `BLMOVE` only blocks on a single list. With several priority levels, the lists are first polled in
+        priority order, then the worker blocks on the priority 0 list, where tasks are enqueued by default
+        and reclaimed to, for at most `poll_interval` seconds at a time, polling every list in between. A
+        more urgent task enqueued while the worker is idle thus waits for up to `poll_interval` seconds.
+
+        Parameters
+        ----------
+        timeout : float
+            The maximum number of seconds to block for while the queue is empty, 0 blocks indefinitely.
+
+        Returns
+        -------
+        Optional[SimpleTask]
+            The task that was dequeued and processed, or None if the timeout expired first or the task
+            could not be decoded.
+        """
+        pipeline = self.connection.pipeline(transaction=False)
+        self._heartbeat(pipeline)
+        self._schedule(pipeline)
+        if self.priority_levels == 1:
+            pipeline.blmove(self.name, self.processing_list, timeout, "RIGHT", "LEFT")
+            serialized_task = pipeline.execute()[-1]
+        else:
+            deadline = None if timeout == 0 else time.monotonic() + timeout
+            self._move(pipeline, 1)
+            moved = pipeline.execute()[-1]
+            serialized_task = moved[0] if moved else None
+            while serialized_task is None:
+                block = self.poll_interval
+                if deadline is not None:
+                    block = min(block, deadline - time.monotonic())
+                    if block <= 0:
+                        break
+                serialized_task = self.connection.blmove(
+                    self.name, self.processing_list, block, "RIGHT", "LEFT"
+                )
+                if serialized_task is None:
+                    pipeline = self.connection.pipeline(transaction=False)
+                    self._move(pipeline, 1)
+                    moved = pipeline.execute()[-1]
+                    serialized_task = moved[0] if moved else None
+        if serialized_task is None:
+            return None
+        tasks = self._process_tasks([serialized_task])
+        return tasks[0] if tasks else None
+
+    def dequeue_many(self, count: int) -> List[SimpleTask]:
+        """
+        Move up to `count` tasks into the processing list of the worker in one round trip, then process
+        and acknowledge them one by one in priority, then FIFO order, see `_process_tasks`. Each
+        acknowledgement refreshes the heartbeat, so `heartbeat_ttl` must cover a single task rather than
+        the whole batch. Unlike `dequeue`, this does not block when the queue is empty.
+
+        Parameters
+        ----------
+        count : int
+            The maximum number of tasks to dequeue.
+
+        Returns
+        -------
+        List[SimpleTask]
+            The tasks that were dequeued and processed, empty if the queue was empty.
+        """
+        pipeline = self.connection.pipeline(transaction=False)
+        self._heartbeat(pipeline)
+        self._schedule(pipeline)
+        self._move(pipeline, count)
+        return self._process_tasks(pipeline.execute()[-1])
+
+    def _move(self, pipeline, count: int) -> None:
+        """
+        Buffer the script that moves up to `count` tasks into the processing list in `pipeline`.
+
+        Parameters
+        ----------
+        pipeline : Pipeline
+            The pipeline the command is buffered in.
+        count : int
+            The maximum number of tasks to move.
+        """
+        keys = [self.processing_list, *self.priority_lists]
+        pipeline.eval(MOVE_SCRIPT, len(keys), *keys, count)
+
+    def _acknowledge(self, serialized_task: bytes, pipeline) -> None:
+        """
+        Buffer the commands that remove a processed task from the processing list, forget its retries
+        and refresh the heartbeat in `pipeline`.
+
+        Parameters
+        ----------
+        serialized_task : bytes
+            The task, as it was dequeued.
+        pipeline : Pipeline
+            The pipeline the commands are buffered in.
+        """
+        uuid_bytes = TASK_HEADER.unpack_from(serialized_task)[0]
+        pipeline.lrem(self.processing_list, 1, serialized_task)
+        pipeline.hdel(self.retries_key, uuid_bytes)
+        self._heartbeat(pipeline)
+
+    def _reject(self, serialized_task: bytes, error: Exception, pipeline) -> None:
+        """
+        Fail a task that cannot be decoded like `BaseQueue._reject`, and move it from the processing list
+        to the dead-letter list right away. Left in the processing list, it would be reclaimed and fail in
+        every worker in turn until `max_retries` is reached.
+
+        Parameters
+        ----------
+        serialized_task : bytes
+            The task, as it was dequeued.
+        error : Exception
+            The exception raised while decoding the task.
+        pipeline : Pipeline
+            The pipeline the commands are buffered in.
+        """
+        super()._reject(serialized_task, error, pipeline)
+        pipeline.lrem(self.processing_list, 1, serialized_task)
+        pipeline.lpush(self.dead_letter_list, serialized_task)
+        # The retries are keyed by the first 16 bytes of the task, as in `RECLAIM_SCRIPT`
+        pipeline.hdel(self.retries_key, serialized_task[:16])
+        self._heartbeat(pipeline)
+
+    def reclaim(self) -> Tuple[int, int]:
+        """
+        Recover the tasks of the workers whose heartbeat expired. Each processing list is drained
+        atomically by `RECLAIM_SCRIPT`, which also checks the heartbeat, so concurrent calls from several
+        workers are safe, and a worker whose heartbeat comes back in the meantime keeps its tasks.
+
+        The tasks of a worker are requeued in the order it dequeued them, at the head of the priority 0
+        list whatever their priority was, since the processing list does not record it: a reclaimed
+        urgent task waits behind the more urgent lists like any other priority 0 task.
+
+        Returns
+        -------
+        Tuple[int, int]
+            The number of tasks requeued and the number of tasks moved to the dead-letter list.
+        """
+        requeued = dead = 0
+        for member in self.connection.smembers(self.workers_key):
+            worker_id = member.decode()
+            if worker_id == self.worker_id:
+                continue
+            worker_requeued, worker_dead = self.reclaim_script(
+                keys=[
+                    self.processing_list_of(worker_id),
+                    self.name,
+                    self.dead_letter_list,
+                    self.retries_key,
+                    self.workers_key,
+                    self.heartbeat_key_of(worker_id),
+                ],
+                args=[self.max_retries, worker_id],
+            )
+            requeued += worker_requeued
+            dead += worker_dead
+        return requeued, dead
+
+    def unregister(self) -> None:
+        """
+        Return any task left in the processing list of the worker to the head of the priority 0 list, in
+        the order it was dequeued, as in `reclaim`, then remove the worker and its heartbeat. Call this
+        when the worker shuts down gracefully.
+        """
+        while self.connection.lmove(self.processing_list, self.name, "LEFT", "RIGHT"):
+            pass
+        pipeline = self.connection.pipeline(transaction=False)
+        pipeline.srem(self.workers_key, self.worker_id)
+        pipeline.delete(self.heartbeat_key)
+        pipeline.execute()
+
+    def dead_letter_size(self) -> int:
+        """
+        Get the number of tasks in the dead-letter list.
+
+        Returns
+        -------
+        int
+            The size of the dead-letter list.
+        """
+        return self.connection.llen(self.dead_letter_list)
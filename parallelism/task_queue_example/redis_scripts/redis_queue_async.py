@@ -0,0 +1,242 @@
+import asyncio
+import inspect
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from redis_queue import BaseQueue, SimpleTask, TaskRegistry, task_registry
+from redis_queue_metrics import QueueMetrics
+
+
+class AsyncSimpleQueue(BaseQueue):
+    """
+    The asyncio counterpart of SimpleQueue, built on `redis.asyncio`. The keys and the commands come
+    from `BaseQueue`, as for SimpleQueue, so sync and async clients and workers can share a queue.
+
+    Coroutine functions are awaited on the event loop. Other callables are run in `executor`, so that
+    they do not block the event loop: a `ProcessPoolExecutor` suits CPU-bound callables, since threads
+    would hold the GIL, and None uses the default thread pool of the event loop.
+    """
+
+    def __init__(
+        self,
+        connection,
+        name: str,
+        registry: TaskRegistry = task_registry,
+        result_ttl: int = 86400,
+        priority_levels: int = 1,
+        executor: Optional[Executor] = None,
+        metrics: Optional[QueueMetrics] = None,
+    ) -> None:
+        """
+        Initialize the AsyncSimpleQueue instance.
+
+        Parameters
+        ----------
+        connection : redis.asyncio.Redis
+            The asyncio Redis connection interface.
+        name : str
+            The name of the queue.
+        registry : TaskRegistry
+            The registry used to encode and resolve the task callables.
+        result_ttl : int
+            The number of seconds the result of a task is kept for.
+        priority_levels : int
+            The number of priority levels, from 0 (the default, least urgent) to `priority_levels - 1`.
+        executor : Optional[Executor]
+            The executor that runs the callables that are not coroutine functions.
+        metrics : Optional[QueueMetrics]
+            The metrics the wait time, execution time and outcome of the processed tasks are recorded in.
+        """
+        super().__init__(
+            connection, name, registry, result_ttl, priority_levels, metrics
+        )
+        self.executor: Optional[Executor] = executor
+
+    async def enqueue(
+        self, task_callable: Callable, *args, priority: int = 0, delay: float = 0
+    ) -> str:
+        """
+        Enqueue a task to the queue.
+
+        Parameters
+        ----------
+        task_callable : Callable
+            The task to enqueue.
+        args : Tuple[Any]
+            The arguments to pass to the task.
+        priority : int
+            The priority level of the task.
+        delay : float
+            The number of seconds before the task can be dequeued.
+
+        Returns
+        -------
+        str
+            The ID of the task.
+        """
+        task = SimpleTask(task_callable, *args, ready_at=time.time() + delay)
+        pipeline = self.connection.pipeline(transaction=False)
+        self._push(pipeline, [task.serialize(self.registry)], priority, delay)
+        await pipeline.execute()
+        return task.id
+
+    async def enqueue_many(
+        self,
+        task_callable: Callable,
+        args_list: Iterable[Tuple[Any, ...]],
+        batch_size: int = 1000,
+        priority: int = 0,
+        delay: float = 0,
+    ) -> List[str]:
+        """
+        Enqueue one task per tuple of arguments in a single round trip, see `SimpleQueue.enqueue_many`.
+
+        Parameters
+        ----------
+        task_callable : Callable
+            The task to enqueue.
+        args_list : Iterable[Tuple[Any, ...]]
+            The arguments of each task.
+        batch_size : int
+            The maximum number of tasks pushed by a single `LPUSH`.
+        priority : int
+            The priority level of the tasks.
+        delay : float
+            The number of seconds before the tasks can be dequeued.
+
+        Returns
+        -------
+        List[str]
+            The IDs of the tasks, in the order they were enqueued.
+        """
+        pipeline = self.connection.pipeline(transaction=False)
+        task_ids = self._push_many(
+            pipeline, task_callable, args_list, batch_size, priority, delay
+        )
+        await pipeline.execute()
+        return task_ids
+
+    async def dequeue(self, timeout: float = 0) -> Optional[SimpleTask]:
+        """
+        Dequeue a task from the queue and process it. Only the coroutine calling this method waits on
+        `BRPOP`, the other coroutines of the event loop keep running.
+
+        Parameters
+        ----------
+        timeout : float
+            The maximum number of seconds to block for while the queue is empty, 0 blocks indefinitely.
+
+        Returns
+        -------
+        Optional[SimpleTask]
+            The task that was dequeued and processed, or None if the timeout expired first or the task
+            could not be decoded.
+        """
+        pipeline = self.connection.pipeline(transaction=False)
+        self._schedule(pipeline)
+        pipeline.brpop(self.priority_lists, timeout=timeout)
+        reply = (await pipeline.execute())[-1]
+        if reply is None:
+            return None
+        _, serialized_task = reply
+        tasks = await self._process_tasks([serialized_task])
+        return tasks[0] if tasks else None
+
+    async def dequeue_many(self, count: int) -> List[SimpleTask]:
+        """
+        Dequeue up to `count` tasks in one round trip and process them concurrently. Unlike `dequeue`,
+        this does not block when the queue is empty.
+
+        Parameters
+        ----------
+        count : int
+            The maximum number of tasks to dequeue.
+
+        Returns
+        -------
+        List[SimpleTask]
+            The tasks that were dequeued and processed, empty if the queue was empty.
+        """
+        pipeline = self.connection.pipeline(transaction=False)
+        self._schedule(pipeline)
+        self._pop(pipeline, count)
+        serialized_tasks: Optional[List[bytes]] = (await pipeline.execute())[-1]
+        return await self._process_tasks(serialized_tasks or [])
+
+    async def _process_tasks(self, serialized_tasks: List[bytes]) -> List[SimpleTask]:
+        """
+        Process dequeued tasks concurrently, then store their results and publish their IDs in a single
+        round trip. A task that cannot be decoded is rejected on its own, see `BaseQueue._reject`.
+
+        Parameters
+        ----------
+        serialized_tasks : List[bytes]
+            The tasks, as they were dequeued.
+
+        Returns
+        -------
+        List[SimpleTask]
+            The tasks that were processed, without the rejected ones.
+        """
+        if not serialized_tasks:
+            return []
+        tasks = []
+        pipeline = self.connection.pipeline(transaction=False)
+        for serialized_task in serialized_tasks:
+            try:
+                tasks.append(SimpleTask.deserialize(serialized_task, self.registry))
+            except Exception as error:
+                self._reject(serialized_task, error, pipeline)
+        records = await asyncio.gather(*(self._process_task(task) for task in tasks))
+        for task, record in zip(tasks, records):
+            self._store(pipeline, task.id, record)
+        await pipeline.execute()
+        return tasks
+
+    async def _process_task(self, task: SimpleTask) -> str:
+        """
+        Process a task, awaiting coroutine functions and running other callables in the executor.
+
+        Parameters
+        ----------
+        task : SimpleTask
+            The task to process.
+
+        Returns
+        -------
+        str
+            The result record of the task, the return value or the exception raised.
+        """
+        wait = time.time() - task.ready_at
+        start = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(task.task_callable):
+                result = await task.task_callable(*task.args)
+            else:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self.executor, task.task_callable, *task.args
+                )
+            record = self._record(result)
+            failed = False
+        except Exception as error:
+            record = self._record(error=error)
+            failed = True
+        # The execution time includes the time spent waiting for a free process of the executor
+        if self.metrics is not None:
+            self.metrics.observe_task(wait, time.perf_counter() - start, failed)
+        return record
+
+    async def size(self) -> int:
+        """
+        Get the size of the queue, i.e., the number of tasks ready to be dequeued at every priority level.
+
+        Returns
+        -------
+        int
+            The size of the queue.
+        """
+        pipeline = self.connection.pipeline(transaction=False)
+        self._size(pipeline)
+        return sum(await pipeline.execute())
@@ -0,0 +1,95 @@
+import asyncio
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+
+import redis.asyncio
+from redis_queue import task_registry
+from redis_queue_async import AsyncSimpleQueue
+from utils import setup_logger
+from word_count_task import count_words
+
+# Number of tasks processed concurrently by the worker
+concurrency = 8
+# Number of processes running the CPU-bound callables, e.g., `count_words`
+num_processes = os.cpu_count() or 1
+# Number of seconds a consumer blocks on an empty queue before checking for a shutdown request
+timeout = 5
+priority_levels = 2
+logger = setup_logger("redis_async_dequeue")
+# Build the registry once, tasks refer to their callable by a registered ID
+task_registry.register(count_words)
+
+
+async def consume(queue: AsyncSimpleQueue, shutdown: asyncio.Event) -> int:
+    """
+    Dequeue and process tasks one at a time until a shutdown is requested.
+
+    Parameters
+    ----------
+    queue : AsyncSimpleQueue
+        The queue to dequeue from.
+    shutdown : asyncio.Event
+        Set when the worker should stop.
+
+    Returns
+    -------
+    int
+        The number of tasks processed.
+    """
+    processed = 0
+    while not shutdown.is_set():
+        if await queue.dequeue(timeout=timeout) is not None:
+            processed += 1
+    return processed
+
+
+async def worker(concurrency: int = concurrency) -> int:
+    """
+    An asyncio worker that runs `concurrency` consumers in one process, so up to `concurrency` tasks are
+    in flight at once: coroutine functions interleave on the event loop, while the other callables run in
+    a pool of `num_processes` processes. The worker stops after the current tasks on SIGTERM or SIGINT.
+
+    Parameters
+    ----------
+    concurrency : int
+        The maximum number of tasks processed concurrently.
+
+    Returns
+    -------
+    int
+        The number of tasks processed.
+    """
+    shutdown = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, shutdown.set)
+
+    # Each consumer blocked on BRPOP holds a connection of the pool
+    redis_connection = redis.asyncio.Redis(max_connections=concurrency + 1)
+    with ProcessPoolExecutor(max_workers=num_processes) as executor:
+        queue = AsyncSimpleQueue(
+            redis_connection,
+            "word_count_queue",
+            priority_levels=priority_levels,
+            executor=executor,
+        )
+        try:
+            counts = await asyncio.gather(
+                *(consume(queue, shutdown) for _ in range(concurrency))
+            )
+        finally:
+            await redis_connection.aclose()
+    processed = sum(counts)
+    logger.info(f"Process ID: {os.getpid()} | Processed {processed} tasks")
+
+    return processed
+
+
+def main() -> int:
+    asyncio.run(worker())
+    return 0
+
+
+if __name__ == "__main__":
+    main()
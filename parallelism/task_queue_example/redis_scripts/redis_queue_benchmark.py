@@ -0,0 +1,91 @@
+import time
+from typing import Any, Callable
+
+import redis
+from redis_queue import SimpleQueue
+from utils import setup_logger
+
+num_tasks = 10_000
+batch_size = 1000
+logger = setup_logger("redis_benchmark")
+
+
+def connect() -> Any:
+    """
+    Connect to a local `redis-server`, falling back to an in-process `fakeredis` server when none is
+    running. Round trips to `fakeredis` are much cheaper than over a socket, so the speedup of the batch
+    APIs is understated with it.
+
+    Returns
+    -------
+    Redis
+        The Redis connection interface.
+    """
+    connection = redis.Redis()
+    try:
+        connection.ping()
+        return connection
+    except redis.exceptions.ConnectionError:
+        pass
+    try:
+        import fakeredis
+    except ImportError:
+        raise RuntimeError(
+            "Start a local redis-server or install fakeredis to run the benchmark"
+        )
+    logger.info("No redis-server is running, using fakeredis")
+    return fakeredis.FakeRedis()
+
+
+def measure(operation: Callable[[], Any]) -> float:
+    """
+    Time an operation and return the throughput in tasks per second.
+
+    Parameters
+    ----------
+    operation : Callable[[], Any]
+        The operation that moves `num_tasks` tasks.
+
+    Returns
+    -------
+    float
+        The number of tasks moved per second.
+    """
+    start = time.perf_counter()
+    operation()
+    return num_tasks / (time.perf_counter() - start)
+
+
+def main() -> int:
+    connection = connect()
+    queue = SimpleQueue(connection, "benchmark_queue")
+    connection.delete(queue.name)
+    # A cheap builtin keeps the time spent processing the tasks negligible
+    args_list = [(i,) for i in range(num_tasks)]
+
+    def enqueue() -> None:
+        for args in args_list:
+            queue.enqueue(abs, *args)
+
+    def dequeue() -> None:
+        for _ in range(num_tasks):
+            queue.dequeue()
+
+    def enqueue_many() -> None:
+        queue.enqueue_many(abs, args_list, batch_size)
+
+    def dequeue_many() -> None:
+        while queue.dequeue_many(batch_size):
+            pass
+
+    logger.info(f"Moving {num_tasks:,} tasks through {queue.name}")
+    for operation in (enqueue, dequeue, enqueue_many, dequeue_many):
+        throughput = measure(operation)
+        logger.info(f"{operation.__name__:<12} | {throughput:>12,.0f} tasks per second")
+    connection.delete(queue.name)
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
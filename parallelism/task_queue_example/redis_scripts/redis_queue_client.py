@@ -6,6 +6,8 @@ from utils import setup_logger
 from word_count_task import count_words
 
 book_multipler = 10
+# Number of seconds to wait for the workers to process every book
+result_timeout = 600
 project_path = Path(__file__).resolve().parents[1]
 data_path = project_path / "data"
 logger = setup_logger("redis_enqueue")
@@ -15,10 +17,16 @@ def main() -> int:
     redis_connection = redis.Redis()
     queue = SimpleQueue(redis_connection, "word_count_queue")
     books = list(path.name for path in data_path.rglob("*.txt"))
-    for _ in range(book_multipler):
-        for book in books:
-            queue.enqueue(count_words, book)
-    logger.info(f"Enqueued {len(books) * book_multipler} books")
+    # Enqueue every task in a single round trip
+    task_ids = queue.enqueue_many(
+        count_words, ((book,) for _ in range(book_multipler) for book in books)
+    )
+    logger.info(f"Enqueued {len(task_ids)} books")
+    # Wait for the completion notifications instead of polling the output directory
+    results = queue.get_many(task_ids, timeout=result_timeout)
+    for book, word_counts in zip(books, results):
+        top_word = max(word_counts, key=word_counts.__getitem__, default=None)
+        logger.info(f"{book} | Most common word: {top_word}")
 
     return 0
 
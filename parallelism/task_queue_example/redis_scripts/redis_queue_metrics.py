@@ -0,0 +1,348 @@
+import json
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Sequence
+
+import redis
+from utils import setup_logger
+
+# Upper bounds of the buckets, in seconds, of the wait and execution time histograms
+TIME_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0, 300.0)
+# Upper bounds of the buckets, in tasks, of the queue depth histogram
+DEPTH_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+logger = setup_logger("redis_metrics")
+
+
+class Histogram(object):
+    """
+    A histogram with fixed buckets, as in the Prometheus data model: each observation is counted in
+    the first bucket whose upper bound is greater than or equal to it, or in the implicit `+Inf` bucket.
+    """
+
+    def __init__(self, name: str, description: str, buckets: Sequence[float]) -> None:
+        """
+        Initialize the Histogram instance.
+
+        Parameters
+        ----------
+        name : str
+            The name of the metric.
+        description : str
+            The description of the metric.
+        buckets : Sequence[float]
+            The upper bounds of the buckets, in increasing order.
+        """
+        self.name: str = name
+        self.description: str = description
+        self.buckets: List[float] = list(buckets)
+        # One count per bucket, plus the +Inf bucket
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.total: float = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Record an observation.
+
+        Parameters
+        ----------
+        value : float
+            The observed value.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+    def merge(self, other: "Histogram") -> None:
+        """
+        Add the observations of another histogram with the same buckets to this one.
+
+        Parameters
+        ----------
+        other : Histogram
+            The histogram to merge.
+        """
+        self.counts = [
+            count + other_count for count, other_count in zip(self.counts, other.counts)
+        ]
+        self.total += other.total
+
+    def render(self, labels: str) -> List[str]:
+        """
+        Render the histogram in the Prometheus text exposition format.
+
+        Parameters
+        ----------
+        labels : str
+            The labels of the samples, e.g., `queue="word_count_queue"`.
+
+        Returns
+        -------
+        List[str]
+            The lines of the metric family, with cumulative bucket counts.
+        """
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        cumulative = 0
+        for bound, count in zip([*self.buckets, "+Inf"], self.counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{self.name}_sum{{{labels}}} {self.total}")
+        lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+class QueueMetrics(object):
+    """
+    In-process metrics of the tasks processed from a queue: the time each task waited between being
+    ready (enqueued, or due if delayed) and starting, its execution time, the number of tasks and
+    failures, and samples of the queue depth. The metrics can be served in the Prometheus text format
+    with `serve`, or saved to Redis with `save` and aggregated over every worker with `load`.
+    """
+
+    def __init__(self, queue_name: str) -> None:
+        """
+        Initialize the QueueMetrics instance.
+
+        Parameters
+        ----------
+        queue_name : str
+            The name of the queue, used as the `queue` label.
+        """
+        self.queue_name: str = queue_name
+        self.wait_seconds = Histogram(
+            "task_wait_seconds",
+            "Time between a task being ready and starting.",
+            TIME_BUCKETS,
+        )
+        self.execution_seconds = Histogram(
+            "task_execution_seconds", "Time spent executing a task.", TIME_BUCKETS
+        )
+        self.queue_depth = Histogram(
+            "queue_depth", "Number of tasks ready in the queue.", DEPTH_BUCKETS
+        )
+        self.tasks_total: int = 0
+        self.failures_total: int = 0
+        # The HTTP endpoint renders the metrics from another thread
+        self.lock = threading.Lock()
+
+    def observe_task(self, wait: float, execution: float, failed: bool) -> None:
+        """
+        Record a processed task.
+
+        Parameters
+        ----------
+        wait : float
+            The number of seconds the task waited before starting.
+        execution : float
+            The number of seconds the task took.
+        failed : bool
+            Whether the task raised an exception.
+        """
+        with self.lock:
+            self.wait_seconds.observe(wait)
+            self.execution_seconds.observe(execution)
+            self.tasks_total += 1
+            self.failures_total += failed
+
+    def observe_depth(self, depth: int) -> None:
+        """
+        Record a sample of the queue depth.
+
+        Parameters
+        ----------
+        depth : int
+            The number of tasks ready in the queue, e.g., `SimpleQueue.size()`.
+        """
+        with self.lock:
+            self.queue_depth.observe(depth)
+
+    def histograms(self) -> List[Histogram]:
+        """
+        List the histograms, in the order they are rendered.
+
+        Returns
+        -------
+        List[Histogram]
+            The wait time, execution time and queue depth histograms.
+        """
+        return [self.wait_seconds, self.execution_seconds, self.queue_depth]
+
+    def render(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Returns
+        -------
+        str
+            The metrics, one sample per line.
+        """
+        labels = f'queue="{self.queue_name}"'
+        with self.lock:
+            lines = [
+                "# HELP tasks_total Number of tasks processed.",
+                "# TYPE tasks_total counter",
+                f"tasks_total{{{labels}}} {self.tasks_total}",
+                "# HELP task_failures_total Number of tasks that raised an exception.",
+                "# TYPE task_failures_total counter",
+                f"task_failures_total{{{labels}}} {self.failures_total}",
+            ]
+            for histogram in self.histograms():
+                lines.extend(histogram.render(labels))
+        return "\n".join(lines) + "\n"
+
+    def to_json(self) -> str:
+        """
+        Serialize the metrics, see `from_json`.
+
+        Returns
+        -------
+        str
+            The counters and the bucket counts and sums of the histograms as JSON.
+        """
+        with self.lock:
+            return json.dumps(
+                {
+                    "tasks_total": self.tasks_total,
+                    "failures_total": self.failures_total,
+                    "histograms": {
+                        histogram.name: [histogram.counts, histogram.total]
+                        for histogram in self.histograms()
+                    },
+                }
+            )
+
+    @classmethod
+    def from_json(cls, queue_name: str, data: str) -> "QueueMetrics":
+        """
+        Deserialize metrics produced by `to_json`.
+
+        Parameters
+        ----------
+        queue_name : str
+            The name of the queue.
+        data : str
+            The output of `to_json`.
+
+        Returns
+        -------
+        QueueMetrics
+            The metrics.
+        """
+        metrics = cls(queue_name)
+        state: Dict[str, Any] = json.loads(data)
+        metrics.tasks_total = state["tasks_total"]
+        metrics.failures_total = state["failures_total"]
+        for histogram in metrics.histograms():
+            histogram.counts, histogram.total = state["histograms"][histogram.name]
+        return metrics
+
+    def merge(self, other: "QueueMetrics") -> None:
+        """
+        Add the metrics of another worker to this one.
+
+        Parameters
+        ----------
+        other : QueueMetrics
+            The metrics to merge.
+        """
+        with self.lock:
+            self.tasks_total += other.tasks_total
+            self.failures_total += other.failures_total
+            for histogram, other_histogram in zip(
+                self.histograms(), other.histograms()
+            ):
+                histogram.merge(other_histogram)
+
+    def save(self, connection, worker_id: str, ttl: int = 300) -> None:
+        """
+        Save a snapshot of the metrics of a worker to Redis, the key expires unless it is saved again
+        within `ttl` seconds, so that stopped workers drop out of the aggregate.
+
+        Parameters
+        ----------
+        connection : Redis
+            The Redis connection interface.
+        worker_id : str
+            The ID of the worker.
+        ttl : int
+            The number of seconds the snapshot is kept for.
+        """
+        connection.set(f"{self.queue_name}:metrics:{worker_id}", self.to_json(), ex=ttl)
+
+    @classmethod
+    def load(cls, connection, queue_name: str) -> "QueueMetrics":
+        """
+        Aggregate the latest snapshots of every worker of a queue.
+
+        Parameters
+        ----------
+        connection : Redis
+            The Redis connection interface.
+        queue_name : str
+            The name of the queue.
+
+        Returns
+        -------
+        QueueMetrics
+            The sum of the metrics of every worker.
+        """
+        metrics = cls(queue_name)
+        keys = list(connection.scan_iter(match=f"{queue_name}:metrics:*"))
+        for data in connection.mget(keys) if keys else []:
+            if data is not None:
+                metrics.merge(cls.from_json(queue_name, data))
+        return metrics
+
+
+def serve(metrics: QueueMetrics, port: int) -> ThreadingHTTPServer:
+    """
+    Serve the metrics in the Prometheus text format on `http://0.0.0.0:port/metrics`, from a daemon
+    thread.
+
+    Parameters
+    ----------
+    metrics : QueueMetrics
+        The metrics to serve.
+    port : int
+        The port to listen on.
+
+    Returns
+    -------
+    ThreadingHTTPServer
+        The server, call `shutdown` to stop it.
+    """
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            # Scrapes are too frequent to be logged
+            pass
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Serving metrics on port {port}")
+    return server
+
+
+def main() -> int:
+    # Print the metrics aggregated over every worker of the word count queue
+    redis_connection = redis.Redis()
+    print(QueueMetrics.load(redis_connection, "word_count_queue").render(), end="")
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import statistics
+import threading
+import time
+from typing import List
+
+from redis_queue import SimpleQueue
+from redis_queue_benchmark import connect
+from utils import setup_logger
+
+backlog_size = 1000
+num_probes = 20
+# The probes are enqueued over the first second, well before the backlog is drained
+probe_interval = 0.05
+# Each task sleeps for this many seconds, so the backlog takes a few seconds to drain
+task_duration = 0.002
+prefetch = 10
+logger = setup_logger("priority_benchmark")
+
+
+def work(queue: SimpleQueue, stop: threading.Event) -> None:
+    """
+    Run a worker loop in a thread until `stop` is set.
+
+    Parameters
+    ----------
+    queue : SimpleQueue
+        The queue to dequeue from.
+    stop : threading.Event
+        Set to stop the worker.
+    """
+    while not stop.is_set():
+        if not queue.dequeue_many(prefetch):
+            queue.dequeue(timeout=0.1)
+
+
+def measure(queue: SimpleQueue, probe_priority: int) -> List[float]:
+    """
+    Fill the queue with a backlog of low-priority tasks, then, while a worker drains it, enqueue
+    `num_probes` short tasks one every `probe_interval` seconds. Each short task returns the time
+    it started at, so its latency is the time it waited in the queue.
+
+    Parameters
+    ----------
+    queue : SimpleQueue
+        The queue to benchmark.
+    probe_priority : int
+        The priority level of the short tasks.
+
+    Returns
+    -------
+    List[float]
+        The latency of each short task in seconds.
+    """
+    queue.connection.delete(*queue.priority_lists)
+    queue.enqueue_many(time.sleep, ((task_duration,) for _ in range(backlog_size)))
+    stop = threading.Event()
+    worker = threading.Thread(target=work, args=(queue, stop))
+    worker.start()
+    enqueue_times = []
+    task_ids = []
+    try:
+        for _ in range(num_probes):
+            enqueue_times.append(time.time())
+            task_ids.append(queue.enqueue(time.time, priority=probe_priority))
+            time.sleep(probe_interval)
+        start_times = queue.get_many(task_ids, timeout=600)
+    finally:
+        stop.set()
+        worker.join()
+    return [start - enqueued for start, enqueued in zip(start_times, enqueue_times)]
+
+
+def main() -> int:
+    queue = SimpleQueue(connect(), "priority_benchmark_queue", priority_levels=2)
+    logger.info(
+        f"Timing {num_probes} short tasks behind a backlog of {backlog_size:,} tasks of "
+        f"{task_duration * 1000:.0f} ms"
+    )
+    for label, probe_priority in (("same priority", 0), ("high priority", 1)):
+        latencies = measure(queue, probe_priority)
+        logger.info(
+            f"{label} | median {statistics.median(latencies) * 1000:>8,.1f} ms | "
+            f"max {max(latencies) * 1000:>8,.1f} ms"
+        )
+    queue.connection.delete(*queue.priority_lists)
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
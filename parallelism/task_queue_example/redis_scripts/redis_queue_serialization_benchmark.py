@@ -0,0 +1,62 @@
+import pickle
+import time
+from typing import Any, Callable
+
+from redis_queue import SimpleTask
+from utils import setup_logger
+from word_count_task import count_words
+
+num_tasks = 100_000
+logger = setup_logger("serialization_benchmark")
+
+
+def measure(operation: Callable[[], Any]) -> float:
+    """
+    Time an operation and return the CPU time per task.
+
+    Parameters
+    ----------
+    operation : Callable[[], Any]
+        The operation that encodes or decodes `num_tasks` tasks.
+
+    Returns
+    -------
+    float
+        The number of microseconds spent per task.
+    """
+    start = time.process_time()
+    operation()
+    return (time.process_time() - start) / num_tasks * 1e6
+
+
+def main() -> int:
+    tasks = [
+        SimpleTask(count_words, "pride-and-prejudice.txt") for _ in range(num_tasks)
+    ]
+    pickled = [pickle.dumps(task, protocol=pickle.HIGHEST_PROTOCOL) for task in tasks]
+    serialized = [task.serialize() for task in tasks]
+
+    encode_pickle = measure(
+        lambda: [pickle.dumps(task, protocol=pickle.HIGHEST_PROTOCOL) for task in tasks]
+    )
+    decode_pickle = measure(lambda: [pickle.loads(payload) for payload in pickled])
+    encode_compact = measure(lambda: [task.serialize() for task in tasks])
+    decode_compact = measure(
+        lambda: [SimpleTask.deserialize(payload) for payload in serialized]
+    )
+
+    logger.info(f"Encoding and decoding {num_tasks:,} tasks")
+    logger.info(
+        f"pickle  | {len(pickled[0]):>4} bytes per task | encode {encode_pickle:.2f} us | "
+        f"decode {decode_pickle:.2f} us"
+    )
+    logger.info(
+        f"compact | {len(serialized[0]):>4} bytes per task | encode {encode_compact:.2f} us | "
+        f"decode {decode_compact:.2f} us"
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
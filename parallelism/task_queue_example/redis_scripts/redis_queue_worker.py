@@ -1,23 +1,129 @@
+import os
+import signal
+import time
+from types import FrameType
+from typing import Optional
+
 import redis
-from redis_queue import SimpleQueue
+from redis_queue import ReliableQueue, task_registry
+from redis_queue_metrics import QueueMetrics, serve
 from utils import setup_logger
+from word_count_task import count_words
 
+# Number of tasks fetched per round trip while the queue is not empty
+prefetch = 10
+# Number of seconds a worker blocks on an empty queue before checking for a shutdown request
+timeout = 5
+# Tasks enqueued with priority 1 are processed ahead of the batch tasks at the default priority 0
+priority_levels = 2
+# Number of seconds between two samples of the queue depth and snapshots of the metrics to Redis
+metrics_interval = 10
+# Port of the Prometheus endpoint, None to only save the snapshots to Redis
+metrics_port: Optional[int] = None
 logger = setup_logger("redis_dequeue")
+# Build the registry once, tasks refer to their callable by a registered ID
+task_registry.register(count_words)
+
+
+class GracefulShutdown(object):
+    """
+    Records SIGTERM and SIGINT instead of exiting immediately, so that the worker finishes the tasks it
+    has already removed from the queue before it stops.
+    """
+
+    def __init__(self) -> None:
+        self.requested: bool = False
+        signal.signal(signal.SIGTERM, self.request)
+        signal.signal(signal.SIGINT, self.request)
+
+    def request(self, signum: int, frame: Optional[FrameType]) -> None:
+        """
+        Signal handler that asks the worker loop to stop after the current batch.
 
+        Parameters
+        ----------
+        signum : int
+            The number of the signal received.
+        frame : Optional[FrameType]
+            The interrupted stack frame.
+        """
+        logger.info(
+            f"Process ID: {os.getpid()} | Received {signal.Signals(signum).name}, shutting down"
+        )
+        self.requested = True
 
-def worker() -> int:
+
+def worker(
+    prefetch: int = prefetch,
+    timeout: float = timeout,
+    metrics_port: Optional[int] = metrics_port,
+) -> int:
     """
     A worker is a Python process that typically runs in the background and exists solely as a work horse to perform lengthy or blocking tasks.
+
+    The worker loops until it receives SIGTERM or SIGINT, over a single connection pool. While the queue has
+    tasks, it dequeues up to `prefetch` of them per round trip; once the queue is empty, it blocks on `BLMOVE`
+    for at most `timeout` seconds at a time, so a shutdown request is noticed within `timeout` seconds.
+
+    Tasks are delivered at least once: whenever the queue is empty, the worker also reclaims the tasks left
+    behind by workers that died while processing them.
+
+    Every `metrics_interval` seconds, the worker samples the queue depth and saves a snapshot of its metrics
+    to Redis, see `redis_queue_metrics.py` to aggregate them over every worker.
+
+    Parameters
+    ----------
+    prefetch : int
+        The maximum number of tasks dequeued per round trip.
+    timeout : float
+        The maximum number of seconds to block for while the queue is empty.
+    metrics_port : Optional[int]
+        The port to serve the metrics of this worker on in the Prometheus text format, if any.
+
+    Returns
+    -------
+    int
+        The number of tasks processed.
     """
-    redis_connection = redis.Redis()
-    queue = SimpleQueue(redis_connection, "word_count_queue")
-    # If there are remaining tasks in the queue, dequeue them and process them
-    if queue.size() > 0:
-        queue.dequeue()
-    else:
-        logger.info("No more tasks in the queue")
-
-    return 0
+    shutdown = GracefulShutdown()
+    connection_pool = redis.ConnectionPool()
+    redis_connection = redis.Redis(connection_pool=connection_pool)
+    metrics = QueueMetrics("word_count_queue")
+    queue = ReliableQueue(
+        redis_connection,
+        "word_count_queue",
+        priority_levels=priority_levels,
+        metrics=metrics,
+    )
+    server = serve(metrics, metrics_port) if metrics_port is not None else None
+    processed = 0
+    next_snapshot = 0.0
+    try:
+        while not shutdown.requested:
+            if time.monotonic() >= next_snapshot:
+                next_snapshot = time.monotonic() + metrics_interval
+                metrics.observe_depth(queue.size())
+                metrics.save(redis_connection, queue.worker_id)
+            tasks = queue.dequeue_many(prefetch)
+            if tasks:
+                processed += len(tasks)
+                continue
+            requeued, dead = queue.reclaim()
+            if requeued or dead:
+                logger.info(
+                    f"Process ID: {os.getpid()} | Requeued {requeued} and dead-lettered {dead} tasks"
+                )
+            elif queue.dequeue(timeout=timeout) is not None:
+                processed += 1
+        queue.unregister()
+        metrics.save(redis_connection, queue.worker_id)
+    finally:
+        if server is not None:
+            server.shutdown()
+        connection_pool.disconnect()
+    logger.info(f"Process ID: {os.getpid()} | Processed {processed} tasks")
+
+    return processed
 
 
 if __name__ == "__main__":
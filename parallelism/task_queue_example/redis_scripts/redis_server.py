@@ -1,17 +1,29 @@
+import signal
 from multiprocessing import Process
+from types import FrameType
+from typing import List, Optional
 
-from redis_queue_worker import worker
+from redis_queue_worker import prefetch, timeout, worker
 
 num_processes = 3
 
 
 def main() -> int:
-    processes = []
+    processes: List[Process] = []
     for _ in range(num_processes):
-        process = Process(target=worker)
+        process = Process(target=worker, args=(prefetch, timeout))
         processes.append(process)
         process.start()
-    # Wait for all child processes to complete
+
+    # Installed after the workers are started, so that they keep their own handlers
+    def stop_workers(signum: int, frame: Optional[FrameType]) -> None:
+        # Forward the request as SIGTERM, each worker finishes its current batch and exits
+        for process in processes:
+            process.terminate()
+
+    signal.signal(signal.SIGTERM, stop_workers)
+    signal.signal(signal.SIGINT, stop_workers)
+    # The workers run until they are asked to shut down
     for process in processes:
         process.join()
 
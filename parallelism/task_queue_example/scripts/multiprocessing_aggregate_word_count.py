@@ -0,0 +1,251 @@
+import os
+import pickle
+import sys
+import time
+from array import array
+from collections import Counter
+from multiprocessing import Pool, cpu_count
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+from utils import setup_logger
+from word_count_task import count_tokens, data_path
+
+num_processes = max(cpu_count() - 1, 1)
+book_multipler = 10
+top_k = 20
+logger = setup_logger("multiprocessing_aggregate_word_count")
+
+# The process ID of the worker, the words it had not sent before, joined by newlines, then the worker IDs of
+# the words of a book and their counts in the same order
+CountVector = Tuple[int, bytes, array, array]
+# The vocabulary of this worker process: each word is sent to the parent once, then referred to by its ID
+worker_ids: Dict[bytes, int] = {}
+
+
+def count_vector(filename: str) -> CountVector:
+    """
+    Count all the words of a book and pack them into a count vector. Pickling a `Counter` pickles one
+    string and one integer object per word, while a count vector is a few flat buffers: the words this
+    worker has not sent before, and two arrays of word IDs and counts.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the book.
+
+    Returns
+    -------
+    CountVector
+        The count vector of the book.
+    """
+    token_counter = count_tokens(data_path / filename)
+    new_words = [word for word in token_counter if word not in worker_ids]
+    for word in new_words:
+        worker_ids[word] = len(worker_ids)
+    return (
+        os.getpid(),
+        # Tokens never contain whitespace, so a newline can separate them
+        b"\n".join(new_words),
+        array("I", map(worker_ids.__getitem__, token_counter)),
+        array("I", token_counter.values()),
+    )
+
+
+def count_counter(filename: str) -> Counter:
+    """
+    Count all the words of a book, returned as a `Counter` for comparison with `count_vector`.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the book.
+
+    Returns
+    -------
+    Counter
+        The count of each word, as bytes.
+    """
+    return count_tokens(data_path / filename)
+
+
+class Vocabulary(object):
+    """
+    The vocabulary of the corpus, shared by the count vectors of every worker: each word gets the next
+    corpus ID the first time a worker sends it, and the corpus counts are an array indexed by corpus ID.
+    Only the new words of a count vector go through a dictionary, the counts of the words already known
+    are added in a single vectorized operation.
+    """
+
+    def __init__(self) -> None:
+        self.ids: Dict[bytes, int] = {}
+        self.words: List[bytes] = []
+        # The corpus ID of each word ID of each worker, by process ID
+        self.worker_to_corpus_ids: Dict[int, array] = {}
+        # Grown geometrically, only the first `len(self.words)` counts are used
+        self.counts: np.ndarray = np.zeros(1024, dtype=np.uint64)
+
+    def merge(self, vector: CountVector) -> None:
+        """
+        Add the counts of a book to the corpus counts.
+
+        Parameters
+        ----------
+        vector : CountVector
+            The count vector of the book.
+        """
+        process_id, new_words, word_ids, counts = vector
+        corpus_ids = self.worker_to_corpus_ids.setdefault(process_id, array("I"))
+        if new_words:
+            for word in new_words.split(b"\n"):
+                corpus_id = self.ids.setdefault(word, len(self.words))
+                if corpus_id == len(self.words):
+                    self.words.append(word)
+                corpus_ids.append(corpus_id)
+        if len(self.words) > len(self.counts):
+            self.counts = np.concatenate(
+                [
+                    self.counts,
+                    np.zeros(max(len(self.words), len(self.counts)), np.uint64),
+                ]
+            )
+        if not word_ids:
+            return
+        book_ids = np.frombuffer(corpus_ids, dtype=np.uintc)[
+            np.frombuffer(word_ids, dtype=np.uintc)
+        ]
+        # The words of a book are distinct, so no index repeats and the in-place addition is exact
+        self.counts[book_ids] += np.frombuffer(counts, dtype=np.uintc)
+
+    def most_common(self, k: int) -> Dict[str, int]:
+        """
+        Get the most common words of the corpus.
+
+        Parameters
+        ----------
+        k : int
+            The number of words.
+
+        Returns
+        -------
+        Dict[str, int]
+            The `k` most common words and their counts, most common first.
+        """
+        counts = self.counts[: len(self.words)]
+        k = min(k, len(counts))
+        if k == 0:
+            return {}
+        # Partition in linear time, then only sort the top k
+        top_ids = np.argpartition(counts, len(counts) - k)[len(counts) - k :]
+        top_ids = top_ids[np.argsort(counts[top_ids], kind="stable")[::-1]]
+        return {
+            self.words[word_id].decode(): int(counts[word_id]) for word_id in top_ids
+        }
+
+
+def aggregate_vectors(pool, books: Iterable[str]) -> Tuple[Vocabulary, float]:
+    """
+    Count the books in the pool as count vectors and merge them into the corpus vocabulary as they arrive.
+
+    Parameters
+    ----------
+    pool : multiprocessing.pool.Pool
+        The pool of worker processes.
+    books : Iterable[str]
+        The books to count.
+
+    Returns
+    -------
+    Tuple[Vocabulary, float]
+        The corpus vocabulary and counts, and the number of seconds the parent spent merging.
+    """
+    vocabulary = Vocabulary()
+    merge_seconds = 0.0
+    for vector in pool.imap_unordered(count_vector, books):
+        start_time = time.perf_counter()
+        vocabulary.merge(vector)
+        merge_seconds += time.perf_counter() - start_time
+    return vocabulary, merge_seconds
+
+
+def aggregate_counters(pool, books: Iterable[str]) -> Tuple[Counter, float]:
+    """
+    Count the books in the pool as counters and merge them, for comparison with `aggregate_vectors`.
+
+    Parameters
+    ----------
+    pool : multiprocessing.pool.Pool
+        The pool of worker processes.
+    books : Iterable[str]
+        The books to count.
+
+    Returns
+    -------
+    Tuple[Counter, float]
+        The corpus counts, and the number of seconds the parent spent merging.
+    """
+    corpus_counter: Counter = Counter()
+    merge_seconds = 0.0
+    for token_counter in pool.imap_unordered(count_counter, books):
+        start_time = time.perf_counter()
+        corpus_counter.update(token_counter)
+        merge_seconds += time.perf_counter() - start_time
+    return corpus_counter, merge_seconds
+
+
+def main() -> int:
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else num_processes
+    books = [path.name for path in data_path.rglob("*.txt")] * book_multipler
+    logger.info(
+        f"Aggregating the word counts of {len(books)} books with {processes} processes"
+    )
+
+    with Pool(processes) as pool:
+        start_time = time.perf_counter()
+        corpus_counter, counter_merge_seconds = aggregate_counters(pool, books)
+        counter_seconds = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        vocabulary, vector_merge_seconds = aggregate_vectors(pool, books)
+        vector_seconds = time.perf_counter() - start_time
+
+    top_words = vocabulary.most_common(top_k)
+    # The order of equal counts may differ, so compare the counts of the words
+    if sorted(top_words.values()) != sorted(
+        count for _, count in corpus_counter.most_common(top_k)
+    ) or any(
+        corpus_counter[word.encode()] != count for word, count in top_words.items()
+    ):
+        logger.error("The counter and vector aggregations differ")
+        return 1
+    for label, seconds, merge_seconds in (
+        ("Counter", counter_seconds, counter_merge_seconds),
+        ("vector", vector_seconds, vector_merge_seconds),
+    ):
+        logger.info(
+            f"{label:<7} | total {seconds:>6.2f} s | merged in {merge_seconds * 1000:>7,.1f} ms"
+        )
+
+    # Size and cost of sending the counts of one book from a worker to the parent, the first time and
+    # once the worker has already sent its words
+    book = books[0]
+    for label, result in (
+        ("Counter", count_counter(book)),
+        ("vector, new words", count_vector(book)),
+        ("vector, known words", count_vector(book)),
+    ):
+        start_time = time.perf_counter()
+        payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.loads(payload)
+        transfer_seconds = time.perf_counter() - start_time
+        logger.info(
+            f"{label:<19} | {book}: {len(payload) / 1000:>7,.1f} kB, pickled and unpickled "
+            f"in {transfer_seconds * 1000:>6.2f} ms"
+        )
+    logger.info(f"Most common words: {top_words}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
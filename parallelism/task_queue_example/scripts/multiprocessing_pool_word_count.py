@@ -1,26 +1,148 @@
+import sys
 import time
+from collections import Counter
 from multiprocessing import Pool, cpu_count
 from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
 
 from utils import setup_logger
 from word_count_task import count_words
 
-num_processes = cpu_count() - 1
+num_processes = max(cpu_count() - 1, 1)
+# Books larger than this many bytes are split into byte ranges counted by every process, so that a
+# single huge book does not keep one core busy while the others sit idle
+split_threshold = 64 << 20
+# Target number of chunks of work per process, more chunks balance the load better but cost more round
+# trips between the parent and the workers
+chunks_per_process = 4
 logger = setup_logger("multiprocessing_pool")
 project_path = Path(__file__).resolve().parents[1]
 data_path = project_path / "data"
 
 
+def schedule(
+    data_files: List[Path], num_processes: int
+) -> Tuple[List[str], List[str], int]:
+    """
+    Order the books largest first and pick a chunk size for the small ones. The large books start first,
+    one per task, so that the last tasks to finish are small ones and the cores do not sit idle waiting for
+    a straggler. The small books are sent in chunks of about the same number of bytes as a large book, so
+    that the round trips to the workers do not dominate.
+
+    Parameters
+    ----------
+    data_files : List[Path]
+        The books to count, none larger than `split_threshold`.
+    num_processes : int
+        The number of processes of the pool.
+
+    Returns
+    -------
+    Tuple[List[str], List[str], int]
+        The large and the small books, both largest first, and the chunk size for the small books.
+    """
+    sizes = {path.name: path.stat().st_size for path in data_files}
+    books = sorted(sizes, key=sizes.__getitem__, reverse=True)
+    # Each chunk of work should take about this many bytes
+    target_size = sum(sizes.values()) / (num_processes * chunks_per_process)
+    large_books = [book for book in books if sizes[book] >= target_size]
+    small_books = books[len(large_books) :]
+    if not small_books:
+        return large_books, small_books, 1
+    mean_size = sum(sizes[book] for book in small_books) / len(small_books)
+    # Still spread the small books over every process, however small they are
+    chunksize = min(
+        int(target_size // max(mean_size, 1)), -(-len(small_books) // num_processes)
+    )
+    return large_books, small_books, max(1, chunksize)
+
+
+def count_chunk(books: List[str]) -> List[Dict[str, int]]:
+    """
+    Count the words of a chunk of books in a worker, see `count_words`.
+
+    Parameters
+    ----------
+    books : List[str]
+        The books of the chunk.
+
+    Returns
+    -------
+    List[Dict[str, int]]
+        The word counts of each book, in the order of `books`.
+    """
+    return [count_words(book) for book in books]
+
+
+def count_books(
+    pool, large_books: List[str], small_books: List[str], chunksize: int
+) -> Iterator[Dict[str, int]]:
+    """
+    Count the words of the books in the pool, yielding the results as they complete rather than in order.
+    Each large book is a chunk of its own and the small books are grouped `chunksize` per chunk, then every
+    chunk goes through a single `imap_unordered`, so the large books are dispatched first, and the result
+    of a small book is not held back until every large book is done.
+
+    Parameters
+    ----------
+    pool : multiprocessing.pool.Pool
+        The pool of worker processes.
+    large_books : List[str]
+        The books sent one per task, largest first.
+    small_books : List[str]
+        The books sent `chunksize` per task.
+    chunksize : int
+        The number of small books per task.
+
+    Yields
+    ------
+    Dict[str, int]
+        The word counts of each book.
+    """
+    chunks = [[book] for book in large_books] + [
+        small_books[start : start + chunksize]
+        for start in range(0, len(small_books), chunksize)
+    ]
+    for chunk_counts in pool.imap_unordered(count_chunk, chunks):
+        yield from chunk_counts
+
+
 def main() -> int:
-    logger.info(f"Running word count task with {num_processes} num_processes")
-    data_files = list(path.name for path in data_path.rglob("*.txt"))
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else num_processes
+    logger.info(f"Running word count task with {processes} num_processes")
+    data_files = list(data_path.rglob("*.txt"))
+    split_files = [path for path in data_files if path.stat().st_size > split_threshold]
+    pool_files = [path for path in data_files if path.stat().st_size <= split_threshold]
+    large_books, small_books, chunksize = schedule(pool_files, processes)
+    logger.info(
+        f"Scheduling {len(large_books)} large books one per task and {len(small_books)} small books "
+        f"{chunksize} per task"
+    )
 
     start_time = time.time()
-    with Pool(num_processes) as pool:
-        # Map is blocking and will not return until all tasks are complete, so there is no need to call pool.close and pool.join
-        pool.map(count_words, data_files)
+    # Each book only returns its most common words, so their sum is not a corpus count, see
+    # `multiprocessing_aggregate_word_count.py` for one
+    top_words_counter: Counter = Counter()
+    # The daemonic workers of the pool cannot start processes, so the huge books are split from here,
+    # first, since they take the longest
+    for path in sorted(split_files, key=lambda path: path.stat().st_size, reverse=True):
+        top_words_counter.update(count_words(path.name, processes))
+    with Pool(processes) as pool:
+        # Merge the results as they stream back, instead of waiting for the slowest book
+        for completed, word_counts in enumerate(
+            count_books(pool, large_books, small_books, chunksize), start=1
+        ):
+            top_words_counter.update(word_counts)
+            logger.info(f"Merged {completed} of {len(pool_files)} books")
+        # Let the workers exit on their own, so that they flush their buffered results, instead of being
+        # terminated when the pool exits
+        pool.close()
+        pool.join()
 
     logger.info(f"Word count task completed in {time.time() - start_time:.2f} seconds")
+    logger.info(
+        f"Sum of the per-book top words: {dict(top_words_counter.most_common(10))}"
+    )
     return 0
 
 
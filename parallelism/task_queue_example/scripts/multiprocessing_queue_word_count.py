@@ -1,16 +1,24 @@
 import logging
 import os
 import time
+from collections import Counter
+from itertools import chain, repeat
 from multiprocessing import Process, Queue, cpu_count, get_logger
 from pathlib import Path
 from queue import Empty
-from typing import List
+from typing import Dict, List, Optional
 
 from utils import setup_logger
 from word_count_task import count_words
 
-num_processes = cpu_count() - 1
+num_processes = max(cpu_count() - 1, 1)
 book_multipler = 10
+# Maximum number of books waiting in the task queue, and of results waiting in the result queue
+queue_size = 2 * num_processes
+# Tells a consumer to stop, and the aggregator that a consumer stopped, None survives pickling as itself
+sentinel = None
+# Number of seconds the aggregator waits for a result before checking that every process is alive
+liveness_interval = 1.0
 project_path = Path(__file__).resolve().parents[1]
 data_path = project_path / "data"
 
@@ -36,87 +44,167 @@ def setup_multiprocessing_logger(process_id: int) -> logging.Logger:
     return logger
 
 
-def process_tasks(task_queue: Queue) -> bool:
+def produce(
+    task_queue: Queue, books: List[str], multiplier: int, num_consumers: int
+) -> None:
     """
-    Process tasks from the queue until it is empty. Process means counting the words in a book,
-    not including any stop words.
+    Stream `multiplier` copies of the books to the task queue, then one sentinel per consumer. The queue
+    is bounded, so `put` blocks while the consumers are behind: the producer never holds more than
+    `queue_size` books in the queue, however long the stream of books is. The stream is built here rather
+    than passed in, since an iterator cannot be pickled to a process started with spawn.
 
     Parameters
     ----------
     task_queue : Queue
-        The queue to process tasks from.
+        The bounded queue to enqueue tasks to.
+    books : List[str]
+        The books (filenames) to enqueue.
+    multiplier : int
+        The number of times the books are enqueued.
+    num_consumers : int
+        The number of consumers, each stops at the first sentinel it dequeues.
+    """
+    process_id = os.getpid()
+    logger = setup_multiprocessing_logger(process_id)
+    for book in chain.from_iterable(repeat(books, multiplier)):
+        # Block if necessary until a free slot is available, never raise a Full exception
+        task_queue.put(obj=book, block=True, timeout=None)
+        logger.info(f"Process ID: {process_id} | Enqueued {book}")
+    for _ in range(num_consumers):
+        task_queue.put(obj=sentinel, block=True, timeout=None)
 
-    Returns
-    -------
-    bool
-        True to indicate that all tasks have been processed.
+
+def process_tasks(task_queue: Queue, result_queue: Queue) -> None:
+    """
+    Process tasks from the queue until the sentinel is dequeued. Process means counting the words in a
+    book, not including any stop words. The consumer blocks while the queue is empty, so books enqueued
+    late are still processed, and forwards the sentinel to the result queue when it stops.
+
+    Parameters
+    ----------
+    task_queue : Queue
+        The queue to process tasks from.
+    result_queue : Queue
+        The queue the word counts of each book are sent to, None if the book could not be processed.
     """
     process_id = os.getpid()
     logger = setup_multiprocessing_logger(process_id)
     logger.info(f"Process ID: {process_id} | Starting process_tasks")
-    while True:
+    while (book := task_queue.get(block=True)) is not sentinel:
+        logger.info(f"Process ID: {process_id} | Dequeued {book}")
         try:
-            book = task_queue.get(block=False)
-            logger.info(f"Process ID: {process_id} | Dequeued {book}")
-            count_words(book)
-        except Empty:
-            logger.info(f"Process ID: {process_id} | Queue is empty")
-            break
+            word_counts: Optional[Dict[str, int]] = count_words(book)
         except Exception as error:
-            # No break here, continue processing the rest of the queue
+            # Continue processing the rest of the queue
             logger.error(f"Process ID: {process_id} | Error processing book: {error}")
-    return True
-
-
-def enque(task_queue: Queue, books: List[str], logger: logging.Logger) -> Queue:
+            word_counts = None
+        result_queue.put(obj=(book, word_counts), block=True, timeout=None)
+    logger.info(f"Process ID: {process_id} | Received the sentinel")
+    result_queue.put(obj=sentinel, block=True, timeout=None)
+
+
+def aggregate(
+    result_queue: Queue,
+    num_consumers: int,
+    processes: List[Process],
+    logger: logging.Logger,
+) -> Counter:
     """
-    Enqueue books to the task queue, multiplying by the book multiplier.
+    Merge the most common words of each book sent by the consumers as they arrive, until every consumer
+    has sent its sentinel. Only the running totals are kept, so memory does not grow with the number of
+    books.
+    Whenever no result arrives for `liveness_interval` seconds, the processes are checked: if one of
+    them died, e.g., killed by the OOM killer or on an uncaught exception, the sentinels it owed would
+    never come, so the aggregation fails instead of waiting forever.
 
     Parameters
     ----------
-    task_queue : Queue
-        The queue to enqueue tasks to.
-    books : List[str]
-        The list of books (filenames) to enqueue.
+    result_queue : Queue
+        The queue to receive the word counts from.
+    num_consumers : int
+        The number of consumers sending results.
+    processes : List[Process]
+        The producer and the consumers, checked while no result arrives.
     logger : logging.Logger
         The logger instance for the main process.
 
     Returns
     -------
-    Queue
-        The task queue with the books enqueued.
+    Counter
+        The sum of the most common words of each book processed. A word outside the top k of a book
+        contributes nothing for that book, so this is not a corpus count, which
+        `multiprocessing_aggregate_word_count.py` computes instead.
+
+    Raises
+    ------
+    ChildProcessError
+        If a process exited with a non-zero exit code before every consumer sent its sentinel.
     """
-
-    # Enqueue (len(books) x book_multipler) books to the task queue
-    for i in range(book_multipler):
-        for book in books:
-            # Block if necessary until a free slot is available, never raise a Full exception
-            task_queue.put(obj=book, block=True, timeout=None)
-            logger.info(f"Enqueued {book}")
-    return task_queue
+    top_words_counter: Counter = Counter()
+    processed = failed = 0
+    while num_consumers:
+        try:
+            result = result_queue.get(block=True, timeout=liveness_interval)
+        except Empty:
+            dead = [process for process in processes if process.exitcode]
+            if dead:
+                raise ChildProcessError(
+                    ", ".join(
+                        f"{process.name} exited with {process.exitcode}"
+                        for process in dead
+                    )
+                )
+            continue
+        if result is sentinel:
+            num_consumers -= 1
+            continue
+        book, word_counts = result
+        if word_counts is None:
+            failed += 1
+            continue
+        top_words_counter.update(word_counts)
+        processed += 1
+    logger.info(f"Aggregated the top words of {processed} books, {failed} failed")
+    return top_words_counter
 
 
 def main() -> int:
     # Logger for the main process
     logger = setup_logger("multiprocessing_queue_word_count")
-    # Get all books
+    # Get all books, the producer repeats them lazily
     books = list(path.name for path in data_path.rglob("*.txt"))
-    # Infinite size queue
-    task_queue: Queue = Queue()
-    task_queue = enque(task_queue, books, logger)
+    task_queue: Queue = Queue(maxsize=queue_size)
+    result_queue: Queue = Queue(maxsize=queue_size)
 
-    processes = []
     start_time = time.time()
-    for _ in range(num_processes):
-        process = Process(target=process_tasks, args=(task_queue,))
-        # Add the process to the list of child processes
-        processes.append(process)
-        # Start the process
+    # The consumers start at once and process the books while they are being produced
+    consumers = [
+        Process(target=process_tasks, args=(task_queue, result_queue))
+        for _ in range(num_processes)
+    ]
+    producer = Process(
+        target=produce, args=(task_queue, books, book_multipler, num_processes)
+    )
+    for process in [*consumers, producer]:
         process.start()
-    # Main process will wait for all child processes to complete
-    for process in processes:
+    # Drain the result queue before joining, a process does not exit while it has data to flush to a queue
+    try:
+        top_words_counter = aggregate(
+            result_queue, num_processes, [producer, *consumers], logger
+        )
+    except ChildProcessError as error:
+        logger.error(f"Word count task failed: {error}")
+        # The survivors may be blocked on a queue nobody will ever read or write again
+        for process in [producer, *consumers]:
+            process.terminate()
+            process.join()
+        return 1
+    for process in [producer, *consumers]:
         process.join()
     logger.info(f"Word count task completed in {time.time() - start_time:.2f} seconds")
+    logger.info(
+        f"Sum of the per-book top words: {dict(top_words_counter.most_common(10))}"
+    )
 
     return 0
 
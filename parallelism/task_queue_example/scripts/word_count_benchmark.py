@@ -0,0 +1,86 @@
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from utils import setup_logger
+from word_count_task import count_tokens, data_path, get_stop_words
+
+# Number of copies of each book in the corpus, 100 copies of the bundled books is about 200 MB
+scale = 100
+# Number of processes counting the byte ranges of the corpus in parallel
+num_processes = os.cpu_count() or 1
+logger = setup_logger("word_count_benchmark")
+
+
+def count_by_line(data_file: Path) -> Counter:
+    """
+    Count the raw whitespace-separated tokens of a file line by line, then delete the stop words, as
+    `count_words` used to.
+
+    Parameters
+    ----------
+    data_file : Path
+        The path of the file.
+
+    Returns
+    -------
+    Counter
+        The count of each token.
+    """
+    word_counter: Counter = Counter()
+    with open(data_file, "r") as file:
+        for line in file:
+            word_counter.update(line.split())
+    for stop_word in get_stop_words():
+        del word_counter[stop_word]
+    return word_counter
+
+
+def main() -> int:
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else scale
+    books = [path.read_bytes() for path in sorted(data_path.rglob("*.txt"))]
+    with tempfile.TemporaryDirectory() as directory:
+        corpus_file = Path(directory) / "corpus.txt"
+        with open(corpus_file, "wb") as file:
+            for _ in range(copies):
+                for book in books:
+                    file.write(book)
+        size = corpus_file.stat().st_size
+        logger.info(f"Counting the words of {copies} copies of {len(books)} books")
+
+        start_time = time.perf_counter()
+        by_line = count_by_line(corpus_file)
+        line_seconds = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        by_block = count_tokens(corpus_file)
+        block_seconds = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        by_range = count_tokens(corpus_file, num_processes=num_processes)
+        range_seconds = time.perf_counter() - start_time
+
+    # Case folding and punctuation stripping merge the variants of each word
+    logger.info(f"{len(by_line):,} raw tokens | {len(by_block):,} normalized words")
+    # The merged counts must equal the serial ones, down to the order of the ties
+    if list(by_range.items()) != list(by_block.items()):
+        logger.error("The serial and parallel counts differ")
+        return 1
+    for label, seconds in (
+        ("line by line", line_seconds),
+        ("mmap blocks", block_seconds),
+        (f"{num_processes} processes", range_seconds),
+    ):
+        logger.info(
+            f"{label:<12} | {seconds:>6.2f} s | {size / seconds / 1e6:>7,.1f} MB/s | "
+            f"speedup {line_seconds / seconds:.1f}x"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils import setup_logger
+
+# Number of fresh interpreters per measurement, the median is reported
+repeats = 5
+# Number of slowest imports listed
+num_slowest = 10
+scripts_path = Path(__file__).resolve().parent
+logger = setup_logger("word_count_import_benchmark")
+
+
+def import_times(statement: str) -> Optional[Dict[str, int]]:
+    """
+    Run a statement in a fresh interpreter with `-X importtime` and parse the report it prints to stderr.
+
+    Parameters
+    ----------
+    statement : str
+        The statement to run, e.g., `import word_count_task`.
+
+    Returns
+    -------
+    Optional[Dict[str, int]]
+        The cumulative import time of each module in microseconds, or None if the statement failed.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=scripts_path,
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:
+        return None
+    times: Dict[str, int] = {}
+    # Each line reads "import time: <self us> | <cumulative us> | <indented module name>"
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def measure(statement: str, module: str) -> Optional[List[int]]:
+    """
+    Measure the cumulative import time of a module over `repeats` fresh interpreters.
+
+    Parameters
+    ----------
+    statement : str
+        The statement that imports the module.
+    module : str
+        The name of the module to report.
+
+    Returns
+    -------
+    Optional[List[int]]
+        The import time of the module in microseconds for each run, or None if it cannot be imported.
+    """
+    # The first run compiles the bytecode caches, it is not representative of a worker startup
+    if import_times(statement) is None:
+        return None
+    runs = []
+    for _ in range(repeats):
+        times = import_times(statement)
+        if times is None:
+            return None
+        runs.append(times[module])
+    return runs
+
+
+def main() -> int:
+    logger.info(f"Median import time over {repeats} fresh interpreters")
+    for label, statement, module in (
+        ("word_count_task", "import word_count_task", "word_count_task"),
+        # The cost every worker paid at startup when the stop words were loaded at import time
+        ("nltk", "import nltk.corpus", "nltk.corpus"),
+    ):
+        runs = measure(statement, module)
+        if runs is None:
+            logger.info(f"{label:<16} | not installed")
+            continue
+        logger.info(f"{label:<16} | {statistics.median(runs) / 1000:>8,.1f} ms")
+
+    times = import_times("import word_count_task")
+    if times is None:
+        logger.error("word_count_task cannot be imported")
+        return 1
+    logger.info("Slowest imports of word_count_task, cumulative")
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)
+    for module, cumulative in slowest[:num_slowest]:
+        logger.info(f"{module:<32} | {cumulative / 1000:>8,.1f} ms")
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
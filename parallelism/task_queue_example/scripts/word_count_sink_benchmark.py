@@ -0,0 +1,37 @@
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from utils import setup_logger
+from word_count_task import create_sink
+
+num_results = 10_000
+logger = setup_logger("word_count_sink_benchmark")
+
+
+def main() -> int:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else num_results
+    # A typical result, the top 20 words of a book
+    data = json.dumps({f"word{index}": 1000 - index for index in range(20)})
+    logger.info(f"Saving {count:,} results")
+    for kind in ("file", "jsonl", "sqlite"):
+        with tempfile.TemporaryDirectory() as directory:
+            sink = create_sink(kind, Path(directory))
+            start_time = time.perf_counter()
+            for index in range(count):
+                sink.write(f"book{index % 40}.txt", data)
+            sink.flush()
+            seconds = time.perf_counter() - start_time
+            num_files = sum(1 for _ in Path(directory).iterdir())
+        logger.info(
+            f"{kind:<6} | {seconds:>6.2f} s | {count / seconds:>9,.0f} results/s | "
+            f"{num_files:>6,} files"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    main()
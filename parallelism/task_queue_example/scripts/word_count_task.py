@@ -1,31 +1,415 @@
+import hashlib
+import heapq
 import json
+import mmap
 import os
+import re
+import string
 import sys
+import threading
+import time
+import unicodedata
 import uuid
-from collections import Counter
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache, reduce
+from itertools import filterfalse, repeat
+from multiprocessing.util import Finalize
+from operator import itemgetter
 from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
-import nltk
-from nltk.corpus import stopwords
 from utils import setup_logger
 
-try:
-    nltk.data.find("corpora/stopwords")
-except LookupError:
-    nltk.download("stopwords")
-finally:
-    stop_words = set(stopwords.words("english"))
+if TYPE_CHECKING:
+    import sqlite3
 
 project_path = Path(__file__).resolve().parents[1]
 data_path = project_path / "data"
 output_path = project_path / "output"
+# Plain-text copy of the NLTK stop words, one per line, so that workers do not have to import NLTK
+stop_words_path = project_path / "cache" / "stopwords-english.txt"
+# Word counts cached by content hash, so repeated tasks on the same book are not recomputed
+results_path = project_path / "cache" / "results"
+# Bump when the counting rules change, so that the results cached with the old rules are not reused
+cache_version = 1
+# Number of bytes tokenized at once, large enough to amortize the per-block overhead and small enough
+# for the tokens of a block to stay in cache while they are counted
+block_size = 1 << 20
+# The ASCII whitespace `bytes.split` splits on, blocks end right before one of these bytes
+whitespace = re.compile(rb"\s")
+# Lowercase the ASCII letters and turn dashes into spaces, so "Well--known" counts as "well" and "known"
+ascii_table = bytes.maketrans(
+    string.ascii_uppercase.encode() + b"-", string.ascii_lowercase.encode() + b" "
+)
+# The rest of the ASCII punctuation is deleted, so "Don't" counts as "dont"
+ascii_punctuation = string.punctuation.replace("-", "").encode()
 
 logger = setup_logger(name="word_count_task")
 
 
+class PunctuationTable(dict):
+    """
+    A `str.translate` table that applies the same rules as `ascii_table` and `ascii_punctuation` to the
+    rest of Unicode: dashes become spaces and the other punctuation characters are deleted. Building the
+    table for every code point up front would take longer than counting a book, so the entries are looked
+    up with `unicodedata` the first time a character is seen and cached.
+    """
+
+    def __init__(self) -> None:
+        super().__init__({ord("-"): " "})
+        self.update(dict.fromkeys(ascii_punctuation))
+
+    def __missing__(self, code_point: int) -> Optional[str]:
+        category = unicodedata.category(chr(code_point))
+        if category == "Pd":
+            value: Optional[str] = " "
+        elif category.startswith("P"):
+            value = None
+        else:
+            value = chr(code_point)
+        self[code_point] = value
+        return value
+
+
+punctuation_table = PunctuationTable()
+
+
+def normalize(text: str) -> List[str]:
+    """
+    Case-fold a string, strip its punctuation and split it into words, the rules `count_range` applies to
+    the ASCII bytes of a file.
+
+    Parameters
+    ----------
+    text : str
+        The string to normalize, e.g., a token.
+
+    Returns
+    -------
+    List[str]
+        The normalized words, empty if the string is only punctuation.
+    """
+    return text.casefold().translate(punctuation_table).split()
+
+
+@cache
+def get_stop_words() -> FrozenSet[str]:
+    """
+    Load the English stop words, once per process and only when they are first needed. Importing NLTK takes
+    hundreds of milliseconds, so the words are read from `stop_words_path`, and NLTK is only used, and the
+    corpus downloaded if needed, to create that file the first time.
+
+    Returns
+    -------
+    FrozenSet[str]
+        The English stop words.
+    """
+    try:
+        return frozenset(stop_words_path.read_text().split())
+    except FileNotFoundError:
+        pass
+
+    import nltk
+    from nltk.corpus import stopwords
+
+    try:
+        nltk.data.find("corpora/stopwords")
+    except LookupError:
+        nltk.download("stopwords")
+    stop_words = frozenset(stopwords.words("english"))
+    # Several processes may create the file at once, the rename makes each write atomic
+    stop_words_path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = stop_words_path.with_suffix(f".{os.getpid()}.tmp")
+    temporary_path.write_text("\n".join(sorted(stop_words)) + "\n")
+    os.replace(temporary_path, stop_words_path)
+    logger.info(f"Process ID: {os.getpid()} | Cached stop words in {stop_words_path}")
+    return stop_words
+
+
+@cache
+def get_encoded_stop_words() -> FrozenSet[bytes]:
+    """
+    Get the stop words as they are counted, normalized and encoded, so that they are filtered before
+    decoding.
+
+    Returns
+    -------
+    FrozenSet[bytes]
+        The normalized and encoded stop words.
+    """
+    return frozenset(
+        word.encode() for stop_word in get_stop_words() for word in normalize(stop_word)
+    )
+
+
+@cache
+def get_stop_words_digest() -> bytes:
+    """
+    Hash the stop words, which are part of the key of the cached results.
+
+    Returns
+    -------
+    bytes
+        The BLAKE2b digest of the sorted stop words.
+    """
+    return hashlib.blake2b("\n".join(sorted(get_stop_words())).encode()).digest()
+
+
+class ResultSink(ABC):
+    """
+    Where `save_file` writes the results. Subclasses may buffer the results, `flush` writes them out.
+    """
+
+    @abstractmethod
+    def write(self, filename: str, data: str) -> None:
+        """
+        Save a result.
+
+        Parameters
+        ----------
+        filename : str
+            The name of the file the result is about.
+        data : str
+            The string representation of the result.
+        """
+
+    def flush(self) -> None:
+        """
+        Write out the buffered results, if any.
+        """
+
+
+class FileSink(ResultSink):
+    """
+    Writes each result to a new file with a random ID in its name, one open, write and close per result.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Initialize the FileSink instance.
+
+        Parameters
+        ----------
+        path : Path
+            The directory the files are written to.
+        """
+        self.path: Path = path
+
+    def write(self, filename: str, data: str) -> None:
+        # Random 32-character hexadecimal string
+        random_id = uuid.uuid4().hex
+        output_file = self.path / f"{filename}_{random_id}.txt"
+        with open(output_file, "w") as file:
+            file.write(data)
+
+
+class BufferedSink(ResultSink):
+    """
+    Buffers the results of a process in memory and writes them in bulk every `batch_size` results, and
+    when the process exits. A timer also flushes the buffer `flush_interval` seconds after its first
+    result, so the results of a process that goes idle, e.g., a worker waiting on an empty queue, are
+    not held back until the next batch fills or the process exits. Processes started by
+    `multiprocessing` exit without running `atexit` handlers, so the last flush is registered as a
+    `multiprocessing` finalizer, which runs when a `Process` target returns, when a `Pool` is closed and
+    joined (not terminated), and at interpreter exit.
+    """
+
+    def __init__(
+        self, path: Path, batch_size: int = 100, flush_interval: float = 5.0
+    ) -> None:
+        """
+        Initialize the BufferedSink instance.
+
+        Parameters
+        ----------
+        path : Path
+            The directory the results are written to.
+        batch_size : int
+            The number of buffered results that triggers a flush.
+        flush_interval : float
+            The maximum number of seconds a result stays buffered.
+        """
+        self.path: Path = path
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        self.buffer: List[Tuple[str, str, str, float]] = []
+        # The timer flushes from its own thread, the lock keeps it from racing with `write`
+        self.lock: threading.Lock = threading.Lock()
+        self.timer: Optional[threading.Timer] = None
+        # Forked children inherit the sink, the process ID tells whose buffer it is
+        self.process_id: Optional[int] = None
+
+    def write(self, filename: str, data: str) -> None:
+        if self.process_id != os.getpid():
+            # Neither the lock nor the timer thread of the parent survive a fork
+            self.process_id = os.getpid()
+            self.buffer = []
+            self.lock = threading.Lock()
+            self.timer = None
+            Finalize(self, self.flush, exitpriority=10)
+        with self.lock:
+            self.buffer.append((uuid.uuid4().hex, filename, data, time.time()))
+            if len(self.buffer) >= self.batch_size:
+                self._flush()
+            elif self.timer is None:
+                self.timer = threading.Timer(self.flush_interval, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self) -> None:
+        if self.process_id == os.getpid():
+            with self.lock:
+                self._flush()
+
+    def _flush(self) -> None:
+        """
+        Write out the buffered results and cancel the pending timer, with the lock held.
+        """
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if self.buffer:
+            self.write_batch(self.buffer)
+            self.buffer = []
+
+    @abstractmethod
+    def write_batch(self, batch: List[Tuple[str, str, str, float]]) -> None:
+        """
+        Write out a batch of results.
+
+        Parameters
+        ----------
+        batch : List[Tuple[str, str, str, float]]
+            The random ID, filename, data and UNIX time of each result.
+        """
+
+
+class JsonLinesSink(BufferedSink):
+    """
+    Appends the results of each process to its own JSON Lines file, one object per result with the keys
+    `id`, `filename`, `data` and `time`. A file per process needs no locking, and a flush is a single
+    append, so there is no file to create per result.
+    """
+
+    def write_batch(self, batch: List[Tuple[str, str, str, float]]) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        lines = "".join(
+            json.dumps(
+                {"id": result_id, "filename": filename, "data": data, "time": created}
+            )
+            + "\n"
+            for result_id, filename, data, created in batch
+        )
+        with open(self.path / f"results_{os.getpid()}.jsonl", "a") as file:
+            file.write(lines)
+
+
+class SqliteSink(BufferedSink):
+    """
+    Inserts the results of every process into the `results` table of a single SQLite database, one
+    transaction per flush. The database is in WAL mode, so readers do not block the writers, and the
+    writers of different processes wait for each other for up to `timeout` seconds. Each process opens
+    its own connection once, since connecting and setting up the database costs more than a flush.
+    """
+
+    timeout = 30.0
+
+    def __init__(
+        self, path: Path, batch_size: int = 100, flush_interval: float = 5.0
+    ) -> None:
+        super().__init__(path, batch_size, flush_interval)
+        self.connection: Optional["sqlite3.Connection"] = None
+        self.connection_process_id: Optional[int] = None
+
+    def connect(self) -> "sqlite3.Connection":
+        """
+        Get the connection of this process, opening it and creating the table on first use.
+
+        Returns
+        -------
+        sqlite3.Connection
+            The connection to the database.
+        """
+        # A connection must not be used across a fork
+        if self.connection is None or self.connection_process_id != os.getpid():
+            # Imported on first use, so that the other sinks do not pay for it at import time
+            import sqlite3
+
+            self.path.mkdir(parents=True, exist_ok=True)
+            # The timer of `BufferedSink` flushes from another thread, `lock` serializes the writes
+            connection = sqlite3.connect(
+                self.path / "results.sqlite",
+                timeout=self.timeout,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            # In WAL mode, a crash can lose the last transactions but cannot corrupt the database
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(id TEXT PRIMARY KEY, filename TEXT, data TEXT, time REAL)"
+            )
+            self.connection = connection
+            self.connection_process_id = os.getpid()
+        return self.connection
+
+    def write_batch(self, batch: List[Tuple[str, str, str, float]]) -> None:
+        connection = self.connect()
+        # The context manager commits the transaction, it does not close the connection
+        with connection:
+            connection.executemany("INSERT INTO results VALUES (?, ?, ?, ?)", batch)
+
+
+def create_sink(kind: str, path: Path) -> ResultSink:
+    """
+    Create a result sink.
+
+    Parameters
+    ----------
+    kind : str
+        `file` for one file per result, `jsonl` for a JSON Lines file per process or `sqlite` for a single
+        SQLite database.
+    path : Path
+        The directory the results are written to.
+
+    Returns
+    -------
+    ResultSink
+        The sink.
+
+    Raises
+    ------
+    ValueError
+        If the kind of sink is unknown.
+    """
+    sinks: Dict[str, Callable[[Path], ResultSink]] = {
+        "file": FileSink,
+        "jsonl": JsonLinesSink,
+        "sqlite": SqliteSink,
+    }
+    if kind not in sinks:
+        raise ValueError(f"Unknown sink {kind!r}, expected one of {sorted(sinks)}")
+    return sinks[kind](path)
+
+
+# The results are written to the output directory, to a JSON Lines file per process by default
+result_sink = create_sink(os.environ.get("WORD_COUNT_SINK", "jsonl"), output_path)
+
+
 def save_file(filename: str, data: str) -> None:
     """
-    Save data to a file with a random ID in the filename.
+    Save data with a random ID to the output directory, through `result_sink`.
 
     Parameters
     ----------
@@ -36,43 +420,545 @@ def save_file(filename: str, data: str) -> None:
 
     Notes
     -----
-    The function saves the data to a file in the output directory with a random ID
+    Set the `WORD_COUNT_SINK` environment variable to `file` to save each result to its own file with a
+    random ID in its name, or to `sqlite` to save all the results to a single SQLite database.
     """
-    # Random 32-character hexadecimal string
-    random_id = uuid.uuid4().hex
-    output_file = output_path / f"{filename}_{random_id}.txt"
-    with open(output_file, "w") as file:
-        file.write(data)
+    result_sink.write(filename, data)
 
 
-def count_words(filename: str) -> None:
+def iter_blocks(
+    data: mmap.mmap, start: int, stop: int, block_size: int = block_size
+) -> Iterator[Tuple[int, int]]:
     """
-    Count the words in a file and save the top 20 most common words, not including any stop words.
+    Split a byte range into blocks of about `block_size` bytes that end on whitespace, so that no token
+    spans two blocks.
+
+    Parameters
+    ----------
+    data : mmap.mmap
+        The memory-mapped file.
+    start : int
+        The offset of the first byte of the range.
+    stop : int
+        The offset right after the last byte of the range, which must be the end of the file or whitespace.
+    block_size : int
+        The target number of bytes per block.
+
+    Yields
+    ------
+    Tuple[int, int]
+        The start and stop offsets of each block.
+    """
+    while start < stop:
+        end = start + block_size
+        if end >= stop:
+            end = stop
+        else:
+            # Extend the block to the next whitespace, or to the end of the range if there is none
+            match = whitespace.search(data, end, stop)
+            end = match.start() if match else stop
+        yield start, end
+        start = end
+
+
+def count_range(
+    data_file: Path, start: int, stop: int, block_size: int = block_size
+) -> Counter:
+    """
+    Count the words of a byte range of a file as bytes, not including any stop words. The file is
+    memory-mapped and each block is lowercased, stripped of its ASCII punctuation, split and filtered in
+    the same pass over the tokens: `bytes.translate` and `bytes.split` run in C, and the counter is updated
+    once per block instead of once per line. The tokens are not decoded, only the tokens that survive
+    need to be, and the ones with non-ASCII bytes are normalized by `merge_non_ascii` after counting.
+
+    Parameters
+    ----------
+    data_file : Path
+        The path of the file.
+    start : int
+        The offset of the first byte of the range, which must be the start of the file or whitespace.
+    stop : int
+        The offset right after the last byte of the range, which must be the end of the file or whitespace.
+    block_size : int
+        The number of bytes tokenized at once.
+
+    Returns
+    -------
+    Counter
+        The count of each token, as bytes, not including any stop words, in the order the tokens first
+        occur.
+    """
+    token_counter: Counter = Counter()
+    # An empty file cannot be memory-mapped
+    if start >= stop:
+        return token_counter
+    encoded_stop_words = get_encoded_stop_words()
+    with open(data_file, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for block_start, block_stop in iter_blocks(data, start, stop, block_size):
+                tokens = (
+                    data[block_start:block_stop]
+                    .translate(ascii_table, ascii_punctuation)
+                    .split()
+                )
+                token_counter.update(
+                    filterfalse(encoded_stop_words.__contains__, tokens)
+                )
+    return token_counter
+
+
+def split_ranges(data_file: Path, num_ranges: int) -> List[Tuple[int, int]]:
+    """
+    Split a file into at most `num_ranges` byte ranges of similar sizes that end on whitespace, and of at
+    least `block_size` bytes, so that small files are not split.
+
+    Parameters
+    ----------
+    data_file : Path
+        The path of the file.
+    num_ranges : int
+        The maximum number of ranges.
+
+    Returns
+    -------
+    List[Tuple[int, int]]
+        The start and stop offsets of each range, in file order.
+    """
+    size = data_file.stat().st_size
+    if size == 0:
+        return [(0, 0)]
+    range_size = max(block_size, -(-size // num_ranges))
+    with open(data_file, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return list(iter_blocks(data, 0, size, range_size))
+
+
+def merge_counters(left: Counter, right: Counter) -> Counter:
+    """
+    Add the counts of a counter to the counter of the preceding range.
+
+    Parameters
+    ----------
+    left : Counter
+        The counter of the preceding range, updated in place.
+    right : Counter
+        The counter of the following range.
+
+    Returns
+    -------
+    Counter
+        The merged counter, whose new keys are appended after the keys of `left`.
+    """
+    left.update(right)
+    return left
+
+
+def merge_non_ascii(token_counter: Counter) -> Counter:
+    """
+    Normalize the tokens with non-ASCII bytes, which `count_range` only lowercased and stripped of ASCII
+    punctuation, e.g., "“Elizabeth" or "Æsop", and merge their counts into the normalized words. This
+    runs once per distinct token rather than once per occurrence.
+
+    Parameters
+    ----------
+    token_counter : Counter
+        The count of each token, as bytes, updated in place.
+
+    Returns
+    -------
+    Counter
+        The count of each normalized word, as bytes, not including any stop words.
+    """
+    encoded_stop_words = get_encoded_stop_words()
+    for token in [token for token in token_counter if not token.isascii()]:
+        count = token_counter.pop(token)
+        for word in normalize(token.decode()):
+            encoded_word = word.encode()
+            if encoded_word not in encoded_stop_words:
+                token_counter[encoded_word] += count
+    return token_counter
+
+
+def count_tokens(
+    data_file: Path, block_size: int = block_size, num_processes: int = 1
+) -> Counter:
+    """
+    Count the normalized words of a file as bytes, not including any stop words, see `count_range`. With
+    more than one process, the file is split into byte ranges aligned to whitespace, which are counted in
+    parallel. The parent merges their counters in file order as they arrive: each counter is pickled once
+    on its way back, and since the left counter is always the one updated, the keys are in the order they
+    first occur in the file, so the result is the same as the one of a serial pass, ties included.
+
+    Parameters
+    ----------
+    data_file : Path
+        The path of the file.
+    block_size : int
+        The number of bytes tokenized at once.
+    num_processes : int
+        The number of processes counting the ranges of the file.
+
+    Returns
+    -------
+    Counter
+        The count of each word, as bytes.
+    """
+    ranges = split_ranges(data_file, num_processes)
+    if len(ranges) == 1:
+        return merge_non_ascii(count_range(data_file, *ranges[0], block_size))
+    starts, stops = zip(*ranges)
+    with ProcessPoolExecutor(max_workers=min(num_processes, len(ranges))) as executor:
+        counters = executor.map(
+            count_range, repeat(data_file), starts, stops, repeat(block_size)
+        )
+        return merge_non_ascii(reduce(merge_counters, counters))
+
+
+class ResultCache(object):
+    """
+    A content-addressed cache of word counts, shared by the processes of a machine through a directory.
+    Each result is a JSON file named after the hash of the content of the book and of the parameters of
+    the count, so a renamed copy of a book hits the cache and an edited book misses it. The least recently
+    used results are evicted beyond `max_entries`, the modification time of a file being its last use.
+
+    Duplicate tasks in flight at the same time are collapsed: the first process to miss creates a lock
+    file and computes the result, while the others wait for the result instead of computing it too. The
+    lock is kept fresh by a heartbeat while the result is computed, so it can expire soon after its holder
+    died however long the computation takes. It holds a token unique to its holder, which only releases
+    the lock if it still holds its token, so a holder that was slow rather than dead never releases the
+    lock of the process that took it over.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = 256,
+        lock_timeout: float = 10,
+        poll_interval: float = 0.01,
+    ) -> None:
+        """
+        Initialize the ResultCache instance.
+
+        Parameters
+        ----------
+        path : Path
+            The directory the results are stored in.
+        max_entries : int
+            The maximum number of results kept.
+        lock_timeout : float
+            The number of seconds after the last heartbeat of a lock after which it is considered
+            abandoned by a process that died, and taken over.
+        poll_interval : float
+            The number of seconds between two checks for a result being computed by another process.
+        """
+        self.path: Path = path
+        self.max_entries: int = max_entries
+        self.lock_timeout: float = lock_timeout
+        self.poll_interval: float = poll_interval
+        # Hashing a book reads all of it, so the digests are memoized by path, size and modification time
+        self.digests: OrderedDict[Tuple[str, int, int], str] = OrderedDict()
+
+    def digest(self, data_file: Path) -> str:
+        """
+        Hash the content of a file, or reuse the digest if the file has not changed since it was hashed.
+
+        Parameters
+        ----------
+        data_file : Path
+            The path of the file.
+
+        Returns
+        -------
+        str
+            The BLAKE2b digest of the file.
+        """
+        stat = data_file.stat()
+        identity = (str(data_file), stat.st_size, stat.st_mtime_ns)
+        digest = self.digests.get(identity)
+        if digest is not None:
+            self.digests.move_to_end(identity)
+        else:
+            with open(data_file, "rb") as file:
+                digest = hashlib.file_digest(file, "blake2b").hexdigest()
+            self.digests[identity] = digest
+            if len(self.digests) > self.max_entries:
+                self.digests.popitem(last=False)
+        return digest
+
+    def key(self, data_file: Path, top_k: int) -> str:
+        """
+        Get the key of the result of counting the words of a file.
+
+        Parameters
+        ----------
+        data_file : Path
+            The path of the file.
+        top_k : int
+            The number of most common words kept.
+
+        Returns
+        -------
+        str
+            The hash of the content of the file, the stop words, `top_k` and `cache_version`.
+        """
+        key = hashlib.blake2b(digest_size=16)
+        key.update(f"{cache_version}:{top_k}:{self.digest(data_file)}:".encode())
+        key.update(get_stop_words_digest())
+        return key.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, int]]:
+        """
+        Get a cached result and mark it as the most recently used.
+
+        Parameters
+        ----------
+        key : str
+            The key of the result.
+
+        Returns
+        -------
+        Optional[Dict[str, int]]
+            The result, or None if it is not cached.
+        """
+        result_file = self.path / f"{key}.json"
+        try:
+            result: Dict[str, int] = json.loads(result_file.read_bytes())
+        except FileNotFoundError:
+            # Not cached, or evicted by another process in the meantime
+            return None
+        try:
+            os.utime(result_file)
+        except OSError:
+            # Evicted since it was read, the result is still valid
+            pass
+        return result
+
+    def put(self, key: str, result: Dict[str, int]) -> None:
+        """
+        Cache a result, evicting the least recently used results beyond `max_entries`.
+
+        Parameters
+        ----------
+        key : str
+            The key of the result.
+        result : Dict[str, int]
+            The result to cache.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        # The rename makes the write atomic, readers never see a partial result
+        temporary_file = self.path / f"{key}.{os.getpid()}.tmp"
+        temporary_file.write_text(json.dumps(result, indent=None))
+        os.replace(temporary_file, self.path / f"{key}.json")
+
+        result_files = list(self.path.glob("*.json"))
+        if len(result_files) > self.max_entries:
+            result_files.sort(key=lambda result_file: result_file.stat().st_mtime_ns)
+            for result_file in result_files[: len(result_files) - self.max_entries]:
+                result_file.unlink(missing_ok=True)
+
+    def get_or_compute(
+        self, key: str, compute: Callable[[], Dict[str, int]]
+    ) -> Tuple[Dict[str, int], bool]:
+        """
+        Get a cached result, or compute and cache it, unless another process is already computing it, in
+        which case wait for its result.
+
+        Parameters
+        ----------
+        key : str
+            The key of the result.
+        compute : Callable[[], Dict[str, int]]
+            Computes the result on a miss.
+
+        Returns
+        -------
+        Tuple[Dict[str, int], bool]
+            The result, and whether it was computed by this call.
+        """
+        lock_file = self.path / f"{key}.lock"
+        # Written into the lock, so that a process only ever releases the lock it holds
+        token = f"{os.getpid()}:{uuid.uuid4().hex}"
+        while True:
+            result = self.get(key)
+            if result is not None:
+                return result, False
+            self.path.mkdir(parents=True, exist_ok=True)
+            if self._acquire(lock_file, token):
+                break
+            time.sleep(self.poll_interval)
+
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(lock_file, stop), daemon=True
+        )
+        heartbeat.start()
+        try:
+            # The result may have been cached between the last check and the creation of the lock
+            result = self.get(key)
+            if result is not None:
+                return result, False
+            result = compute()
+            self.put(key, result)
+            return result, True
+        finally:
+            stop.set()
+            heartbeat.join()
+            # The lock may have been taken over if this process stalled for `lock_timeout` seconds
+            if self._holds(lock_file, token):
+                lock_file.unlink(missing_ok=True)
+
+    def _acquire(self, lock_file: Path, token: str) -> bool:
+        """
+        Try to create a lock file holding `token`, or to take it over if its holder stopped refreshing it
+        for `lock_timeout` seconds. The takeover replaces the lock atomically, then reads it back: if
+        several processes take it over at once, only those that still find their own token go on, so at
+        worst a result is computed twice, and no process ever releases the lock of another.
+
+        Parameters
+        ----------
+        lock_file : Path
+            The lock file of the result.
+        token : str
+            The token identifying this process.
+
+        Returns
+        -------
+        bool
+            Whether this process now holds the lock.
+        """
+        try:
+            # Only one process can create the lock file
+            descriptor = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            pass
+        else:
+            with os.fdopen(descriptor, "w") as file:
+                file.write(token)
+            return True
+        try:
+            if time.time() - lock_file.stat().st_mtime <= self.lock_timeout:
+                return False
+        except FileNotFoundError:
+            # Released in the meantime, the result should be cached now
+            return False
+        temporary_file = lock_file.with_name(f"{lock_file.name}.{uuid.uuid4().hex}.tmp")
+        temporary_file.write_text(token)
+        os.replace(temporary_file, lock_file)
+        return self._holds(lock_file, token)
+
+    @staticmethod
+    def _holds(lock_file: Path, token: str) -> bool:
+        """
+        Check whether a lock file still holds `token`.
+
+        Parameters
+        ----------
+        lock_file : Path
+            The lock file of the result.
+        token : str
+            The token identifying this process.
+
+        Returns
+        -------
+        bool
+            Whether the lock is held by this process.
+        """
+        try:
+            return lock_file.read_text() == token
+        except FileNotFoundError:
+            return False
+
+    def _heartbeat(self, lock_file: Path, stop: threading.Event) -> None:
+        """
+        Refresh the modification time of a lock file every third of `lock_timeout` until `stop` is set.
+
+        Parameters
+        ----------
+        lock_file : Path
+            The lock file held by this process.
+        stop : threading.Event
+            Set once the result is cached, or its computation failed.
+        """
+        while not stop.wait(self.lock_timeout / 3):
+            try:
+                os.utime(lock_file)
+            except OSError:
+                # Taken over or released, there is nothing left to refresh
+                return
+
+
+result_cache = ResultCache(results_path)
+
+
+def most_common_words(
+    data_file: Path, num_processes: int = 1, top_k: int = 20
+) -> Dict[str, int]:
+    """
+    Count the words of a file and select the most common ones, see `count_tokens`.
+
+    Parameters
+    ----------
+    data_file : Path
+        The path of the file.
+    num_processes : int
+        The number of processes counting the byte ranges of the file.
+    top_k : int
+        The number of most common words kept.
+
+    Returns
+    -------
+    Dict[str, int]
+        The `top_k` most common words and their counts.
+    """
+    token_counter = count_tokens(data_file, num_processes=num_processes)
+    # A bounded heap selects the top k in O(n log k), without sorting the whole vocabulary
+    list_of_token_count_tuples = heapq.nlargest(
+        top_k, token_counter.items(), key=itemgetter(1)
+    )
+    return {token.decode(): count for token, count in list_of_token_count_tuples}
+
+
+def count_words(
+    filename: str, num_processes: int = 1, top_k: int = 20
+) -> Dict[str, int]:
+    """
+    Count the words in a file, case-folded and stripped of punctuation, and save the `top_k` most common
+    words, not including any stop words. Results are cached by the content of the file, see `ResultCache`,
+    and only saved when they are computed.
 
     Parameters
     ----------
     filename : str
         The name of the file to process.
-    """
+    num_processes : int
+        The number of processes counting the byte ranges of a large file, which cannot be more than 1 in
+        the daemonic workers of a `multiprocessing.Pool`.
+    top_k : int
+        The number of most common words to save.
 
-    word_counter: Counter = Counter()
+    Returns
+    -------
+    Dict[str, int]
+        The `top_k` most common words and their counts.
+    """
     data_file = data_path / filename
-    with open(data_file, "r") as file:
-        for line in file:
-            words = line.split()
-            word_counter.update(words)
-    for stop_word in stop_words:
-        del word_counter[stop_word]
-    list_of_word_count_tuples = word_counter.most_common(20)
-    word_to_count_map = dict(list_of_word_count_tuples)
-    save_file(filename=filename, data=json.dumps(word_to_count_map, indent=None))
+    word_to_count_map, computed = result_cache.get_or_compute(
+        result_cache.key(data_file, top_k),
+        lambda: most_common_words(data_file, num_processes, top_k),
+    )
 
     process_id = os.getpid()
+    if not computed:
+        logger.info(f"Process ID: {process_id} | Reused word counts of {filename}")
+        return word_to_count_map
+    save_file(filename=filename, data=json.dumps(word_to_count_map, indent=None))
     logger.info(f"Process ID: {process_id} | Saved word counts as {filename}")
+    return word_to_count_map
 
 
 def main() -> int:
-    count_words(sys.argv[1])
+    num_processes = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    count_words(sys.argv[1], num_processes)
     return 0
 
 